@@ -5,14 +5,20 @@ This module provides main functions to evaluate poker hands
 
 from itertools import combinations
 import random
+import numpy as np
+from src.batch_evaluator import evaluate_batch
 from src.utils import (
     evaluate_5card_hand, 
     get_hand_value, 
     compare_hands,
     PREFLOP_HAND_RANKINGS,
-    get_canonical_preflop_hand
+    get_canonical_preflop_hand,
+    CARD_INDEX
 )
 
+# Decisions simulated together by calculate_monte_carlo_strength_batch (bounds memory use)
+_STRENGTH_CHUNK = 64
+
 def evaluate_hand(cards):
     """
     Evaluates the best 5-card hand from a list of cards
@@ -100,7 +106,8 @@ def preflop_rank_description(hand):
         
     return (canonical_hand, description, percentile)
 
-def calculate_monte_carlo_strength(player_hand, community_cards, num_simulations=100, samples_per_opponent=5):
+def calculate_monte_carlo_strength(player_hand, community_cards, num_simulations=100, samples_per_opponent=5, opponent_range=None,
+                                   rng=None):
     """
     Calculate hand strength using Monte Carlo simulation.
     First samples possible opponent hands, then for each opponent hand,
@@ -111,15 +118,20 @@ def calculate_monte_carlo_strength(player_hand, community_cards, num_simulations
         community_cards (list): Community cards on the board (can be empty for preflop)
         num_simulations (int): Number of random simulations to run
         samples_per_opponent (int): Number of board completions to sample per opponent hand
+        opponent_range (RangeTracker): Optional narrowed opponent range to sample opponent hands from
+                                       (uniformly random hands are used otherwise)
+        rng (random.Random): Optional random source, e.g. CounterRNG.random (the random module by default)
         
     Returns:
         float: Monte Carlo hand strength as a value between 0.0 and 1.0
     """
     if not player_hand:
         return 0.0
+    if rng is None:
+        rng = random
         
     # If preflop, just use the preflop percentile for efficiency
-    if not community_cards:
+    if not community_cards and opponent_range is None:
         return preflop_percentile(player_hand)
     
     # Create a deck excluding the player's hand and community cards
@@ -138,14 +150,23 @@ def calculate_monte_carlo_strength(player_hand, community_cards, num_simulations
     # Number of board completions per opponent hand
     num_board_samples_per_opponent = samples_per_opponent
     
+    # Draw all opponent hands up front when sampling from a narrowed range
+    if opponent_range is not None:
+        range_hands = opponent_range.sample(num_opponent_samples, player_hand + community_cards)
+        if not range_hands:
+            return 0.5  # Range is empty given the known cards
+    
     total_trials = 0
     wins = 0
     ties = 0
     
     # Sample different opponent hands
-    for _ in range(num_opponent_samples):
-        # Generate a random opponent hand from remaining deck
-        opponent_hand = random.sample(deck, 2)
+    for sample_idx in range(num_opponent_samples):
+        # Generate an opponent hand from the range or the remaining deck
+        if opponent_range is not None:
+            opponent_hand = range_hands[sample_idx]
+        else:
+            opponent_hand = rng.sample(deck, 2)
         
         # Remove opponent cards from the deck temporarily
         opponent_deck = deck.copy()
@@ -159,7 +180,7 @@ def calculate_monte_carlo_strength(player_hand, community_cards, num_simulations
         for _ in range(num_board_samples_per_opponent):
             # Sample remaining community cards
             if remaining_cards_needed > 0:
-                remaining_community = random.sample(opponent_deck, remaining_cards_needed)
+                remaining_community = rng.sample(opponent_deck, remaining_cards_needed)
                 full_community = community_cards + remaining_community
             else:
                 full_community = community_cards
@@ -188,7 +209,70 @@ def calculate_monte_carlo_strength(player_hand, community_cards, num_simulations
     return (wins + ties) / total_trials
 
 
-def calculate_head_to_head_equity(player1_hand, player2_hand, community_cards, num_simulations=100):
+def calculate_monte_carlo_strength_batch(hands, boards, num_simulations=100, samples_per_opponent=5, rng=None):
+    """
+    Calculate the Monte Carlo hand strength of many decisions at once.
+    Estimates the same quantity as calculate_monte_carlo_strength (the chance of beating
+    a random opponent hand, ties counting half) with the same number of trials, but
+    samples and scores every trial of every decision in a few NumPy operations.
+    
+    Args:
+        hands (list): Hole cards of each decision (e.g., [['Ah', 'Kd'], ...])
+        boards (list): Community cards of each decision (can be empty for preflop)
+        num_simulations (int): Number of opponent hands sampled per decision
+        samples_per_opponent (int): Number of board completions per opponent hand
+        rng (numpy.random.Generator): Optional random generator
+        
+    Returns:
+        list: Hand strength of each decision as a value between 0.0 and 1.0
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    strengths = [0.0] * len(hands)
+    postflop = []
+    for i, (hand, board) in enumerate(zip(hands, boards)):
+        if not hand:
+            continue
+        if not board:
+            strengths[i] = preflop_percentile(hand)  # Same shortcut as the single version
+        else:
+            postflop.append(i)
+    
+    trials = num_simulations * samples_per_opponent
+    slots = np.arange(5)
+    for start in range(0, len(postflop), _STRENGTH_CHUNK):
+        rows = postflop[start:start + _STRENGTH_CHUNK]
+        num_rows = len(rows)
+        hole = np.array([[CARD_INDEX[card] for card in hands[i]] for i in rows], dtype=np.int64)
+        board = np.zeros((num_rows, 5), dtype=np.int64)
+        board_size = np.array([len(boards[i]) for i in rows], dtype=np.int64)
+        known = np.zeros((num_rows, 52), dtype=np.float32)
+        for row, i in enumerate(rows):
+            cards = [CARD_INDEX[card] for card in boards[i]]
+            board[row, :len(cards)] = cards
+            known[row, cards] = 2.0
+        known[np.arange(num_rows)[:, None], hole] = 2.0
+        
+        # Draw 7 unseen cards per trial: the opponent's hand, then the board completion
+        keys = rng.random((num_rows, trials, 52), dtype=np.float32) + known[:, None, :]
+        drawn = np.argpartition(keys, 6, axis=2)[:, :, :7]
+        drawn = np.take_along_axis(drawn, np.argsort(np.take_along_axis(keys, drawn, 2), axis=2), 2)
+        
+        fill = np.take_along_axis(drawn, np.clip(2 + slots - board_size[:, None], 0, 6)[:, None, :], 2)
+        full_board = np.where((slots >= board_size[:, None])[:, None, :], fill, board[:, None, :])
+        mine = np.concatenate([np.broadcast_to(hole[:, None, :], (num_rows, trials, 2)), full_board], axis=2)
+        theirs = np.concatenate([drawn[:, :, :2], full_board], axis=2)
+        
+        my_scores = evaluate_batch(mine.reshape(-1, 7)).reshape(num_rows, trials)
+        their_scores = evaluate_batch(theirs.reshape(-1, 7)).reshape(num_rows, trials)
+        wins = (my_scores > their_scores).sum(axis=1) + 0.5 * (my_scores == their_scores).sum(axis=1)
+        for row, i in enumerate(rows):
+            strengths[i] = float(wins[row]) / trials
+    
+    return strengths
+
+
+def calculate_head_to_head_equity(player1_hand, player2_hand, community_cards, num_simulations=100, rng=None):
     """
     Calculate win probability for both players in a head-to-head matchup using Monte Carlo simulation.
     This is more efficient than calling calculate_monte_carlo_strength twice, as it reuses the same
@@ -199,14 +283,15 @@ def calculate_head_to_head_equity(player1_hand, player2_hand, community_cards, n
         player2_hand (list): Player 2's hole cards (e.g., ['Qh', 'Qd'])
         community_cards (list): Community cards on the board (can be empty for preflop)
         num_simulations (int): Number of random simulations to run
+        rng (random.Random): Optional random source, e.g. CounterRNG.random (the random module by default)
         
     Returns:
         tuple: (player1_equity, player2_equity) as values between 0.0 and 1.0
     """
-    import random
-    
     if not player1_hand or not player2_hand:
         return (0.5, 0.5)  # Default if invalid hands
+    if rng is None:
+        rng = random
     
     # Create a deck excluding both players' hands and community cards
     ranks = list("23456789TJQKA")
@@ -230,7 +315,7 @@ def calculate_head_to_head_equity(player1_hand, player2_hand, community_cards, n
     for _ in range(num_simulations):
         # Sample remaining community cards
         if remaining_cards_needed > 0:
-            remaining_community = random.sample(deck, remaining_cards_needed)
+            remaining_community = rng.sample(deck, remaining_cards_needed)
             full_community = community_cards + remaining_community
         else:
             full_community = community_cards
@@ -1,4 +1,11 @@
 # Make core engine classes available at the package level
 from .poker_engine import PokerEngine
-from .poker_visualizer import run_visual_match
 from .poker_tournament import PokerTournament
+
+
+def __getattr__(name):
+    # The visualizer initializes pygame on import, so only load it when asked for
+    if name == 'run_visual_match':
+        from .poker_visualizer import run_visual_match
+        return run_visual_match
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,237 @@
+"""
+Async Poker Engine
+asyncio versions of the engine and tournament, for bots that wait on I/O or worker processes
+"""
+
+import asyncio
+import inspect
+from .events import HandStarted, HandEnded
+from .poker_engine import PokerEngine
+from .poker_tournament import PokerTournament
+
+
+class SyncBotAdapter:
+    """
+    Lets a bot with a regular get_action method play in an AsyncPokerEngine
+
+    By default the bot is called directly on the event loop, which suits bots that
+    answer quickly. Give an executor to run a slow bot on a thread (or process) pool
+    instead, so the loop keeps serving other matches meanwhile.
+    """
+    def __init__(self, bot, executor=None):
+        """
+        Args:
+            bot: Object with a get_action(game_state) method
+            executor (concurrent.futures.Executor): Optional pool to call the bot in
+        """
+        self.bot = bot
+        self.executor = executor
+
+    def __str__(self):
+        return str(self.bot)
+
+    @property
+    def subscribe_events(self):
+        """The wrapped bot's subscribe_events (see PokerEngine), or None if it doesn't watch events"""
+        return getattr(self.bot, 'subscribe_events', None)
+
+    async def get_action(self, game_state):
+        if self.executor is None:
+            return self.bot.get_action(game_state)
+        # The engine moves on only after the bot answers, so the view stays valid
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self.bot.get_action, game_state)
+
+
+def async_action(bot):
+    """
+    Find the coroutine function that asks a bot for an action
+
+    Args:
+        bot: Bot with an async get_action, a get_action_async method (like BotWorker),
+             or a regular get_action (wrapped in SyncBotAdapter)
+
+    Returns:
+        callable: Coroutine function taking the game state
+    """
+    if hasattr(bot, 'get_action_async'):
+        return bot.get_action_async
+    if inspect.iscoroutinefunction(bot.get_action):
+        return bot.get_action
+    return SyncBotAdapter(bot).get_action
+
+
+class AsyncPokerEngine(PokerEngine):
+    """
+    PokerEngine whose play_round is a coroutine
+
+    Bots may implement async def get_action; regular bots keep working unchanged.
+    Dealing, betting rules and showdowns are shared with PokerEngine, only waiting
+    for the bots differs, so many engines can play concurrently in one event loop.
+    """
+    async def play_round(self, predefined_cards=None):
+        """Play a full round of poker
+
+        Args:
+            predefined_cards (dict or DealPack): Optional cards to deal, as for initialize_round
+
+        Returns:
+            The winning player, or None for a split pot
+        """
+        ante_winner = self.initialize_round(predefined_cards)
+        if ante_winner:
+            return ante_winner  # Player couldn't pay ante
+
+        history = self.history
+        if history is not None:
+            history.begin_hand(self.state, self.ante, self.players, self.match_id)
+        events = self.events
+        if events is not None and HandStarted in events.handlers:
+            self._publish_hand_start()
+
+        winner, showdown = await self._play_streets()
+
+        if history is not None:
+            history.end_hand(self.state, winner, showdown)
+        if events is not None and HandEnded in events.handlers:
+            self._publish_hand_end(winner, showdown)
+        return self.players[winner] if winner is not None else None
+
+    async def _play_streets(self):
+        """Play the betting rounds and showdown of a dealt hand, return (winning seat or None, showdown)"""
+        actions = [async_action(player) for player in self.players]
+        streets = (('preflop', None), ('flop', self._deal_flop), ('turn', self._deal_turn),
+                   ('river', self._deal_river))
+
+        for round_name, deal_street in streets:
+            if self._all_in():
+                return self._run_out(), True  # No more decisions once a player is all-in
+            if deal_street is not None:
+                deal_street()
+            winner = await self._betting_round(round_name, actions)
+            if winner is not None:
+                return self._end_round(winner), False
+
+        return self._showdown(), True
+
+    async def _betting_round(self, round_name, actions):
+        """Execute a betting round, return the winning seat if someone folds"""
+        state = self.state
+        self._start_street()
+
+        while not self._street_closed():
+            seat = state.current_player_idx
+            action = await actions[seat](self._get_player_view(seat))
+            if self._act(seat, action):
+                return 1 - seat
+            if not self.headless:
+                self._update_game_state()
+
+        return None
+
+
+class AsyncPokerTournament(PokerTournament):
+    """
+    Tournament manager that plays matches concurrently in one event loop
+
+    A bot may play several matches at once, so bots that keep per-match state
+    should be given one instance per pairing. Time controls and phase timings are not
+    supported here; host slow bots in BotWorkers or give SyncBotAdapter an executor instead.
+    """
+    def __init__(self, starting_stack=1000, ante=10, verbose=True, history=None, timings=None,
+                 time_control=None, seed=None, events=None):
+        """
+        Args:
+            Same as PokerTournament; timings and time_control must be None
+
+        Raises:
+            ValueError: If timings or time_control is given
+        """
+        if timings is not None:
+            raise ValueError("AsyncPokerTournament doesn't record phase timings")
+        if time_control is not None:
+            raise ValueError("AsyncPokerTournament doesn't apply time controls; use PokerTournament")
+        super().__init__(starting_stack, ante, verbose, history, seed=seed, events=events)
+
+    async def run_match(self, player1, player2, num_hands=100, swap_seats=False, match_id=None):
+        """
+        Run a match between two players for a specified number of hands
+
+        Args:
+            player1: First player bot
+            player2: Second player bot
+            num_hands (int): Number of hands to play
+            swap_seats (bool): Seat player2 first
+            match_id (int): Match id for seeded deals (see PokerTournament), so a match deals
+                            the same cards however the event loop interleaves it
+
+        Returns:
+            dict: Match results, in the same format as PokerTournament.run_match
+        """
+        seats = (player2, player1) if swap_seats else (player1, player2)
+        match_id, rng = self._new_match(match_id)
+        engine = AsyncPokerEngine(seats[0], seats[1], self.starting_stack, self.ante,
+                                  headless=True, history=self.history, events=self.events,
+                                  rng=rng, match_id=match_id)
+        p1_seat = 1 if swap_seats else 0
+
+        hands_played = 0
+        hands_won = {player1: 0, player2: 0}
+        while hands_played < num_hands and engine.stacks[0] > 0 and engine.stacks[1] > 0:
+            winner = await engine.play_round()
+            if winner:
+                original_winner = player1 if winner is engine.players[p1_seat] else player2
+                hands_won[original_winner] += 1
+            hands_played += 1
+
+        final_stacks = {player1: engine.stacks[p1_seat], player2: engine.stacks[1 - p1_seat]}
+        return {
+            'hands_played': hands_played,
+            'hands_won': hands_won,
+            'initial_stacks': {player1: self.starting_stack, player2: self.starting_stack},
+            'final_stacks': final_stacks,
+            'profit': {player: final_stacks[player] - self.starting_stack for player in (player1, player2)},
+            'allin_adjusted_profit': {player: final_stacks[player] - self.starting_stack + engine.allin_adjustment[seat]
+                                      for player, seat in ((player1, p1_seat), (player2, 1 - p1_seat))},
+            'time_violations': {player1: [], player2: []}
+        }
+
+    async def run_tournament(self, players, num_matches=10, hands_per_match=100, max_concurrent=None):
+        """
+        Run a round-robin tournament with every match played concurrently
+
+        Args:
+            players (list): List of player bots
+            num_matches (int): Number of matches between each pair (seats alternate)
+            hands_per_match (int): Number of hands per match
+            max_concurrent (int): Optional limit on matches in progress at once
+
+        Returns:
+            dict: Tournament results, in the same format as PokerTournament.run_tournament
+        """
+        limit = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+
+        async def play(player1, player2, match, match_id):
+            if limit is None:
+                return await self.run_match(player1, player2, hands_per_match, match % 2 == 1, match_id)
+            async with limit:
+                return await self.run_match(player1, player2, hands_per_match, match % 2 == 1, match_id)
+
+        pairings = [(player1, player2, match)
+                    for i, player1 in enumerate(players)
+                    for player2 in players[i + 1:]
+                    for match in range(num_matches)]
+        # Match ids follow the schedule, as in PokerTournament.run_tournament
+        first_id = self.matches_started
+        self.matches_started += len(pairings)
+        match_results = await asyncio.gather(*(play(*pairing, first_id + match_id)
+                                               for match_id, pairing in enumerate(pairings)))
+
+        # Results are added in schedule order, so totals don't depend on finishing order
+        tournament_results = self._new_tournament_results(players)
+        for (player1, player2, _), results in zip(pairings, match_results):
+            self._add_match_results(tournament_results, player1, player2, results)
+        self._finish_tournament_results(tournament_results)
+
+        if self.verbose:
+            self._print_tournament_results(tournament_results)
+        return tournament_results
@@ -0,0 +1,259 @@
+"""
+Batch Hand Evaluator
+Scores many 5-7 card hands at once with NumPy, ordered exactly like compare_hands
+"""
+
+from itertools import combinations
+import numpy as np
+from .utils import CARD_INDEX
+
+# Hand categories, in the same order as utils.HAND_RANKS
+HIGH_CARD = 0
+PAIR = 1
+TWO_PAIR = 2
+THREE_KIND = 3
+STRAIGHT = 4
+FLUSH = 5
+FULL_HOUSE = 6
+FOUR_KIND = 7
+STRAIGHT_FLUSH = 8
+
+_RANK_BITS = 1 << np.arange(13, dtype=np.int64)
+
+
+def _build_tables():
+    """Lookup tables indexed by a 13-bit rank mask"""
+    masks = np.arange(1 << 13, dtype=np.int64)
+    present = (masks[:, None] >> np.arange(13)) & 1
+
+    popcount = present.sum(axis=1)
+
+    highest = np.full(1 << 13, -1, dtype=np.int64)
+    for rank in range(13):
+        highest[present[:, rank] == 1] = rank
+
+    # Top five ranks packed as 4-bit nibbles, highest first
+    top5 = np.zeros(1 << 13, dtype=np.int64)
+    for mask in range(1 << 13):
+        value = 0
+        ranks = [rank for rank in range(12, -1, -1) if mask >> rank & 1][:5]
+        for rank in ranks:
+            value = (value << 4) | rank
+        top5[mask] = value << (4 * (5 - len(ranks)))
+
+    # Highest rank of the best straight, the wheel (A-2-3-4-5) counting as five-high
+    straight_high = np.full(1 << 13, -1, dtype=np.int64)
+    wheel = 0b1000000001111
+    straight_high[(masks & wheel) == wheel] = 3
+    for high in range(4, 13):
+        window = 0b11111 << (high - 4)
+        straight_high[(masks & window) == window] = high
+
+    return popcount, highest, top5, straight_high
+
+
+_POPCOUNT, _HIGHEST, _TOP5, _STRAIGHT_HIGH = _build_tables()
+
+# Plain-list copies for scoring single hands without NumPy overhead
+_HIGHEST_LIST = _HIGHEST.tolist()
+_TOP5_LIST = _TOP5.tolist()
+_STRAIGHT_HIGH_LIST = _STRAIGHT_HIGH.tolist()
+_POPCOUNT_LIST = _POPCOUNT.tolist()
+
+
+def evaluate_batch(cards):
+    """
+    Score a batch of hands
+
+    Each score packs the hand category above up to five rank nibbles, so a higher
+    score is a better hand and equal scores split the pot - the same ordering as
+    compare_hands(evaluate_hand(a), evaluate_hand(b)).
+
+    Args:
+        cards (numpy.ndarray): Card indices (see utils.CARD_INDEX) of shape (N, k), 5 <= k <= 7
+
+    Returns:
+        numpy.ndarray: int64 score for each hand
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    num_hands = cards.shape[0]
+    rows = np.arange(num_hands)
+    ranks = cards >> 2
+    suits = cards & 3
+
+    rank_counts = np.zeros((num_hands, 13), dtype=np.int64)
+    suit_masks = np.zeros((num_hands, 4), dtype=np.int64)
+    for col in range(cards.shape[1]):
+        rank_counts[rows, ranks[:, col]] += 1
+        suit_masks[rows, suits[:, col]] |= _RANK_BITS[ranks[:, col]]
+
+    # Rank masks of ranks held at least once, twice, three and four times
+    any_mask = (rank_counts >= 1) @ _RANK_BITS
+    pair_mask = (rank_counts >= 2) @ _RANK_BITS
+    trips_mask = (rank_counts >= 3) @ _RANK_BITS
+    quads_mask = (rank_counts >= 4) @ _RANK_BITS
+
+    suit_counts = _POPCOUNT[suit_masks]
+    flush_suit = suit_counts.argmax(axis=1)
+    flush_mask = suit_masks[rows, flush_suit]
+    is_flush = suit_counts[rows, flush_suit] >= 5
+    flush_mask[~is_flush] = 0
+
+    # Start from high card and let stronger categories overwrite, like board_strengths
+    score = _TOP5[any_mask]
+
+    pair = _HIGHEST[pair_mask]
+    rest = any_mask & ~np.left_shift(1, pair.clip(0))
+    has = pair >= 0
+    score[has] = ((PAIR << 20) | (pair << 16) | ((_TOP5[rest] >> 8) << 4))[has]
+
+    second_pair = _HIGHEST[pair_mask & ~np.left_shift(1, pair.clip(0))]
+    rest = rest & ~np.left_shift(1, second_pair.clip(0))
+    has = second_pair >= 0
+    score[has] = ((TWO_PAIR << 20) | (pair << 16) | (second_pair << 12) | (_HIGHEST[rest] << 8))[has]
+
+    trips = _HIGHEST[trips_mask]
+    trips_bit = np.left_shift(1, trips.clip(0))
+    has = trips >= 0
+    score[has] = ((THREE_KIND << 20) | (trips << 16) | ((_TOP5[any_mask & ~trips_bit] >> 12) << 8))[has]
+
+    straight = _STRAIGHT_HIGH[any_mask]
+    has = straight >= 0
+    score[has] = ((STRAIGHT << 20) | (straight << 16))[has]
+
+    score[is_flush] = ((FLUSH << 20) | _TOP5[flush_mask])[is_flush]
+
+    full_pair = _HIGHEST[pair_mask & ~trips_bit]
+    has = (trips >= 0) & (full_pair >= 0)
+    score[has] = ((FULL_HOUSE << 20) | (trips << 16) | (full_pair << 12))[has]
+
+    quads = _HIGHEST[quads_mask]
+    has = quads >= 0
+    kicker = _HIGHEST[any_mask & ~np.left_shift(1, quads.clip(0))]
+    score[has] = ((FOUR_KIND << 20) | (quads << 16) | (kicker << 12))[has]
+
+    straight_flush = _STRAIGHT_HIGH[flush_mask]
+    has = straight_flush >= 0
+    score[has] = ((STRAIGHT_FLUSH << 20) | (straight_flush << 16))[has]
+
+    return score
+
+
+def score_hand(cards):
+    """
+    Score a single hand, matching evaluate_batch
+
+    Much faster than evaluate_hand for comparing two hands at showdown.
+
+    Args:
+        cards (list): 5 to 7 cards in the format 'rank+suit' (e.g., ['Ah', 'Kd', ...])
+
+    Returns:
+        int: Score of the hand (higher is better, equal scores tie)
+    """
+    rank_counts = [0] * 13
+    suit_masks = [0, 0, 0, 0]
+    for card in cards:
+        index = CARD_INDEX[card]
+        rank = index >> 2
+        rank_counts[rank] += 1
+        suit_masks[index & 3] |= 1 << rank
+
+    any_mask = pair_mask = trips_mask = quads_mask = 0
+    for rank, count in enumerate(rank_counts):
+        if count:
+            bit = 1 << rank
+            any_mask |= bit
+            if count >= 2:
+                pair_mask |= bit
+                if count >= 3:
+                    trips_mask |= bit
+                    if count == 4:
+                        quads_mask |= bit
+
+    flush_mask = 0
+    for mask in suit_masks:
+        if _POPCOUNT_LIST[mask] >= 5:
+            flush_mask = mask
+            straight_flush = _STRAIGHT_HIGH_LIST[mask]
+            if straight_flush >= 0:
+                return (STRAIGHT_FLUSH << 20) | (straight_flush << 16)
+
+    if quads_mask:
+        quads = _HIGHEST_LIST[quads_mask]
+        return (FOUR_KIND << 20) | (quads << 16) | (_HIGHEST_LIST[any_mask & ~(1 << quads)] << 12)
+
+    if trips_mask:
+        trips = _HIGHEST_LIST[trips_mask]
+        full_pair = _HIGHEST_LIST[pair_mask & ~(1 << trips)]
+        if full_pair >= 0:
+            return (FULL_HOUSE << 20) | (trips << 16) | (full_pair << 12)
+
+    if flush_mask:
+        return (FLUSH << 20) | _TOP5_LIST[flush_mask]
+
+    straight = _STRAIGHT_HIGH_LIST[any_mask]
+    if straight >= 0:
+        return (STRAIGHT << 20) | (straight << 16)
+
+    if trips_mask:
+        return (THREE_KIND << 20) | (trips << 16) | ((_TOP5_LIST[any_mask & ~(1 << trips)] >> 12) << 8)
+
+    if pair_mask:
+        pair = _HIGHEST_LIST[pair_mask]
+        rest = any_mask & ~(1 << pair)
+        second_pair = _HIGHEST_LIST[pair_mask & ~(1 << pair)]
+        if second_pair >= 0:
+            kicker = _HIGHEST_LIST[rest & ~(1 << second_pair)]
+            return (TWO_PAIR << 20) | (pair << 16) | (second_pair << 12) | (kicker << 8)
+        return (PAIR << 20) | (pair << 16) | ((_TOP5_LIST[rest] >> 8) << 4)
+
+    return _TOP5_LIST[any_mask]
+
+
+def hand_category(score):
+    """
+    Extract the hand category from scores returned by evaluate_batch
+
+    Args:
+        score (numpy.ndarray or int): Scores from evaluate_batch
+
+    Returns:
+        numpy.ndarray or int: Category (HIGH_CARD ... STRAIGHT_FLUSH)
+    """
+    return score >> 20
+
+
+def runout_equity(hand1, hand2, board, samples=2000):
+    """
+    Pot equity of the first hand against the second over every way the board can finish
+
+    Runouts are enumerated exactly from the flop or turn. Preflop there are 1.7
+    million of them, so a fixed number are sampled with a generator seeded by the
+    cards, which keeps the result reproducible and leaves other random sources alone.
+
+    Args:
+        hand1 (list): First player's hole cards (e.g., ['Ah', 'Kd'])
+        hand2 (list): Second player's hole cards
+        board (list): Community cards dealt so far (0, 3, 4 or 5 cards)
+        samples (int): Runouts sampled when there are too many to enumerate
+
+    Returns:
+        float: Share of the pot the first hand wins on average (ties count half)
+    """
+    known = [CARD_INDEX[card] for card in hand1 + hand2 + board]
+    remaining = np.setdiff1d(np.arange(52), known)
+    needed = 5 - len(board)
+    if needed <= 2:
+        picks = list(combinations(range(len(remaining)), needed))
+        runouts = remaining[np.array(picks, dtype=np.int64).reshape(len(picks), needed)]
+    else:
+        keys = np.random.default_rng(known).random((samples, len(remaining)))
+        runouts = remaining[np.argpartition(keys, needed - 1, axis=1)[:, :needed]]
+
+    num_runouts = len(runouts)
+    boards = np.concatenate([np.broadcast_to(np.array(known[4:], dtype=np.int64), (num_runouts, len(board))),
+                             runouts], axis=1)
+    scores1 = evaluate_batch(np.concatenate([np.broadcast_to(np.array(known[0:2]), (num_runouts, 2)), boards], axis=1))
+    scores2 = evaluate_batch(np.concatenate([np.broadcast_to(np.array(known[2:4]), (num_runouts, 2)), boards], axis=1))
+    return float(((scores1 > scores2).sum() + 0.5 * (scores1 == scores2).sum()) / num_runouts)
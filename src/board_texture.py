@@ -0,0 +1,221 @@
+"""
+Board Texture Descriptors
+Precomputed texture of every canonical flop, turn and river, packed into small integers
+"""
+
+from .utils import RANKS, CARD_SUIT_CHARS
+
+# Descriptor bitfield layout (shift, width)
+NUM_CARDS = (0, 3)       # 3, 4 or 5 board cards
+PAIRING = (3, 3)         # One of the PAIRING_* values below
+MAX_SUIT = (6, 3)        # Most cards of any one suit (1-5)
+FLUSH_POSSIBLE = (9, 1)  # Three or more cards of one suit
+FLUSH_DRAW = (10, 1)     # Exactly two of a suit with cards still to come
+STRAIGHT_POSSIBLE = (11, 1)  # Some straight uses three or more board ranks
+STRAIGHT_ON_BOARD = (12, 1)  # Five board ranks form a straight
+CONNECTEDNESS = (13, 3)  # Most distinct board ranks inside any five-rank window
+HIGH_RANK = (16, 4)      # Highest board rank (0 = deuce ... 12 = ace)
+SECOND_RANK = (20, 4)    # Second highest distinct rank (15 if the board has one rank)
+BROADWAY = (24, 3)       # Number of distinct ten-or-higher ranks
+
+PAIRING_NONE = 0
+PAIRING_PAIR = 1
+PAIRING_TWO_PAIR = 2
+PAIRING_TRIPS = 3
+PAIRING_FULL_HOUSE = 4
+PAIRING_QUADS = 5
+
+_SUIT_BITS = 0x1FFF
+# Five-rank windows as 13-bit rank masks, wheel (A-2-3-4-5) included
+_STRAIGHT_WINDOWS = [0b11111 << low for low in range(9)] + [0b1000000001111]
+_POPCOUNT = [bin(mask).count('1') for mask in range(1 << 13)]
+
+# Canonical board -> descriptor, built per street on first use
+_TEXTURE_TABLES = {}
+
+
+def texture_field(texture, field):
+    """
+    Extract one field from a texture descriptor
+
+    Args:
+        texture (int): Descriptor returned by board_texture
+        field (tuple): One of the (shift, width) field constants, e.g. PAIRING
+
+    Returns:
+        int: Value of the field
+    """
+    shift, width = field
+    return (texture >> shift) & ((1 << width) - 1)
+
+
+def board_key(community_cards):
+    """
+    Convert board cards into a card-mask key
+
+    Each suit occupies 13 bits (suit * 13 + rank), so a suit's ranks can be read
+    back with a shift.
+
+    Args:
+        community_cards (list): Community cards (e.g., ['Ah', 'Kd', '7c'])
+
+    Returns:
+        int: 52-bit card mask
+    """
+    key = 0
+    for card in community_cards:
+        key |= 1 << (CARD_SUIT_CHARS.index(card[1]) * 13 + RANKS[card[0]] - 2)
+    return key
+
+
+def _canonical_key(mask):
+    """Map a card mask to the key shared by every suit-isomorphic board"""
+    a, b, c, d = sorted((mask & _SUIT_BITS, (mask >> 13) & _SUIT_BITS,
+                         (mask >> 26) & _SUIT_BITS, (mask >> 39) & _SUIT_BITS), reverse=True)
+    return (a << 39) | (b << 26) | (c << 13) | d
+
+
+def _rank_texture(rank_mask):
+    """Fields of the descriptor that depend only on the distinct board ranks"""
+    connectedness = max(_POPCOUNT[rank_mask & window] for window in _STRAIGHT_WINDOWS)
+    ranks = [rank for rank in range(12, -1, -1) if rank_mask >> rank & 1]
+    second = ranks[1] if len(ranks) > 1 else 15
+    broadway = _POPCOUNT[rank_mask >> 8]
+
+    texture = 0
+    texture |= (connectedness >= 3) << STRAIGHT_POSSIBLE[0]
+    texture |= (connectedness == 5) << STRAIGHT_ON_BOARD[0]
+    texture |= connectedness << CONNECTEDNESS[0]
+    texture |= ranks[0] << HIGH_RANK[0]
+    texture |= second << SECOND_RANK[0]
+    texture |= broadway << BROADWAY[0]
+    return texture
+
+
+def _compute_texture(suit_masks):
+    """Build the full descriptor for a board given as four per-suit rank masks"""
+    a, b, c, d = suit_masks
+    num_cards = _POPCOUNT[a] + _POPCOUNT[b] + _POPCOUNT[c] + _POPCOUNT[d]
+    max_suit = max(_POPCOUNT[a], _POPCOUNT[b], _POPCOUNT[c], _POPCOUNT[d])
+
+    # Ranks held by at least two, three and four suits
+    pairs = _POPCOUNT[(a & b) | (a & c) | (a & d) | (b & c) | (b & d) | (c & d)]
+    trips = _POPCOUNT[(a & b & c) | (a & b & d) | (a & c & d) | (b & c & d)]
+    quads = _POPCOUNT[a & b & c & d]
+
+    if quads:
+        pairing = PAIRING_QUADS
+    elif trips and pairs >= 2:
+        pairing = PAIRING_FULL_HOUSE
+    elif trips:
+        pairing = PAIRING_TRIPS
+    elif pairs >= 2:
+        pairing = PAIRING_TWO_PAIR
+    elif pairs:
+        pairing = PAIRING_PAIR
+    else:
+        pairing = PAIRING_NONE
+
+    texture = _rank_texture(a | b | c | d)
+    texture |= num_cards << NUM_CARDS[0]
+    texture |= pairing << PAIRING[0]
+    texture |= max_suit << MAX_SUIT[0]
+    texture |= (max_suit >= 3) << FLUSH_POSSIBLE[0]
+    texture |= (max_suit == 2 and num_cards < 5) << FLUSH_DRAW[0]
+    return texture
+
+
+def _suit_count_splits(num_cards):
+    """Ways to split num_cards over four suits, largest first (e.g. 5 -> (3, 1, 1, 0))"""
+    splits = set()
+    for first in range(num_cards + 1):
+        for second in range(num_cards - first + 1):
+            for third in range(num_cards - first - second + 1):
+                fourth = num_cards - first - second - third
+                splits.add(tuple(sorted((first, second, third, fourth), reverse=True)))
+    return sorted(splits)
+
+
+def _build_table(num_cards):
+    """Enumerate every canonical board with num_cards cards and precompute its descriptor"""
+    masks_by_count = {}
+    for mask in range(1 << 13):
+        masks_by_count.setdefault(_POPCOUNT[mask], []).append(mask)
+
+    table = {}
+
+    def place(parts, chosen):
+        if len(chosen) == 4:
+            masks = sorted(chosen, reverse=True)
+            key = (masks[0] << 39) | (masks[1] << 26) | (masks[2] << 13) | masks[3]
+            table[key] = _compute_texture(masks)
+            return
+        count = parts[len(chosen)]
+        for mask in masks_by_count[count]:
+            # Suits with equally many cards are interchangeable; keep them in order
+            if chosen and parts[len(chosen) - 1] == count and mask > chosen[-1]:
+                break
+            place(parts, chosen + [mask])
+
+    for parts in _suit_count_splits(num_cards):
+        place(parts, [])
+    return table
+
+
+def texture_table(num_cards):
+    """
+    Return the precomputed descriptors for one street
+
+    Args:
+        num_cards (int): 3 for the flop, 4 for the turn, 5 for the river
+
+    Returns:
+        dict: Canonical board key -> texture descriptor
+    """
+    table = _TEXTURE_TABLES.get(num_cards)
+    if table is None:
+        table = _TEXTURE_TABLES[num_cards] = _build_table(num_cards)
+    return table
+
+
+def board_texture(board):
+    """
+    Look up the texture descriptor of a board
+
+    Args:
+        board (list or int): Community cards, or a card mask from board_key
+
+    Returns:
+        int: Packed texture descriptor (0 before the flop); read fields with texture_field
+    """
+    mask = board if isinstance(board, int) else board_key(board)
+    num_cards = _POPCOUNT[mask & _SUIT_BITS] + _POPCOUNT[(mask >> 13) & _SUIT_BITS] + \
+        _POPCOUNT[(mask >> 26) & _SUIT_BITS] + _POPCOUNT[mask >> 39]
+    if num_cards < 3:
+        return 0
+    return texture_table(num_cards)[_canonical_key(mask)]
+
+
+def describe_texture(texture):
+    """
+    Unpack a texture descriptor into a readable dictionary
+
+    Args:
+        texture (int): Descriptor returned by board_texture
+
+    Returns:
+        dict: Field name -> value
+    """
+    return {
+        'num_cards': texture_field(texture, NUM_CARDS),
+        'pairing': texture_field(texture, PAIRING),
+        'max_suit': texture_field(texture, MAX_SUIT),
+        'flush_possible': bool(texture_field(texture, FLUSH_POSSIBLE)),
+        'flush_draw': bool(texture_field(texture, FLUSH_DRAW)),
+        'straight_possible': bool(texture_field(texture, STRAIGHT_POSSIBLE)),
+        'straight_on_board': bool(texture_field(texture, STRAIGHT_ON_BOARD)),
+        'connectedness': texture_field(texture, CONNECTEDNESS),
+        'high_rank': texture_field(texture, HIGH_RANK) + 2,
+        'second_rank': texture_field(texture, SECOND_RANK) + 2 if texture_field(texture, SECOND_RANK) != 15 else None,
+        'broadway': texture_field(texture, BROADWAY)
+    }
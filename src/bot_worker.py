@@ -0,0 +1,249 @@
+"""
+Bot Workers
+Hosts a bot in a long-lived subprocess and exchanges packed binary views and actions over a pipe
+"""
+
+import asyncio
+import multiprocessing
+import struct
+from .hand_history import ACTION_NAMES, ACTION_CODES
+from .player_view import PlayerView, TableSnapshot
+from .time_control import default_action
+from .utils import DECK, CARD_INDEX
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, where memory limits are not supported
+    resource = None
+
+# Request: seat, 7 card bytes (hole cards, then the board padded with _NO_CARD), then
+# pot, current bet, my stack, opponent stack, my bet, opponent bet, min raise and ante
+_REQUEST = struct.Struct('<B7B8q')
+# Response: action code (ACTION_CODES, or _ERROR if the bot raised) and amount
+_RESPONSE = struct.Struct('<Bq')
+_NO_CARD = 255
+_ERROR = 255
+_INT64_MIN, _INT64_MAX = -1 << 63, (1 << 63) - 1
+_STOP = b''
+
+
+def pack_request(game_state):
+    """Pack the parts of a game state a bot decides on into a request record"""
+    cards = [CARD_INDEX[card] for card in game_state['hand'] + game_state['community_cards']]
+    cards += [_NO_CARD] * (7 - len(cards))
+    return _REQUEST.pack(game_state['player_idx'], *cards, game_state['pot'],
+                         game_state['current_bet'], game_state['my_stack'],
+                         game_state['opponent_stack'], game_state['my_bet'],
+                         game_state['opponent_bet'], game_state['min_raise'], game_state['ante'])
+
+
+def unpack_request(request, offset=0):
+    """
+    Rebuild the view a request record describes
+
+    Args:
+        request (bytes): Packed request records
+        offset (int): Position of the record in request
+
+    Returns:
+        PlayerView: The requesting seat's view of the table
+    """
+    (seat, hole1, hole2, *board, pot, current_bet, my_stack, opponent_stack,
+     my_bet, opponent_bet, min_raise, ante) = _REQUEST.unpack_from(request, offset)
+    stacks = (my_stack, opponent_stack) if seat == 0 else (opponent_stack, my_stack)
+    bets = (my_bet, opponent_bet) if seat == 0 else (opponent_bet, my_bet)
+    state = TableSnapshot(seat, (DECK[hole1], DECK[hole2]), [DECK[card] for card in board if card != _NO_CARD],
+                          pot, current_bet, bets, stacks, min_raise)
+    return PlayerView(state, seat, ante)
+
+
+def pack_action(action):
+    """Pack a bot's action into a response record (None packs the error code)"""
+    if action is None:
+        return _RESPONSE.pack(_ERROR, 0)
+    code = ACTION_CODES.get(action.get('action'), ACTION_CODES['unknown'])
+    # Amounts beyond int64 are clamped; the engine caps any oversized bet at all-in anyway
+    amount = min(max(int(action['amount']), _INT64_MIN), _INT64_MAX) if code in (3, 4) else 0
+    return _RESPONSE.pack(code, amount)
+
+
+def unpack_action(response, offset=0):
+    """Decode a response record into an action, or None for a bot that raised"""
+    code, amount = _RESPONSE.unpack_from(response, offset)
+    if code == _ERROR:
+        return None
+    if code in (3, 4):
+        return {'action': ACTION_NAMES[code], 'amount': amount}
+    return {'action': ACTION_NAMES[code]}
+
+
+def _worker_main(conn, bot, memory_limit):
+    """Worker process: answer decision requests until told to stop"""
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    # The bot gets a regular PlayerView of the table rebuilt from each request
+    while True:
+        try:
+            request = conn.recv_bytes()
+        except EOFError:
+            break
+        if request == _STOP:
+            break
+
+        try:
+            action = bot.get_action(unpack_request(request))
+            response = pack_action(action)
+        except Exception:
+            response = pack_action(None)
+        conn.send_bytes(response)
+
+
+class BotWorker:
+    """
+    Bot hosted in its own long-lived process
+
+    Use it wherever a bot is expected. The bot is copied into the worker when the
+    worker starts, and each decision sends one packed request and receives one packed
+    action (a round trip of a few tens of microseconds), so create the workers once
+    and reuse them across matches. A bot that raises gets the default action (check,
+    or fold when facing a bet). A worker that crashes, or that is killed because it
+    ran past a timeout, is restarted from the original bot.
+    """
+    def __init__(self, bot, memory_limit=None, start_method=None):
+        """
+        Args:
+            bot: Object with a get_action(game_state) method (must be picklable
+                 unless the 'fork' start method is used)
+            memory_limit (int): Optional limit on the worker's address space in bytes
+                                (Unix only; it includes memory inherited from this process)
+            start_method (str): multiprocessing start method (platform default if None)
+        """
+        self.bot = bot
+        self.name = str(bot)
+        self.memory_limit = memory_limit
+        self.context = multiprocessing.get_context(start_method)
+        self.decisions = 0
+        self.errors = 0
+        self.restarts = 0
+        self.process = None
+        self.conn = None
+        self._lock = None  # Serializes requests from concurrent async matches
+        self.start()
+
+    def __str__(self):
+        return self.name
+
+    def start(self):
+        """Start the worker process"""
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=_worker_main, args=(child_conn, self.bot, self.memory_limit),
+                                            name=f"bot-{self.name}", daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def restart(self):
+        """Kill the worker and start a new one with a fresh copy of the bot"""
+        self.stop(kill=True)
+        self.restarts += 1
+        self.start()
+
+    def stop(self, kill=False):
+        """
+        Stop the worker process
+
+        Args:
+            kill (bool): Kill it instead of asking it to finish
+        """
+        if self.process is None:
+            return
+        if not kill:
+            try:
+                self.conn.send_bytes(_STOP)
+            except (OSError, ValueError):
+                pass
+            self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+        self.conn = None
+
+    close = stop
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _send(self, game_state):
+        """Send a decision request to the worker"""
+        self.decisions += 1
+        self.conn.send_bytes(pack_request(game_state))
+
+    def _receive(self, game_state):
+        """Read and decode the worker's answer"""
+        action = unpack_action(self.conn.recv_bytes())
+        if action is None:
+            self.errors += 1
+            return default_action(game_state)
+        return action
+
+    def _crashed(self, game_state):
+        """Restart a worker that died (crash or memory limit) and return the default action"""
+        self.restart()
+        self.errors += 1
+        return default_action(game_state)
+
+    def _request(self, game_state, timeout):
+        """Send a decision request and return the decoded action, or None on timeout"""
+        try:
+            self._send(game_state)
+            if timeout is not None and not self.conn.poll(timeout):
+                self.restart()  # Still thinking; a late answer would desynchronize the pipe
+                return None
+            return self._receive(game_state)
+        except (EOFError, OSError):
+            return self._crashed(game_state)
+
+    def get_action(self, game_state):
+        """Ask the hosted bot for an action"""
+        return self._request(game_state, None)
+
+    def get_action_within(self, game_state, timeout):
+        """
+        Ask the hosted bot for an action, giving up after timeout seconds
+
+        Used by ChessClock; a worker that runs late is killed and restarted.
+
+        Returns:
+            dict: Action, or None if the bot didn't answer in time
+        """
+        return self._request(game_state, timeout)
+
+    async def get_action_async(self, game_state):
+        """
+        Ask the hosted bot for an action without blocking the event loop
+
+        Used by AsyncPokerEngine, so one event loop can wait on many workers at once.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            try:
+                self._send(game_state)
+                if not self.conn.poll():
+                    fd = self.conn.fileno()
+                    readable = loop.create_future()
+                    loop.add_reader(fd, readable.set_result, None)
+                    try:
+                        await readable
+                    finally:
+                        loop.remove_reader(fd)
+                return self._receive(game_state)
+            except (EOFError, OSError):
+                return self._crashed(game_state)
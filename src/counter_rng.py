@@ -0,0 +1,257 @@
+"""
+Counter-Based Random Numbers
+Deals and simulation streams keyed by (seed, match, hand), so any hand can be regenerated directly in any order
+"""
+
+import random
+import numpy as np
+
+_MASK = (1 << 64) - 1
+_LOW = np.uint64(0xFFFFFFFF)
+_SHIFT = np.uint64(32)
+_FLOAT_SHIFT = np.uint64(11)
+
+# Philox4x64-10 multipliers and key increments (the constants NumPy's Philox uses)
+_M0 = np.uint64(0xD2E7470EE14C6C93)
+_M1 = np.uint64(0xCA5A826395121157)
+_W0 = 0x9E3779B97F4A7C15
+_W1 = 0xBB67AE8584CAA73B
+
+# Hands whose deal values are generated together by CounterRNG.deal
+_DEAL_CHUNK = 256
+# Deal values generated up front: enough for both hands and the board (seeded deals burn no cards)
+_DEAL_VALUES = 9
+
+
+def _mulhilo(multiplier, values):
+    """High and low 64 bits of multiplier * values, computed from 32-bit halves"""
+    low = multiplier * values
+    m0, m1 = multiplier & _LOW, multiplier >> _SHIFT
+    v0, v1 = values & _LOW, values >> _SHIFT
+    p00, p01, p10, p11 = m0 * v0, m0 * v1, m1 * v0, m1 * v1
+    carry = ((p00 >> _SHIFT) + (p01 & _LOW) + (p10 & _LOW)) >> _SHIFT
+    return p11 + (p01 >> _SHIFT) + (p10 >> _SHIFT) + carry, low
+
+
+def philox(counters, key):
+    """
+    Philox4x64-10 block function
+
+    Produces the same blocks as numpy.random.Philox, but for many independent
+    counters at once, which is what lets any block be computed without the ones before it.
+
+    Args:
+        counters (numpy.ndarray): uint64 counters of shape (N, 4)
+        key (tuple): Two 64-bit key words
+
+    Returns:
+        numpy.ndarray: uint64 random words of shape (N, 4)
+    """
+    counters = np.asarray(counters, dtype=np.uint64)
+    x0, x1, x2, x3 = counters[:, 0], counters[:, 1], counters[:, 2], counters[:, 3]
+    k0, k1 = key[0] & _MASK, key[1] & _MASK
+    for round_num in range(10):
+        if round_num:
+            k0 = (k0 + _W0) & _MASK
+            k1 = (k1 + _W1) & _MASK
+        hi0, lo0 = _mulhilo(_M0, x0)
+        hi1, lo1 = _mulhilo(_M1, x2)
+        x0, x1, x2, x3 = hi1 ^ x1 ^ np.uint64(k0), lo1, hi0 ^ x3 ^ np.uint64(k1), lo0
+    return np.stack([x0, x1, x2, x3], axis=1)
+
+
+def _seed_key(seed):
+    return (seed & _MASK, (seed >> 64) & _MASK)
+
+
+def deal_values(seed, matches, hands, count=52):
+    """
+    Uniform values in [0, 1) that decide the deal of each hand
+
+    Value i chooses the card dealt into deck position i. Counter block j of a hand is
+    (j, hand, match, 0) under the key derived from seed; the last counter word is 0
+    for deals and nonzero for simulation streams, so the two never overlap.
+
+    Args:
+        seed (int): Tournament seed
+        matches (numpy.ndarray): Match id of each hand
+        hands (numpy.ndarray): Hand number of each hand
+        count (int): Values needed per hand (the first count of the 52)
+
+    Returns:
+        numpy.ndarray: float64 array of shape (N, count)
+    """
+    matches = np.asarray(matches, dtype=np.uint64).reshape(-1)
+    hands = np.asarray(hands, dtype=np.uint64).reshape(-1)
+    matches, hands = np.broadcast_arrays(matches, hands)
+    blocks = (count + 3) // 4
+    counters = np.zeros((len(hands), blocks, 4), dtype=np.uint64)
+    counters[:, :, 0] = np.arange(blocks, dtype=np.uint64)
+    counters[:, :, 1] = hands[:, None]
+    counters[:, :, 2] = matches[:, None]
+    words = philox(counters.reshape(-1, 4), _seed_key(seed)).reshape(len(hands), 4 * blocks)[:, :count]
+    return (words >> _FLOAT_SHIFT) * (1.0 / (1 << 53))
+
+
+def hand_seeds(seed, match, hands, stream):
+    """
+    One 62-bit integer seed per hand, vectorized over hands
+
+    Block (0, hand, match, stream) of the seed's Philox stream, so with a nonzero
+    stream the seeds never coincide with deal values.
+
+    Args:
+        seed (int): Tournament seed
+        match (int): Match id
+        hands (numpy.ndarray): Hand numbers
+        stream (int): Nonzero stream id
+
+    Returns:
+        list: Seeds as Python ints, in the order of hands
+    """
+    hands = np.asarray(hands, dtype=np.uint64).reshape(-1)
+    counters = np.zeros((len(hands), 4), dtype=np.uint64)
+    counters[:, 1] = hands
+    counters[:, 2] = match
+    counters[:, 3] = stream
+    return (philox(counters, _seed_key(seed))[:, 0] >> np.uint64(2)).tolist()
+
+
+def deal_cards(seed, matches, hands, num_cards=9):
+    """
+    Card indices (see utils.CARD_INDEX) of whole deals, vectorized over hands
+
+    Each deal is the same partial Fisher-Yates shuffle Deck.deal performs, so these are
+    exactly the cards a PokerEngine with CounterRNG(seed, match) deals in that hand
+    (headless or not, since seeded deals burn no cards): both players' hole cards, then flop, turn and river.
+
+    Args:
+        seed (int): Tournament seed
+        matches (numpy.ndarray): Match id of each hand
+        hands (numpy.ndarray): Hand number of each hand
+        num_cards (int): Cards to deal per hand
+
+    Returns:
+        numpy.ndarray: int64 array of shape (N, num_cards)
+    """
+    values = deal_values(seed, matches, hands, num_cards)
+    num_hands = len(values)
+    rows = np.arange(num_hands)
+    cards = np.tile(np.arange(52, dtype=np.int64), (num_hands, 1))
+    for position in range(num_cards):
+        pick = position + (values[:, position] * (52 - position)).astype(np.int64)
+        picked = cards[rows, pick]
+        cards[rows, pick] = cards[:, position]
+        cards[:, position] = picked
+    return cards[:, :num_cards]
+
+
+class DeckRandom:
+    """
+    Random source for one hand's Deck
+
+    Deck.deal calls randrange(dealt, 52); the result depends only on the deck position
+    being filled, never on how many numbers were drawn before, so restoring a snapshot
+    deals the same cards again.
+    """
+    __slots__ = ('seed', 'match', 'hand', 'values', 'stream', 'forks')
+
+    def __init__(self, seed, match, hand, values, stream=0):
+        self.seed = seed
+        self.match = match
+        self.hand = hand
+        self.values = values
+        self.stream = stream
+        self.forks = 0
+
+    def randrange(self, start, stop):
+        """Card position to swap into deck position start"""
+        values = self.values
+        if start >= len(values):
+            # Deeper into the deck than a normal hand goes
+            values = self.values = deal_values(self.seed, self.match, self.hand)[0].tolist()
+        return start + int(values[start] * (stop - start))
+
+    def fork(self):
+        """
+        Independent source for a cloned engine, so simulations can't see the real upcoming cards
+
+        Forks are numbered, so the same sequence of clones gets the same cards.
+        """
+        self.forks += 1
+        stream = (1 << 63) | (hash((self.stream, self.forks)) & ((1 << 63) - 1))
+        values = CounterRNG(self.seed, self.match).generator(self.hand, stream).random(52).tolist()
+        return DeckRandom(self.seed, self.match, self.hand, values, stream)
+
+
+class CounterRNG:
+    """
+    Counter-based random source for a match
+
+    Every deal and simulation stream is a pure function of (seed, match, hand), so
+    hand k of match j comes out the same whichever worker generates it and in
+    whatever order. Pass it as PokerEngine(rng=...) or VectorEngine(rng=...).
+    """
+    def __init__(self, seed=None, match=0):
+        """
+        Args:
+            seed (int): Tournament seed (a random one if None)
+            match (int): Match id
+        """
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.match = match
+        self._chunk_start = None
+        self._chunk = None
+
+    def for_match(self, match):
+        """Source for another match of the same tournament"""
+        return CounterRNG(self.seed, match)
+
+    def deal(self, hand):
+        """
+        Random source for dealing a hand
+
+        Args:
+            hand (int): Hand number
+
+        Returns:
+            DeckRandom: Source to give the Deck for this hand
+        """
+        start = hand - hand % _DEAL_CHUNK
+        if start != self._chunk_start:
+            # Consecutive hands are generated together, about a microsecond per hand
+            self._chunk = deal_values(self.seed, self.match, np.arange(start, start + _DEAL_CHUNK),
+                                      _DEAL_VALUES).tolist()
+            self._chunk_start = start
+        return DeckRandom(self.seed, self.match, hand, self._chunk[hand - start])
+
+    def deal_cards(self, hands, num_cards=9):
+        """Card indices of this match's deals for the given hand numbers (see deal_cards)"""
+        return deal_cards(self.seed, self.match, hands, num_cards)
+
+    def generator(self, hand, stream=1):
+        """
+        NumPy generator for simulations within a hand
+
+        Args:
+            hand (int): Hand number
+            stream (int): Nonzero stream id, to give several simulations their own numbers
+
+        Returns:
+            numpy.random.Generator: Philox generator starting at counter (0, hand, match, stream)
+        """
+        return np.random.Generator(np.random.Philox(key=self.seed & ((1 << 128) - 1),
+                                                    counter=[0, hand, self.match, stream]))
+
+    def random(self, hand, stream=1):
+        """
+        random.Random for simulation helpers that take one (e.g. calculate_monte_carlo_strength)
+
+        Args:
+            hand (int): Hand number
+            stream (int): Nonzero stream id
+
+        Returns:
+            random.Random: Generator seeded from the (seed, match, hand, stream) stream
+        """
+        return random.Random(int(self.generator(hand, stream).integers(1 << 62)))
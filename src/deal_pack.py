@@ -0,0 +1,280 @@
+"""
+Deal Packs
+Fixed sets of deals stored as packed binary records, memory-mapped and addressable by hand index
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import numpy as np
+from .batch_evaluator import evaluate_batch
+from .counter_rng import deal_cards
+from .utils import DECK, CARD_INDEX
+
+MAGIC = b'DEALPACK'
+VERSION = 1
+HEADER_SIZE = 24  # magic (8), version (1), flags (1), reserved (6), number of hands (8)
+
+FLAG_WINNERS = 1  # Each record stores the showdown winner
+FLAG_SCORES = 2   # Each record stores both players' hand scores (see batch_evaluator)
+
+SPLIT = -1  # Stored winner for a split pot
+
+
+def _record_dtype(flags):
+    """Packed record layout for the given flags"""
+    fields = [('cards', 'u1', (9,))]  # Player 1 hole cards, player 2 hole cards, board
+    if flags & FLAG_WINNERS:
+        fields.append(('winner', 'i1'))
+    if flags & FLAG_SCORES:
+        fields.append(('scores', '<u4', (2,)))
+    return np.dtype(fields)
+
+
+def showdown_results(cards):
+    """
+    Score both players' hands for a batch of deals
+
+    Args:
+        cards (numpy.ndarray): Card indices of shape (N, 9)
+
+    Returns:
+        tuple: (winners, scores) - winning seat or SPLIT per deal, and scores of shape (N, 2)
+    """
+    cards = np.asarray(cards, dtype=np.int64)
+    scores = np.stack([evaluate_batch(cards[:, [0, 1, 4, 5, 6, 7, 8]]),
+                       evaluate_batch(cards[:, [2, 3, 4, 5, 6, 7, 8]])], axis=1)
+    winners = np.where(scores[:, 0] > scores[:, 1], 0, np.where(scores[:, 0] < scores[:, 1], 1, SPLIT))
+    return winners, scores
+
+
+def write_deal_pack(path, cards, winners=True, scores=True, chunk_size=100000):
+    """
+    Write deals to a deal pack file
+
+    Args:
+        path (str): Output file
+        cards (numpy.ndarray): Card indices of shape (N, 9), in the order player 1 hole cards,
+                               player 2 hole cards, flop, turn, river
+        winners (bool): Store the precomputed showdown winner of each deal
+        scores (bool): Store the precomputed hand scores of each deal
+        chunk_size (int): Deals scored and written at a time
+    """
+    cards = np.asarray(cards)
+    flags = (FLAG_WINNERS if winners else 0) | (FLAG_SCORES if scores else 0)
+    dtype = _record_dtype(flags)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC + bytes([VERSION, flags]) + bytes(6) + len(cards).to_bytes(8, 'little'))
+        for start in range(0, len(cards), chunk_size):
+            chunk = cards[start:start + chunk_size]
+            records = np.zeros(len(chunk), dtype=dtype)
+            records['cards'] = chunk
+            if flags:
+                chunk_winners, chunk_scores = showdown_results(chunk)
+                if winners:
+                    records['winner'] = chunk_winners
+                if scores:
+                    records['scores'] = chunk_scores
+            records.tofile(f)
+
+
+def generate_deal_pack(path, num_hands, seed=None, winners=True, scores=True, chunk_size=100000):
+    """
+    Write a deal pack of uniformly random deals
+
+    Args:
+        path (str): Output file
+        num_hands (int): Number of deals
+        seed (int): Optional seed, so the same pack can be regenerated; deal i is the deal
+                    CounterRNG(seed) gives hand i of match 0
+        winners (bool): Store the precomputed showdown winner of each deal
+        scores (bool): Store the precomputed hand scores of each deal
+        chunk_size (int): Deals generated at a time
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    cards = np.empty((num_hands, 9), dtype=np.uint8)
+    for start in range(0, num_hands, chunk_size):
+        count = min(chunk_size, num_hands - start)
+        cards[start:start + count] = deal_cards(seed, 0, np.arange(start, start + count))
+    write_deal_pack(path, cards, winners, scores, chunk_size)
+
+
+class DealPack:
+    """
+    Read-only, memory-mapped deal pack
+
+    Deals can be read by index (pack[i] returns a predefined_cards dictionary) or
+    streamed in order with next_deal(). Passing the pack itself as predefined_cards
+    to PokerEngine.initialize_round or play_round plays the next deal.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Deal pack file written by write_deal_pack
+        """
+        with open(path, 'rb') as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+            raise ValueError(f"{path} is not a deal pack")
+        if header[8] != VERSION:
+            raise ValueError(f"Unsupported deal pack version {header[8]}")
+
+        self.path = path
+        self.flags = header[9]
+        num_hands = int.from_bytes(header[16:24], 'little')
+        if num_hands:
+            self.records = np.memmap(path, dtype=_record_dtype(self.flags), mode='r',
+                                     offset=HEADER_SIZE, shape=(num_hands,))
+        else:
+            self.records = np.zeros(0, dtype=_record_dtype(self.flags))  # Empty files can't be mapped
+        self.position = 0
+
+    @property
+    def cards(self):
+        """Card indices of every deal, shape (N, 9)"""
+        return self.records['cards']
+
+    @property
+    def winners(self):
+        """Precomputed showdown winner of every deal (seat or SPLIT), or None if not stored"""
+        return self.records['winner'] if self.flags & FLAG_WINNERS else None
+
+    @property
+    def scores(self):
+        """Precomputed hand scores of every deal, shape (N, 2), or None if not stored"""
+        return self.records['scores'] if self.flags & FLAG_SCORES else None
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        cards = [DECK[card] for card in self.records[index]['cards'].tolist()]
+        return {
+            'player1': cards[0:2],
+            'player2': cards[2:4],
+            'community': cards[4:9]
+        }
+
+    def next_deal(self):
+        """
+        Return the next deal, wrapping around at the end of the pack
+
+        Returns:
+            dict: Predefined cards in the format expected by PokerEngine.initialize_round
+        """
+        if self.position >= len(self.records):
+            self.position = 0
+        deal = self[self.position]
+        self.position += 1
+        return deal
+
+    def seek(self, index):
+        """Make next_deal() return the deal at index"""
+        self.position = index
+
+
+def import_json(sources, path, winners=True, scores=True):
+    """
+    Build a deal pack from per-round JSON files (as written by pregenerate_round)
+
+    Args:
+        sources (list or str): JSON files, or a directory of round_*_cards.json files
+        path (str): Output deal pack
+        winners (bool): Store the precomputed showdown winner of each deal
+        scores (bool): Store the precomputed hand scores of each deal
+
+    Returns:
+        int: Number of deals written
+    """
+    if isinstance(sources, str):
+        sources = glob.glob(os.path.join(sources, 'round_*_cards.json'))
+
+    rounds = []
+    for source in sources:
+        with open(source, 'r') as f:
+            rounds.append(json.load(f))
+    rounds.sort(key=lambda card_data: card_data.get('round', 0))
+
+    cards = np.array([[CARD_INDEX[card] for card in
+                       card_data['player1'] + card_data['player2'] + card_data['community']]
+                      for card_data in rounds], dtype=np.uint8).reshape(-1, 9)
+    write_deal_pack(path, cards, winners, scores)
+    return len(cards)
+
+
+def export_json(path, directory, start=0, count=None):
+    """
+    Write deals from a deal pack as per-round JSON files readable by load_predefined_cards
+
+    Args:
+        path (str): Deal pack
+        directory (str): Output directory (e.g., poker_rounds)
+        start (int): Index of the first deal to export
+        count (int): Number of deals to export (all remaining deals by default)
+
+    Returns:
+        int: Number of files written
+    """
+    pack = DealPack(path)
+    end = len(pack) if count is None else min(len(pack), start + count)
+    os.makedirs(directory, exist_ok=True)
+    for index in range(start, end):
+        card_data = {'round': index + 1}
+        card_data.update(pack[index])
+        with open(os.path.join(directory, f"round_{index + 1}_cards.json"), 'w') as f:
+            json.dump(card_data, f, indent=2)
+    return max(0, end - start)
+
+
+def main():
+    """Command-line tool: generate, import, export and inspect deal packs"""
+    parser = argparse.ArgumentParser(description="Create and convert deal packs")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help="Write a pack of random deals")
+    generate.add_argument('pack')
+    generate.add_argument('num_hands', type=int)
+    generate.add_argument('--seed', type=int)
+    generate.add_argument('--no-showdown', action='store_true', help="Don't store winners and scores")
+
+    to_pack = commands.add_parser('import', help="Convert per-round JSON files to a pack")
+    to_pack.add_argument('source', help="Directory of round_*_cards.json files")
+    to_pack.add_argument('pack')
+    to_pack.add_argument('--no-showdown', action='store_true', help="Don't store winners and scores")
+
+    to_json = commands.add_parser('export', help="Write deals from a pack as per-round JSON files")
+    to_json.add_argument('pack')
+    to_json.add_argument('directory')
+    to_json.add_argument('--start', type=int, default=0)
+    to_json.add_argument('--count', type=int)
+
+    info = commands.add_parser('info', help="Describe a pack")
+    info.add_argument('pack')
+
+    args = parser.parse_args()
+    if args.command == 'generate':
+        generate_deal_pack(args.pack, args.num_hands, args.seed,
+                           winners=not args.no_showdown, scores=not args.no_showdown)
+        print(f"Wrote {args.num_hands} deals to {args.pack}")
+    elif args.command == 'import':
+        count = import_json(args.source, args.pack,
+                            winners=not args.no_showdown, scores=not args.no_showdown)
+        print(f"Imported {count} deals into {args.pack}")
+    elif args.command == 'export':
+        count = export_json(args.pack, args.directory, args.start, args.count)
+        print(f"Exported {count} deals to {args.directory}")
+    else:
+        pack = DealPack(args.pack)
+        print(f"{args.pack}: {len(pack)} deals, "
+              f"winners {'stored' if pack.winners is not None else 'not stored'}, "
+              f"scores {'stored' if pack.scores is not None else 'not stored'}")
+        if len(pack):
+            print(f"First deal: {pack[0]}")
+
+
+if __name__ == "__main__":
+    main()
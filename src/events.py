@@ -0,0 +1,219 @@
+"""
+Engine Events
+Typed notifications of what happens in a hand, published to subscribers only when someone listens
+"""
+
+
+class Event:
+    """
+    Base class of the events PokerEngine publishes
+
+    Every event carries the engine it happened in and the hand number, so one bus can
+    be shared by many tables. Subscribing to Event itself receives every event type.
+    """
+    __slots__ = ('engine', 'hand')
+
+    def __repr__(self):
+        fields = [name for cls in reversed(type(self).__mro__) for name in getattr(cls, '__slots__', ())
+                  if name != 'engine']
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in fields)})"
+
+
+class HandStarted(Event):
+    """
+    Antes are in and hole cards are dealt
+
+    Attributes:
+        stacks (tuple): Stacks by seat after the antes
+        ante (int): Ante paid by each seat
+        hole_cards (tuple): Both seats' hole cards
+        first (int): Seat to act first preflop
+    """
+    __slots__ = ('stacks', 'ante', 'hole_cards', 'first')
+
+    def __init__(self, engine, hand, stacks, ante, hole_cards, first):
+        self.engine = engine
+        self.hand = hand
+        self.stacks = stacks
+        self.ante = ante
+        self.hole_cards = hole_cards
+        self.first = first
+
+
+class ActionTaken(Event):
+    """
+    A seat's action has been applied
+
+    Attributes:
+        street (int): 0 preflop, 1 flop, 2 turn, 3 river
+        seat (int): Seat that acted
+        action (dict): Action as the bot returned it
+        kind (str): What the engine made of it: 'fold', 'check', 'call', 'raise',
+                    or None for an unknown action type (see normalize_action)
+        amount (int): Chips the action put in the pot
+        pot (int): Pot after the action
+    """
+    __slots__ = ('street', 'seat', 'action', 'kind', 'amount', 'pot')
+
+    def __init__(self, engine, hand, street, seat, action, kind, amount, pot):
+        self.engine = engine
+        self.hand = hand
+        self.street = street
+        self.seat = seat
+        self.action = action
+        self.kind = kind
+        self.amount = amount
+        self.pot = pot
+
+
+class StreetDealt(Event):
+    """
+    The flop, turn or river is on the board (also when the board is run out after an all-in)
+
+    Attributes:
+        street (int): 1 flop, 2 turn, 3 river
+        community_cards (tuple): The whole board so far
+    """
+    __slots__ = ('street', 'community_cards')
+
+    def __init__(self, engine, hand, street, community_cards):
+        self.engine = engine
+        self.hand = hand
+        self.street = street
+        self.community_cards = community_cards
+
+
+class Showdown(Event):
+    """
+    Both hands are shown, before the pot is awarded
+
+    Attributes:
+        hole_cards (tuple): Both seats' hole cards
+        community_cards (tuple): The full board
+        scores (tuple): Hand scores by seat (see score_hand; higher wins)
+        winner (int): Winning seat, or None for a split pot
+    """
+    __slots__ = ('hole_cards', 'community_cards', 'scores', 'winner')
+
+    def __init__(self, engine, hand, hole_cards, community_cards, scores, winner):
+        self.engine = engine
+        self.hand = hand
+        self.hole_cards = hole_cards
+        self.community_cards = community_cards
+        self.scores = scores
+        self.winner = winner
+
+
+class HandEnded(Event):
+    """
+    The pot has been awarded
+
+    Attributes:
+        winner (int): Winning seat, or None for a split pot
+        showdown (bool): Whether the hand went to showdown
+        pot (int): Chips awarded
+        stacks (tuple): Stacks by seat after the pot was awarded
+    """
+    __slots__ = ('winner', 'showdown', 'pot', 'stacks')
+
+    def __init__(self, engine, hand, winner, showdown, pot, stacks):
+        self.engine = engine
+        self.hand = hand
+        self.winner = winner
+        self.showdown = showdown
+        self.pot = pot
+        self.stacks = stacks
+
+
+EVENT_TYPES = (HandStarted, ActionTaken, StreetDealt, Showdown, HandEnded)
+
+
+class _Batch:
+    """Subscription that hands its events over in lists of up to batch_size"""
+    __slots__ = ('handler', 'batch_size', 'events')
+
+    def __init__(self, handler, batch_size):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.events = []
+
+    def __call__(self, event):
+        events = self.events
+        events.append(event)
+        if len(events) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.events:
+            events, self.events = self.events, []
+            self.handler(events)
+
+
+class EventBus:
+    """
+    Typed publish/subscribe channel for engine events
+
+    Pass one to PokerEngine(events=...) or PokerTournament(events=...), or call
+    PokerEngine.subscribe. The engine only builds an event when its type has a
+    subscriber, so an engine without a bus, or with nobody listening to a type, pays
+    no more than an attribute check. Handlers run synchronously, in subscription order,
+    while the engine waits; batched subscriptions instead get lists of events, which
+    suits consumers that write or aggregate in bulk.
+    """
+    def __init__(self):
+        self.handlers = {}  # Event type -> handlers, only for types with a subscriber
+        self._batches = []
+
+    def subscribe(self, event_type, handler, batch_size=None):
+        """
+        Register a handler for an event type
+
+        Args:
+            event_type (type): HandStarted, ActionTaken, StreetDealt, Showdown, HandEnded,
+                               or Event for all of them
+            handler (callable): Called with each event, or with a list of events if batched
+            batch_size (int): Optional number of events to collect before calling the handler;
+                              call flush() to deliver a partial batch
+
+        Returns:
+            Subscription to pass to unsubscribe
+        """
+        if batch_size:
+            handler = _Batch(handler, batch_size)
+            self._batches.append(handler)
+        for event_type in EVENT_TYPES if event_type is Event else (event_type,):
+            # Replace rather than append, so handlers can subscribe while an event is being published
+            self.handlers[event_type] = self.handlers.get(event_type, []) + [handler]
+        return handler
+
+    def unsubscribe(self, subscription):
+        """Remove a subscription, delivering any events still in its batch"""
+        if isinstance(subscription, _Batch):
+            subscription.flush()
+            self._batches.remove(subscription)
+        for event_type, handlers in list(self.handlers.items()):
+            if subscription in handlers:
+                handlers = handlers[:]
+                handlers.remove(subscription)
+                if handlers:
+                    self.handlers[event_type] = handlers
+                else:
+                    del self.handlers[event_type]
+
+    def listening(self, event_type):
+        """Whether anyone subscribes to an event type"""
+        return event_type in self.handlers
+
+    def publish(self, event):
+        """Deliver an event to the handlers of its type"""
+        for handler in self.handlers.get(type(event), ()):
+            handler(event)
+
+    def flush(self):
+        """Deliver every partial batch"""
+        for batch in self._batches:
+            batch.flush()
+
+    def forward(self, bus):
+        """Republish every event on another bus (e.g., a table's own bus to a tournament-wide one)"""
+        return self.subscribe(Event, bus.publish)
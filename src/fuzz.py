@@ -0,0 +1,487 @@
+"""
+Engine Fuzzing
+Differential tests that play random legal and illegal actions on seeded deals through PokerEngine and every faster engine
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import random
+from types import SimpleNamespace
+import numpy as np
+from .async_engine import AsyncPokerEngine
+from .counter_rng import deal_cards
+from .legal_actions import legal_actions
+from .poker_engine import PokerEngine
+from .scheduler import DecisionScheduler
+from .utils import DECK, CARD_INDEX
+from .vector_engine import VectorEngine, bot_policy
+
+# Decisions in one case after which a betting round is taken to never close (a case
+# has at most 8 hands, and once its script runs out every street closes within two)
+MAX_DECISIONS = 1000
+
+
+class FuzzError(Exception):
+    """An engine kept asking for decisions in hands that should have ended"""
+
+
+class FuzzCase:
+    """
+    One fuzz input: the table, the deals and the actions the bots return
+
+    Hand h of the case is deal h of deal_cards(seed, 0, ...). script holds one action
+    spec per decision, consumed by both seats in the order decisions come up; once it
+    runs out the bots check or call. Specs are tuples, so repr(case) is a reproducer:
+
+    - ('fold',), ('check',), ('call',): that action
+    - ('bet', amount), ('raise', amount): that action with any amount, legal or not
+    - ('unknown',): an action type the engine doesn't know
+    - ('legal', u): a legal action chosen by u in [0, 1) (see legal_action)
+    """
+    __slots__ = ('seed', 'stacks', 'ante', 'num_hands', 'script')
+
+    def __init__(self, seed, stacks, ante, num_hands, script):
+        self.seed = seed
+        self.stacks = tuple(stacks)
+        self.ante = ante
+        self.num_hands = num_hands
+        self.script = list(script)
+
+    def __repr__(self):
+        return (f"FuzzCase(seed={self.seed}, stacks={self.stacks}, ante={self.ante}, "
+                f"num_hands={self.num_hands}, script={self.script})")
+
+    def replace(self, **changes):
+        """Copy of the case with some fields changed"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return FuzzCase(**fields)
+
+
+def random_spec(rng, ante):
+    """Random action spec, half of them legal"""
+    r = rng.random()
+    if r < 0.5:
+        return ('legal', round(rng.random(), 3))
+    if r < 0.8:
+        return (rng.choice(('fold', 'check', 'call')),)
+    if r < 0.97:
+        amount = rng.choice((0, 2 * ante, rng.randint(-2 * ante, 6 * ante), rng.randint(0, 1000 * ante),
+                             round(rng.uniform(0, 20 * ante), 2)))
+        return (rng.choice(('bet', 'raise')), amount)
+    return ('unknown',)
+
+
+def random_case(seed):
+    """Random fuzz case, determined by seed"""
+    rng = random.Random(seed)
+    ante = rng.choice((1, 5, 10, 10, 25))
+    stacks = [rng.choice((rng.randint(1, 4 * ante), rng.randint(ante, 50 * ante), rng.randint(ante, 200 * ante)))
+              for _ in range(2)]
+    script = [random_spec(rng, ante) for _ in range(rng.randint(0, 80))]
+    return FuzzCase(seed, stacks, ante, rng.randint(1, 8), script)
+
+
+def legal_action(game_state, u):
+    """
+    Legal action for a game state, chosen by u in [0, 1)
+
+    Folds for small u, raises (sized by u between the minimum and maximum raise)
+    for large u when raising is possible, and checks or calls otherwise.
+    """
+    seat = game_state['player_idx']
+    bets = [0, 0]
+    stacks = [0, 0]
+    bets[seat], bets[1 - seat] = game_state['my_bet'], game_state['opponent_bet']
+    stacks[seat], stacks[1 - seat] = game_state['my_stack'], game_state['opponent_stack']
+    table = SimpleNamespace(current_bet=game_state['current_bet'], min_raise=game_state['min_raise'],
+                            bets=bets, stacks=stacks)
+    legal = legal_actions(table, seat)
+
+    if u < 0.15:
+        return {'action': 'fold'}
+    if u >= 0.6 and legal['min_raise_to'] is not None:
+        low, high = legal['min_raise_to'], legal['max_raise_to']
+        amount = low + int((u - 0.6) / 0.4 * (high - low + 1))
+        return {'action': legal['actions'][2], 'amount': min(amount, high)}
+    return {'action': 'check' if legal['can_check'] else 'call'}
+
+
+class _Script:
+    """Action specs shared by both seats, with the trace of every decision they answer"""
+    def __init__(self, case, trace):
+        self.specs = case.script
+        self.position = 0
+        self.trace = trace
+        self.decisions = 0
+
+    def next_action(self, game_state):
+        self.decisions += 1
+        if self.decisions > MAX_DECISIONS:
+            raise FuzzError(f"Hands didn't end after {MAX_DECISIONS} decisions")
+        self.trace.append(('decision', game_state['player_idx'], len(game_state['community_cards']),
+                           game_state['pot'], game_state['current_bet'], game_state['my_bet'],
+                           game_state['opponent_bet'], game_state['my_stack'], game_state['opponent_stack'],
+                           game_state['min_raise']))
+        if self.position >= len(self.specs):
+            return {'action': 'check' if game_state['current_bet'] <= game_state['my_bet'] else 'call'}
+        spec = self.specs[self.position]
+        self.position += 1
+        if spec[0] == 'legal':
+            return legal_action(game_state, spec[1])
+        if spec[0] == 'unknown':
+            return {'action': 'all-in'}
+        if len(spec) > 1:
+            return {'action': spec[0], 'amount': spec[1]}
+        return {'action': spec[0]}
+
+
+class _ScriptBot:
+    def __init__(self, name, script):
+        self.name = name
+        self.script = script
+
+    def __str__(self):
+        return self.name
+
+    def get_action(self, game_state):
+        return self.script.next_action(game_state)
+
+
+class _Deals:
+    """The case's deals as predefined cards, noting in the trace when each is dealt"""
+    def __init__(self, case, trace):
+        self.cards = deal_cards(case.seed, 0, np.arange(1, case.num_hands + 1))
+        self.hand = 0
+        self.trace = trace
+
+    def next_deal(self):
+        cards = [DECK[card] for card in self.cards[self.hand]]
+        self.hand += 1
+        self.trace.append(('deal', self.hand))
+        return {'player1': cards[0:2], 'player2': cards[2:4], 'community': cards[4:9]}
+
+
+def _engine(engine_class, case, trace, headless=True):
+    """Engine seating two bots that share the case's script"""
+    script = _Script(case, trace)
+    engine = engine_class(_ScriptBot('seat 0', script), _ScriptBot('seat 1', script), case.stacks[0],
+                          case.ante, headless=headless)
+    engine.stacks[0], engine.stacks[1] = case.stacks
+    return engine
+
+
+def _winner_seat(engine, winner):
+    if winner is None:
+        return None
+    return 0 if winner is engine.players[0] else 1
+
+
+def _match_over(stacks, hands_played, case):
+    return hands_played >= case.num_hands or stacks[0] <= 0 or stacks[1] <= 0
+
+
+def _play_engine(case, trace, headless):
+    engine = _engine(PokerEngine, case, trace, headless)
+    deals = _Deals(case, trace)
+    hands_won = [0, 0]
+    hands_played = 0
+    while not _match_over(engine.stacks, hands_played, case):
+        winner = _winner_seat(engine, engine.play_round(deals))
+        if winner is not None:
+            hands_won[winner] += 1
+        hands_played += 1
+    return hands_played, hands_won, list(engine.stacks)
+
+
+def run_reference(case, trace):
+    """PokerEngine with console output (suppressed) and burn cards, as in a visible match"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _play_engine(case, trace, headless=False)
+
+
+def run_headless(case, trace):
+    """Headless PokerEngine.play_round"""
+    return _play_engine(case, trace, headless=True)
+
+
+def run_async(case, trace):
+    """AsyncPokerEngine.play_round"""
+    async def play():
+        engine = _engine(AsyncPokerEngine, case, trace)
+        deals = _Deals(case, trace)
+        hands_won = [0, 0]
+        hands_played = 0
+        while not _match_over(engine.stacks, hands_played, case):
+            winner = _winner_seat(engine, await engine.play_round(deals))
+            if winner is not None:
+                hands_won[winner] += 1
+            hands_played += 1
+        return hands_played, hands_won, list(engine.stacks)
+    return asyncio.run(play())
+
+
+def run_steps(case, trace):
+    """PokerEngine.play_round_steps, answered directly"""
+    engine = _engine(PokerEngine, case, trace)
+    deals = _Deals(case, trace)
+    hands_won = [0, 0]
+    hands_played = 0
+    while not _match_over(engine.stacks, hands_played, case):
+        steps = engine.play_round_steps(deals)
+        try:
+            seat, view = next(steps)
+            while True:
+                seat, view = steps.send(engine.players[seat].get_action(view))
+        except StopIteration as finished:
+            winner = finished.value
+        if winner is not None:
+            hands_won[winner] += 1
+        hands_played += 1
+    return hands_played, hands_won, list(engine.stacks)
+
+
+def run_scheduler(case, trace):
+    """DecisionScheduler with batched get_actions calls"""
+    engine = _engine(PokerEngine, case, trace)
+    scheduler = DecisionScheduler()
+    scheduler.add_match(engine, case.num_hands, _Deals(case, trace))
+    scheduler.run()
+    result = scheduler.results()[0]
+    return result['hands_played'], result['hands_won'], result['stacks']
+
+
+def run_vector(case, trace):
+    """VectorEngine with a single game"""
+    script = _Script(case, trace)
+    policies = (bot_policy(_ScriptBot('seat 0', script)), bot_policy(_ScriptBot('seat 1', script)))
+    engine = VectorEngine(1, case.stacks[0], case.ante)
+    engine.stacks[0] = case.stacks
+    deals = _Deals(case, trace)
+    hands_won = [0, 0]
+    hands_played = 0
+    while not _match_over(engine.stacks[0], hands_played, case):
+        deal = deals.next_deal()
+        cards = [CARD_INDEX[card] for card in deal['player1'] + deal['player2'] + deal['community']]
+        winner = int(engine.play_hand(policies[0], policies[1], deals=np.array([cards]))[0])
+        if winner in (0, 1):
+            hands_won[winner] += 1
+        hands_played += 1
+    return hands_played, hands_won, [int(stack) for stack in engine.stacks[0]]
+
+
+# Engines checked against run_reference; each plays a case and returns
+# (hands played, hands won by seat, final stacks), recording decisions in trace
+CANDIDATES = {
+    'headless': run_headless,
+    'async': run_async,
+    'steps': run_steps,
+    'scheduler': run_scheduler,
+    'vector': run_vector
+}
+
+
+def play_case(runner, case):
+    """
+    Play a case with one engine
+
+    Returns:
+        list: Trace of every deal and decision, ending with the match result or the
+              exception the engine raised
+    """
+    trace = []
+    try:
+        hands_played, hands_won, stacks = runner(case, trace)
+        trace.append(('result', hands_played, tuple(hands_won), tuple(stacks)))
+    except Exception as error:
+        trace.append(('error', type(error).__name__, str(error)))
+    return trace
+
+
+def first_difference(trace1, trace2):
+    """Index of the first entry where two traces differ, or None if they're the same"""
+    for index, (entry1, entry2) in enumerate(zip(trace1, trace2)):
+        if entry1 != entry2:
+            return index
+    if len(trace1) != len(trace2):
+        return min(len(trace1), len(trace2))
+    return None
+
+
+def _fails(case, candidate):
+    """Whether the candidate diverges on a case (for 'reference', whether PokerEngine itself fails)"""
+    reference = play_case(run_reference, case)
+    if candidate == 'reference':
+        return reference[-1][0] == 'error'
+    return first_difference(reference, play_case(CANDIDATES[candidate], case)) is not None
+
+
+def _smaller_cases(case):
+    """Simplifications of a case, roughly from the biggest cut to the smallest"""
+    for num_hands in range(1, case.num_hands):
+        yield case.replace(num_hands=num_hands)
+    script = case.script
+    size = len(script) // 2
+    while size >= 1:
+        for start in range(0, len(script), size):
+            yield case.replace(script=script[:start] + script[start + size:])
+        size //= 2
+    for index, spec in enumerate(script):
+        simpler = [('call',)] if spec != ('call',) else []
+        if len(spec) > 1 and spec[0] != 'legal':
+            amount = spec[1]
+            simpler += [(spec[0], value) for value in (0, int(amount), amount // 2) if value != amount]
+        for replacement in simpler:
+            yield case.replace(script=script[:index] + [replacement] + script[index + 1:])
+    for seat in range(2):
+        stack = case.stacks[seat]
+        for smaller in (case.stacks[1 - seat], stack // 2, case.ante):
+            if 0 < smaller < stack:
+                stacks = list(case.stacks)
+                stacks[seat] = smaller
+                yield case.replace(stacks=stacks)
+    if case.ante > 1:
+        yield case.replace(ante=1)
+
+
+def shrink(case, candidate, max_checks=5000):
+    """
+    Reduce a case on which a candidate diverges from the reference
+
+    Greedily applies the first simplification that still diverges until none does:
+    fewer hands, shorter scripts, plainer actions, smaller stacks and ante.
+
+    Args:
+        case (FuzzCase): Diverging case
+        candidate (str): Name in CANDIDATES, or 'reference' to shrink a case on which
+                         PokerEngine itself raises or never finishes a hand
+        max_checks (int): Limit on cases tried
+
+    Returns:
+        FuzzCase: Smallest diverging case found
+    """
+    checks = 0
+    shrunk = True
+    while shrunk and checks < max_checks:
+        shrunk = False
+        for smaller in _smaller_cases(case):
+            checks += 1
+            if _fails(smaller, candidate):
+                case = smaller
+                shrunk = True
+                break
+            if checks >= max_checks:
+                break
+    return case
+
+
+def check_case(case, candidates=None, minimize=True):
+    """
+    Play a case with the reference and every candidate
+
+    Args:
+        case (FuzzCase or int): Case, or the seed of a random_case
+        candidates (list): Names in CANDIDATES (all by default)
+        minimize (bool): Shrink each divergence to a minimal reproducer
+
+    Returns:
+        list: One dict per diverging candidate with 'candidate', 'case', the index of the
+              first difference and both traces (for the shrunk case when minimize is set).
+              If PokerEngine itself fails, that comes first, with candidate 'reference'.
+    """
+    if not isinstance(case, FuzzCase):
+        case = random_case(case)
+    reference = play_case(run_reference, case)
+    failing = ['reference'] if reference[-1][0] == 'error' else []
+    failing += [candidate for candidate in candidates or CANDIDATES
+                if first_difference(reference, play_case(CANDIDATES[candidate], case)) is not None]
+    divergences = []
+    for candidate in failing:
+        diverging = shrink(case, candidate) if minimize else case
+        expected = play_case(run_reference, diverging)
+        if candidate == 'reference':
+            actual = expected
+            index = len(expected) - 1
+        else:
+            actual = play_case(CANDIDATES[candidate], diverging)
+            index = first_difference(expected, actual)
+        divergences.append({
+            'candidate': candidate,
+            'case': diverging,
+            'index': index,
+            'reference': expected,
+            'trace': actual
+        })
+    return divergences
+
+
+def _check_seed(task):
+    seed, candidates, minimize = task
+    return check_case(seed, candidates, minimize)
+
+
+def fuzz(num_cases=1000, seed=0, candidates=None, minimize=True, processes=1, verbose=True):
+    """
+    Check random cases against every candidate engine
+
+    Args:
+        num_cases (int): Cases to play
+        seed (int): Seed of the first case; case i uses seed + i
+        candidates (list): Names in CANDIDATES (all by default)
+        minimize (bool): Shrink divergences to minimal reproducers
+        processes (int): Worker processes to spread cases over
+        verbose (bool): Print each divergence
+
+    Returns:
+        list: Divergences, as returned by check_case
+    """
+    tasks = [(seed + index, candidates, minimize) for index in range(num_cases)]
+    if processes > 1:
+        with multiprocessing.get_context().Pool(processes) as pool:
+            results = pool.map(_check_seed, tasks)
+    else:
+        results = [_check_seed(task) for task in tasks]
+
+    divergences = [divergence for result in results for divergence in result]
+    if verbose:
+        for divergence in divergences:
+            print(format_divergence(divergence))
+        print(f"{num_cases} cases, {len(divergences)} divergences")
+    return divergences
+
+
+def format_divergence(divergence):
+    """Describe a divergence: the reproducer and the first differing trace entries"""
+    index = divergence['index']
+    if divergence['candidate'] == 'reference':
+        return (f"\nPokerEngine fails at trace entry {index}\n"
+                f"  case:      {divergence['case']!r}\n"
+                f"  error:     {divergence['trace'][index]}")
+    expected = divergence['reference'][index] if index < len(divergence['reference']) else 'end of trace'
+    actual = divergence['trace'][index] if index < len(divergence['trace']) else 'end of trace'
+    return (f"\n{divergence['candidate']} diverges from PokerEngine at trace entry {index}\n"
+            f"  case:      {divergence['case']!r}\n"
+            f"  reference: {expected}\n"
+            f"  {divergence['candidate']:<10} {actual}")
+
+
+def main():
+    """Command-line tool: fuzz the candidate engines against PokerEngine"""
+    parser = argparse.ArgumentParser(description="Differential fuzzing of the engines against PokerEngine")
+    parser.add_argument('--cases', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--candidates', help=f"Comma-separated subset of {', '.join(CANDIDATES)}")
+    parser.add_argument('--processes', type=int, default=1)
+    parser.add_argument('--no-shrink', action='store_true', help="Report divergences without shrinking them")
+    args = parser.parse_args()
+
+    candidates = args.candidates.split(',') if args.candidates else None
+    divergences = fuzz(args.cases, args.seed, candidates, not args.no_shrink, args.processes)
+    raise SystemExit(1 if divergences else 0)
+
+
+if __name__ == "__main__":
+    main()
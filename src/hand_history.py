@@ -0,0 +1,275 @@
+"""
+Hand History
+Compact, append-only log of every hand played, as compressed JSONL or length-prefixed binary records
+"""
+
+import glob
+import json
+import os
+import struct
+import zlib
+from .utils import DECK, CARD_INDEX
+
+ACTION_NAMES = ('fold', 'check', 'call', 'bet', 'raise', 'unknown')
+ACTION_CODES = {name: code for code, name in enumerate(ACTION_NAMES)}
+STREET_INDEX = {'preflop': 0, 'flop': 1, 'turn': 2, 'river': 3}
+
+BINARY_MAGIC = b'PKHH\x02'
+_BINARY_MAGIC_V1 = b'PKHH\x01'  # Without match ids and player names
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# Binary record: payload length, then the hand header, 9 card bytes, the match id and player names, and the actions
+_LENGTH = struct.Struct('<I')
+_HAND = struct.Struct('<Qqqqqqbb?BH')  # hand, ante, start stacks, end stacks, first, winner, showdown, board, actions
+_ACTION = struct.Struct('<Bqq')        # street << 4 | seat << 3 | action code, amount, pot after the action
+_MATCH = struct.Struct('<qBB')         # match id (-1 if unknown), byte lengths of the two player names
+_NO_CARD = 255
+
+
+class HandHistoryWriter:
+    """
+    Buffered writer for hand histories
+
+    Hands are encoded as they finish and written once the buffer reaches buffer_size
+    bytes, so memory use is bounded. Every write is a self-contained chunk (a gzip
+    member or whole binary records), which lets read_hand_history follow a log that is
+    still being written. Files are rotated to path.1, path.2, ... after max_bytes.
+    """
+    def __init__(self, path, format='jsonl', buffer_size=1 << 16, max_bytes=None):
+        """
+        Args:
+            path (str): File to write (rotated segments get a numeric suffix)
+            format (str): 'jsonl' for gzip-compressed JSON lines or 'binary' for packed records
+            buffer_size (int): Bytes of encoded hands kept in memory before writing
+            max_bytes (int): Optional size after which a new file is started
+        """
+        if format not in ('jsonl', 'binary'):
+            raise ValueError(f"Unknown hand history format: {format}")
+        self.path = path
+        self.format = format
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.segment = 0
+        self.hands_written = 0
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._hands = {}  # Hands in progress, by table state, so engines can share a writer
+        self._file = None
+        self._open_segment()
+
+    def _segment_path(self, segment):
+        return self.path if segment == 0 else f"{self.path}.{segment}"
+
+    def _open_segment(self):
+        self._file = open(self._segment_path(self.segment), 'ab')
+        if self.format == 'binary' and self._file.tell() == 0:
+            self._file.write(BINARY_MAGIC)
+            self._file.flush()
+
+    def begin_hand(self, state, ante, players=None, match_id=None):
+        """
+        Start recording a hand once antes are in and cards are dealt
+
+        Hand numbers restart in every match (and duplicate matches play each one twice),
+        so hands are logged with the match id and the players by seat to attribute them.
+
+        Args:
+            state (TableState): Engine state after initialize_round
+            ante (int): Ante paid by each player
+            players (list): Optional players by seat, logged by name
+            match_id (int): Optional id of the match the hand belongs to
+        """
+        names = [str(player) for player in players] if players is not None else ['', '']
+        self._hands[id(state)] = [state.current_round, ante, state.stacks[0] + ante, state.stacks[1] + ante,
+                                  state.current_player_idx, [], match_id, names]
+
+    def record_action(self, state, street, seat, action, kind, pot):
+        """
+        Record an action as the engine applied it
+
+        Args:
+            state (TableState): Engine state right after the action
+            street (int): 0 preflop, 1 flop, 2 turn, 3 river
+            seat (int): Seat that acted
+            action (dict): Action returned by the bot
+            kind (str): What the engine made of it (see normalize_action)
+            pot (int): Pot after the action
+        """
+        hand = self._hands.get(id(state))
+        if hand is None:
+            return  # Not a hand this writer is recording (e.g. apply_action outside play_round)
+        if kind == 'raise':
+            # The bet or raise as capped by the engine, to the seat's total bet this round
+            action_code = ACTION_CODES['bet'] if action.get('action') == 'bet' else ACTION_CODES['raise']
+            amount = state.bets[seat]
+        else:
+            action_code = ACTION_CODES.get(kind, ACTION_CODES['unknown'])
+            amount = 0
+        hand[5].append((street, seat, action_code, amount, pot))
+
+    def end_hand(self, state, winner, showdown):
+        """
+        Finish the current hand and queue it for writing
+
+        Args:
+            state (TableState): Engine state after the pot was awarded
+            winner (int): Winning seat, or None for a split pot
+            showdown (bool): Whether the hand went to showdown
+        """
+        hand_num, ante, stack0, stack1, first, actions, match_id, players = self._hands.pop(id(state))
+        winner = -1 if winner is None else winner
+        hands = state.player_hands
+        board = state.community_cards
+
+        if self.format == 'jsonl':
+            record = {
+                'match': match_id, 'players': players,
+                'hand': hand_num, 'ante': ante, 'stacks': [stack0, stack1], 'first': first,
+                'cards': hands[0] + hands[1], 'board': board,
+                'actions': [[street, seat, ACTION_NAMES[code], amount, pot]
+                            for street, seat, code, amount, pot in actions],
+                'end_stacks': state.stacks[:], 'winner': winner, 'showdown': showdown
+            }
+            encoded = (json.dumps(record, separators=(',', ':')) + '\n').encode()
+        else:
+            cards = [CARD_INDEX[card] for card in hands[0] + hands[1] + board]
+            cards += [_NO_CARD] * (9 - len(cards))
+            names = [name.encode()[:255] for name in players]
+            parts = [_HAND.pack(hand_num, ante, stack0, stack1, state.stacks[0], state.stacks[1],
+                                first, winner, showdown, len(board), len(actions)), bytes(cards),
+                     _MATCH.pack(-1 if match_id is None else match_id, len(names[0]), len(names[1]))] + names
+            for street, seat, code, amount, pot in actions:
+                parts.append(_ACTION.pack(street << 4 | seat << 3 | code, amount, pot))
+            payload = b''.join(parts)
+            encoded = _LENGTH.pack(len(payload)) + payload
+
+        self._buffer.append(encoded)
+        self._buffered_bytes += len(encoded)
+        self.hands_written += 1
+        if self._buffered_bytes >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered hands so readers can see them"""
+        if not self._buffer:
+            return
+        data = b''.join(self._buffer)
+        self._buffer = []
+        self._buffered_bytes = 0
+        if self.format == 'jsonl':
+            # Each flush is a complete gzip member; concatenated members form a valid gzip file
+            compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+            data = compressor.compress(data) + compressor.flush()
+        self._file.write(data)
+        self._file.flush()
+        if self.max_bytes is not None and self._file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        """Close the current file and continue in the next segment"""
+        self.flush()
+        self._file.close()
+        self.segment += 1
+        self._open_segment()
+
+    def close(self):
+        """Write any buffered hands and close the file"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def history_files(path):
+    """
+    List the segments of a (possibly rotated) hand history in order
+
+    Args:
+        path (str): Path the writer was created with
+
+    Returns:
+        list: Existing segment files, oldest first
+    """
+    segments = [p for p in glob.glob(glob.escape(path) + '.*') if p[len(path) + 1:].isdigit()]
+    segments.sort(key=lambda p: int(p[len(path) + 1:]))
+    return ([path] if os.path.exists(path) else []) + segments
+
+
+def _read_jsonl(data):
+    """Decode complete gzip members, ignoring a partially written tail"""
+    while data:
+        decompressor = zlib.decompressobj(31)
+        text = decompressor.decompress(data)
+        if not decompressor.eof:
+            break  # Member still being written
+        # Hands never span members, since each flush writes whole lines
+        for line in text.splitlines():
+            yield json.loads(line)
+        data = decompressor.unused_data
+
+
+def _read_binary(data, with_match=True):
+    """Decode complete binary records, ignoring a partially written tail"""
+    offset = len(BINARY_MAGIC)
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        start = offset + _LENGTH.size
+        if start + length > len(data):
+            break  # Record still being written
+        (hand_num, ante, stack0, stack1, end0, end1,
+         first, winner, showdown, num_board, num_actions) = _HAND.unpack_from(data, start)
+        cards = [DECK[card] for card in data[start + _HAND.size:start + _HAND.size + 4 + num_board]]
+        position = start + _HAND.size + 9
+        match_id, players = None, None
+        if with_match:
+            match_id, length0, length1 = _MATCH.unpack_from(data, position)
+            position += _MATCH.size
+            players = [data[position:position + length0].decode(errors='replace'),
+                       data[position + length0:position + length0 + length1].decode(errors='replace')]
+            position += length0 + length1
+            match_id = None if match_id == -1 else match_id
+        actions = []
+        for _ in range(num_actions):
+            packed, amount, pot = _ACTION.unpack_from(data, position)
+            actions.append([packed >> 4, (packed >> 3) & 1, ACTION_NAMES[packed & 7], amount, pot])
+            position += _ACTION.size
+        yield {
+            'match': match_id, 'players': players,
+            'hand': hand_num, 'ante': ante, 'stacks': [stack0, stack1], 'first': first,
+            'cards': cards[:4], 'board': cards[4:], 'actions': actions,
+            'end_stacks': [end0, end1], 'winner': winner, 'showdown': showdown
+        }
+        offset = start + length
+
+
+def read_hand_history(path):
+    """
+    Iterate over the hands in a hand history, including rotated segments
+
+    Safe to call while the log is being written: hands that haven't been
+    completely written yet are skipped.
+
+    Args:
+        path (str): Path the writer was created with
+
+    Yields:
+        dict: One hand with keys match (None if unknown), players (names by seat, None in
+              older binary logs), hand, ante, stacks, first, cards (both players' hole
+              cards), board, actions ([street, seat, action, amount, pot after]),
+              end_stacks, winner (-1 for a split pot) and showdown
+    """
+    for segment in history_files(path):
+        with open(segment, 'rb') as f:
+            data = f.read()
+        if data.startswith(BINARY_MAGIC):
+            yield from _read_binary(data)
+        elif data.startswith(_BINARY_MAGIC_V1):
+            yield from _read_binary(data, with_match=False)
+        elif data.startswith(_GZIP_MAGIC):
+            yield from _read_jsonl(data)
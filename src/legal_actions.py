@@ -0,0 +1,86 @@
+"""
+Legal Actions
+Describes the actions open to the seat to act, and maps any action a bot returns onto them
+"""
+
+# Action type -> kind of action it is resolved as; bets and raises follow the same rules
+_ACTION_KINDS = {'fold': 'fold', 'check': 'check', 'call': 'call', 'bet': 'raise', 'raise': 'raise'}
+
+
+def legal_actions(state, seat):
+    """
+    Describe the legal actions of the player in the given seat
+
+    Args:
+        state (TableState): Engine state
+        seat (int): Seat to act
+
+    Returns:
+        dict: 'actions' (tuple of action types that are taken as returned), 'can_check',
+              'call_amount' (chips a call adds), and 'min_raise_to' / 'max_raise_to'
+              (total bet amounts accepted as a raise, None when raising isn't possible)
+    """
+    current_bet = state.current_bet
+    my_bet = state.bets[seat]
+    my_stack = state.stacks[seat]
+    can_check = current_bet <= my_bet
+
+    # A raise must reach the current bet plus min_raise, and is capped at what
+    # the opponent can call and at the remaining stack
+    min_raise_to = max(current_bet - my_bet + state.min_raise, current_bet + 1)
+    max_raise_to = min(my_bet + state.stacks[1 - seat], my_stack)
+    if max_raise_to < min_raise_to:
+        min_raise_to = max_raise_to = None
+
+    actions = ('fold', 'check') if can_check else ('fold', 'call')
+    if min_raise_to is not None:
+        actions += ('bet',) if current_bet == 0 else ('raise',)
+
+    return {
+        'actions': actions,
+        'can_check': can_check,
+        'call_amount': 0 if can_check else min(current_bet - my_bet, my_stack),
+        'min_raise_to': min_raise_to,
+        'max_raise_to': max_raise_to
+    }
+
+
+def normalize_action(state, seat, action):
+    """
+    Resolve an action into what the engine actually does with it
+
+    Bets below min_raise are checks, bets short of a full raise (or not above the
+    current bet) are calls (or checks when nothing has been bet), oversized bets are
+    capped, and checking into a bet is a fold. Unknown action types resolve to None
+    and change nothing.
+
+    Args:
+        state (TableState): Engine state
+        seat (int): Seat to act
+        action (dict): Action returned by the bot
+
+    Returns:
+        tuple: (kind, amount) where kind is 'fold', 'check', 'call', 'raise' or None,
+               and amount is the number of chips the action adds to the pot
+    """
+    kind = _ACTION_KINDS.get(action['action'])
+    current_bet = state.current_bet
+    my_bet = state.bets[seat]
+    stacks = state.stacks
+
+    if kind == 'raise':
+        bet_amount = int(action['amount'])
+        if bet_amount < state.min_raise:
+            kind = 'check'
+        else:
+            bet_amount = min(bet_amount, my_bet + stacks[1 - seat], stacks[seat])
+            # The same minimum legal_actions reports as min_raise_to
+            if bet_amount >= max(current_bet - my_bet + state.min_raise, current_bet + 1):
+                return 'raise', bet_amount - my_bet
+            kind = 'call' if current_bet > 0 else 'check'
+
+    if kind == 'check':
+        return ('fold', 0) if current_bet > my_bet else ('check', 0)
+    if kind == 'call':
+        return 'call', int(min(current_bet - my_bet, stacks[seat]))
+    return kind, 0
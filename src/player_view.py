@@ -0,0 +1,153 @@
+"""
+Player View
+Read-only game state handed to bots when they are asked for an action
+"""
+
+from collections.abc import Mapping
+from .legal_actions import legal_actions
+
+STREET_NAMES = {0: 'preflop', 3: 'flop', 4: 'turn', 5: 'river'}
+
+
+def _amount_to_call(view):
+    state = view._state
+    seat = view._seat
+    return max(0, min(state.current_bet - state.bets[seat], state.stacks[seat]))
+
+
+def _pot_odds(view):
+    amount_to_call = _amount_to_call(view)
+    return amount_to_call / (view._state.pot + amount_to_call) if amount_to_call > 0 else 0
+
+
+class TableSnapshot:
+    """
+    Read-only copy of the table as one seat sees it
+
+    Has the TableState fields a view and legal_actions read, with sequences stored as
+    tuples and the opponent's hole cards left out, so a bot can neither see hidden
+    cards nor change the game through its view.
+    """
+    __slots__ = ('player_hands', 'community_cards', 'pot', 'current_bet', 'bets', 'stacks',
+                 'min_raise', 'current_round')
+
+    def __init__(self, seat, hand, community_cards, pot, current_bet, bets, stacks, min_raise,
+                 current_round=None):
+        """
+        Args:
+            seat (int): Seat the snapshot is taken for
+            hand (list): That seat's hole cards
+            community_cards (list): Board cards
+            pot (int): Chips in the pot
+            current_bet (int): Bet to match in the current betting round
+            bets (list): Chips put in by each seat during the current betting round
+            stacks (list): Stacks by seat
+            min_raise (int): Minimum raise
+            current_round (int): Hand number, if known
+        """
+        player_hands = ((), tuple(hand)) if seat else (tuple(hand), ())
+        for name, value in (('player_hands', player_hands), ('community_cards', tuple(community_cards)),
+                            ('pot', pot), ('current_bet', current_bet), ('bets', tuple(bets)),
+                            ('stacks', tuple(stacks)), ('min_raise', min_raise),
+                            ('current_round', current_round)):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def of(cls, state, seat):
+        """Snapshot a TableState for the player in the given seat"""
+        return cls(seat, state.player_hands[seat], state.community_cards, state.pot, state.current_bet,
+                   state.bets, state.stacks, state.min_raise, state.current_round)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TableSnapshot is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("TableSnapshot is read-only")
+
+
+# Field name -> function computing it from the view; evaluated only when a bot reads the field
+_FIELDS = {
+    'player_idx': lambda view: view._seat,
+    'hand': lambda view: list(view._state.player_hands[view._seat]),
+    'community_cards': lambda view: list(view._state.community_cards),
+    'pot': lambda view: view._state.pot,
+    'current_bet': lambda view: view._state.current_bet,
+    'my_stack': lambda view: view._state.stacks[view._seat],
+    'opponent_stack': lambda view: view._state.stacks[1 - view._seat],
+    'my_bet': lambda view: view._state.bets[view._seat],
+    'opponent_bet': lambda view: view._state.bets[1 - view._seat],
+    'min_raise': lambda view: view._state.min_raise,
+    'ante': lambda view: view._ante,
+    # Derived fields
+    'amount_to_call': _amount_to_call,
+    'pot_odds': _pot_odds,
+    'street': lambda view: STREET_NAMES.get(len(view._state.community_cards), 'river'),
+    'legal_actions': lambda view: legal_actions(view._state, view._seat)
+}
+
+
+class PlayerView(Mapping):
+    """
+    Game state from one player's perspective
+
+    Works like the dictionary bots have always received (game_state['pot'],
+    game_state.get('hand'), dict(game_state)) and also supports attribute access
+    (game_state.pot). The view reads a TableSnapshot taken when it is created, so it
+    stays valid after the get_action call and gives no access to the engine's state.
+    Fields are computed when accessed, the view can't be modified, and card lists are
+    returned as copies.
+    """
+    __slots__ = ('_state', '_seat', '_ante')
+
+    def __init__(self, state, seat, ante):
+        """
+        Args:
+            state (TableState or TableSnapshot): Table to view; a TableState is snapshotted
+            seat (int): Seat of the player the view is for
+            ante (int): Ante of the match
+        """
+        if not isinstance(state, TableSnapshot):
+            state = TableSnapshot.of(state, seat)
+        object.__setattr__(self, '_state', state)
+        object.__setattr__(self, '_seat', seat)
+        object.__setattr__(self, '_ante', ante)
+
+    @property
+    def hand_number(self):
+        """Number of the hand the view was taken in (None if unknown); not one of the fields"""
+        return self._state.current_round
+
+    def __getitem__(self, key):
+        try:
+            field = _FIELDS[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return field(self)
+
+    def __getattr__(self, name):
+        field = _FIELDS.get(name)
+        if field is None:
+            raise AttributeError(f"'PlayerView' object has no attribute '{name}'")
+        return field(self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PlayerView is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError("PlayerView is read-only")
+
+    def __iter__(self):
+        return iter(_FIELDS)
+
+    def __len__(self):
+        return len(_FIELDS)
+
+    def __contains__(self, key):
+        return key in _FIELDS
+
+    def to_dict(self):
+        """Return a plain dictionary snapshot of every field"""
+        return {key: field(self) for key, field in _FIELDS.items()}
+
+    def __repr__(self):
+        return f"PlayerView({self.to_dict()})"
@@ -1,105 +1,272 @@
 import random
 import json
 import os
-from hand_evaluator import evaluate_hand, compare_hands
+from time import perf_counter_ns
+from .batch_evaluator import score_hand, runout_equity
+from .counter_rng import CounterRNG
+from .events import EventBus, HandStarted, ActionTaken, StreetDealt, Showdown, HandEnded
+from .legal_actions import normalize_action
+from .player_view import PlayerView
+from .timings import DEAL, BOARD, DECISION, ACTION, SHOWDOWN, HAND
+from .utils import DECK
+
+# Street index (as in hand histories) by number of community cards
+_BOARD_STREETS = {0: 0, 3: 1, 4: 2, 5: 3}
+
+
+class Deck:
+    """
+    Reusable deck that only shuffles the cards it deals
+    
+    Each deal swaps a uniformly chosen undealt card into place (one step of a
+    Fisher-Yates shuffle), so a hand that ends preflop costs four draws instead of
+    a full 52-card shuffle and every deal is still uniformly random. Every reset puts
+    the cards back in the same order, so a deal depends only on the random numbers.
+    """
+    __slots__ = ('cards', 'dealt', 'rng')
+    
+    def __init__(self, rng=None):
+        """
+        Args:
+            rng (random.Random): Optional random source (the random module is used by default),
+                                 or a DeckRandom from CounterRNG.deal
+        """
+        self.cards = DECK[:]
+        self.dealt = 0
+        self.rng = rng
+    
+    def reset(self, dead_cards=()):
+        """
+        Return every card to the deck
+        
+        Args:
+            dead_cards (list): Cards to take out straight away (e.g., predefined cards)
+        """
+        self.cards[:] = DECK
+        self.dealt = 0
+        for card in dead_cards:
+            self.remove(card)
+    
+    def deal(self):
+        """Deal one uniformly random card from the undealt cards"""
+        dealt = self.dealt
+        if dealt == 52:
+            raise Exception("Deck is empty")
+        cards = self.cards
+        pick = (self.rng or random).randrange(dealt, 52)
+        cards[dealt], cards[pick] = cards[pick], cards[dealt]
+        self.dealt = dealt + 1
+        return cards[dealt]
+    
+    def remove(self, card):
+        """Take a specific undealt card out of the deck"""
+        dealt = self.dealt
+        cards = self.cards
+        pick = cards.index(card, dealt)
+        cards[dealt], cards[pick] = cards[pick], cards[dealt]
+        self.dealt = dealt + 1
+    
+    def copy(self):
+        """Return a copy that shares the random source"""
+        deck = Deck.__new__(Deck)
+        deck.cards = self.cards[:]
+        deck.dealt = self.dealt
+        deck.rng = self.rng
+        return deck
+    
+    def __len__(self):
+        return 52 - self.dealt
+
+class TableState:
+    """
+    Compact seat-indexed state of a heads-up table
+    
+    Everything is indexed by seat (0 or 1); the engine keeps the player objects
+    separately and only uses them to ask for actions, so the same bot can sit in both seats.
+    """
+    __slots__ = ('stacks', 'player_hands', 'bets', 'community_cards', 'pot', 'current_bet',
+                 'min_raise', 'current_player_idx', 'current_round', 'acted', 'deck',
+                 'predefined_community', 'allin_equity')
+    
+    def __init__(self, starting_stack=1000, rng=None):
+        self.stacks = [starting_stack, starting_stack]
+        self.player_hands = [[], []]
+        self.bets = [0, 0]  # Chips put in by each seat during the current betting round
+        self.community_cards = []
+        self.pot = 0
+        self.current_bet = 0
+        self.min_raise = 0
+        self.current_player_idx = 0
+        self.current_round = 0
+        self.acted = 0  # Bitmask of seats that have acted in the current betting round
+        self.deck = Deck(rng)
+        self.predefined_community = None
+        self.allin_equity = None  # Seat 0's pot equity when the hand was run out all-in
+    
+    def copy(self):
+        """Return an independent copy of the state"""
+        state = TableState.__new__(TableState)
+        state.stacks = self.stacks[:]
+        state.player_hands = [self.player_hands[0][:], self.player_hands[1][:]]
+        state.bets = self.bets[:]
+        state.community_cards = self.community_cards[:]
+        state.pot = self.pot
+        state.current_bet = self.current_bet
+        state.min_raise = self.min_raise
+        state.current_player_idx = self.current_player_idx
+        state.current_round = self.current_round
+        state.acted = self.acted
+        state.deck = self.deck.copy()
+        state.predefined_community = self.predefined_community  # Only ever sliced, never modified
+        state.allin_equity = self.allin_equity
+        return state
+
+
+def _state_property(name):
+    """Expose a TableState field as an engine attribute"""
+    return property(lambda self: getattr(self.state, name),
+                    lambda self, value: setattr(self.state, name, value))
+
 
 class PokerEngine:
     """
     Texas Hold'em Poker Game Engine for heads-up matches
     """
-    def __init__(self, player1, player2, starting_stack=1000, ante=10):
+    # Table state fields, indexed by seat where applicable
+    stacks = _state_property('stacks')
+    player_hands = _state_property('player_hands')
+    bets = _state_property('bets')
+    community_cards = _state_property('community_cards')
+    pot = _state_property('pot')
+    current_bet = _state_property('current_bet')
+    min_raise = _state_property('min_raise')
+    current_player_idx = _state_property('current_player_idx')
+    current_round = _state_property('current_round')
+    acted = _state_property('acted')
+    deck = _state_property('deck')
+    predefined_community = _state_property('predefined_community')
+    allin_equity = _state_property('allin_equity')
+    
+    def __init__(self, player1, player2, starting_stack=1000, ante=10, headless=False, rng=None,
+                 history=None, timings=None, events=None, match_id=None):
+        """
+        Args:
+            player1: First player bot
+            player2: Second player bot
+            starting_stack (int): Chips each player starts with
+            ante (int): Ante collected from each player every round
+            headless (bool): Run without console output, burn cards or game_state
+                             snapshots, for high-throughput matches
+            rng (random.Random or CounterRNG): Optional random source for dealing (the random
+                                               module by default). With a CounterRNG every hand's
+                                               deal depends only on its seed, match and hand number,
+                                               and no burn cards are dealt even when not headless.
+            history (HandHistoryWriter): Optional log that every hand played by play_round is written to
+            timings (PhaseTimings): Optional counters that play_round records phase timings into
+            events (EventBus): Optional bus that hand events are published to. Players with a
+                               subscribe_events(events, seat) method are subscribed to a bus of
+                               this engine's own, which forwards to the given one.
+            match_id (int): Optional id of the match, written to the hand history with every hand
+        """
         self.players = [player1, player2]
         self.starting_stack = starting_stack
         self.ante = ante
-        self.stacks = {player1: starting_stack, player2: starting_stack}
-        self.deck = []
-        self.community_cards = []
-        self.player_hands = {player1: [], player2: []}
-        self.current_player_idx = 0
-        self.pot = 0
-        self.round_state = {}
-        self.current_bet = 0
+        self.headless = headless
+        self.rng = rng
+        self.history = history
+        self.timings = timings
+        self.events = events
+        self.match_id = match_id
+        for seat, player in enumerate(self.players):
+            subscribe_events = getattr(player, 'subscribe_events', None)
+            if subscribe_events is not None:
+                if self.events is events:
+                    self.events = EventBus()
+                    if events is not None:
+                        self.events.forward(events)
+                subscribe_events(self.events, seat)
+        self.state = TableState(starting_stack, None if isinstance(rng, CounterRNG) else rng)
         self.game_state = {}
-        self.current_round = 0
-        self.predefined_community = None
+        # Chips each seat would have won had every all-in hand paid out its equity,
+        # minus what it actually won, summed over the hands played
+        self.allin_adjustment = [0.0, 0.0]
+        self._clones = 0  # Numbers the clones' random sources
         
     def initialize_round(self, predefined_cards=None):
         """Initialize a new round of poker
         
         Args:
-            predefined_cards (dict): Optional dict with predefined cards to use instead of random ones
+            predefined_cards (dict or DealPack): Optional dict with predefined cards to use instead of random ones
                                      Format: {'player1': [card1, card2], 'player2': [card1, card2], 
                                              'community': [card1, card2, card3, card4, card5]}
+                                     A DealPack (or any object with a next_deal method)
+                                     supplies its next deal
+                                             
+        Returns:
+            The winning player if a player couldn't pay the ante, None otherwise
         """
-        self.current_round += 1
-        self.community_cards = []
-        self.player_hands = {player: [] for player in self.players}
-        self.pot = 0
-        self.current_bet = 0
+        if hasattr(predefined_cards, 'next_deal'):
+            predefined_cards = predefined_cards.next_deal()
+        
+        state = self.state
+        state.current_round += 1
+        state.community_cards = []
+        state.player_hands = [[], []]
+        state.bets = [0, 0]
+        state.pot = 0
+        state.current_bet = 0
+        state.acted = 0
+        state.allin_equity = None
         
         # Check if players can pay the ante
-        for player in self.players:
-            if self.stacks[player] < self.ante:
+        for seat in range(2):
+            if state.stacks[seat] < self.ante:
                 # Player can't pay ante, they lose
-                print(f"{player} can't pay the ante and automatically loses")
+                if not self.headless:
+                    print(f"{self.players[seat]} can't pay the ante and automatically loses")
                 # Award all remaining chips to the opponent
-                winner = self.players[1 - self.players.index(player)]
-                self.stacks[winner] += self.stacks[player]
-                self.stacks[player] = 0
-                return winner
+                winner = 1 - seat
+                state.stacks[winner] += state.stacks[seat]
+                state.stacks[seat] = 0
+                return self.players[winner]
         
         # Collect antes
-        for player in self.players:
-            self.stacks[player] -= self.ante
-            self.pot += self.ante
+        for seat in range(2):
+            state.stacks[seat] -= self.ante
+            state.pot += self.ante
         
         if predefined_cards:
             # Use predefined cards
-            self.player_hands[self.players[0]] = predefined_cards['player1']
-            self.player_hands[self.players[1]] = predefined_cards['player2']
+            state.player_hands[0] = predefined_cards['player1']
+            state.player_hands[1] = predefined_cards['player2']
             
             # Store the predefined community cards for later use
-            self.predefined_community = predefined_cards['community']
+            state.predefined_community = predefined_cards['community']
             
-            # Set up a deck that will produce the predefined community cards
-            # Note: We won't actually use this deck for dealing community cards,
-            # but we'll keep it for backward compatibility and in case we need
-            # to deal additional cards
-            used_cards = predefined_cards['player1'] + predefined_cards['player2']
-            remaining_community = predefined_cards['community']
-            
-            # Create a deck with the predefined cards first, followed by random ones
-            self.deck = []
-            for card in remaining_community:
-                self.deck.append(card)
-                
-            # Add random cards for any burn cards and potential future draws
-            full_deck = self._create_deck()
-            for card in full_deck:
-                if card not in used_cards and card not in remaining_community:
-                    self.deck.append(card)
+            # Community cards come from predefined_community; the deck keeps the
+            # remaining cards in case any additional cards are needed
+            state.deck.reset(predefined_cards['player1'] + predefined_cards['player2'] +
+                             predefined_cards['community'])
         else:
             # Deal normally with random cards
-            self.deck = self._create_deck()
-            self.predefined_community = None  # No predefined community cards
+            if isinstance(self.rng, CounterRNG):
+                state.deck.rng = self.rng.deal(state.current_round)
+            state.deck.reset()
+            state.predefined_community = None  # No predefined community cards
             
             # Deal hole cards (2 cards per player)
-            for player in self.players:
-                self.player_hands[player] = [self._deal_card(), self._deal_card()]
+            for seat in range(2):
+                state.player_hands[seat] = [self._deal_card(), self._deal_card()]
             
-        # Set up round state information
-        self.round_state = {
-            'pot': self.pot,
-            'community_cards': [],
-            'current_bet': 0,
-            'min_raise': self.ante * 2
-        }
+        # Minimum raise for this hand
+        state.min_raise = self.ante * 2
         
         # Initialize game state for first betting round (pre-flop)
-        self._update_game_state()
+        if not self.headless:
+            self._update_game_state()
         
         # Determine who starts pre-flop - alternate with each round
-        self.current_player_idx = self.current_round % 2
+        state.current_player_idx = state.current_round % 2
         
         return None  # No winner yet from ante check
         
@@ -113,24 +280,11 @@ class PokerEngine:
         Returns:
             dict: The generated card data
         """
-        # Create a fresh deck
-        temp_deck = self._create_deck()
-        
-        # Deal cards for both players and community
-        player1_cards = [temp_deck.pop(), temp_deck.pop()]
-        player2_cards = [temp_deck.pop(), temp_deck.pop()]
-        
-        # Burn one card before flop
-        temp_deck.pop()
-        community_cards = [temp_deck.pop(), temp_deck.pop(), temp_deck.pop()]
-        
-        # Burn one card before turn
-        temp_deck.pop()
-        community_cards.append(temp_deck.pop())
-        
-        # Burn one card before river
-        temp_deck.pop()
-        community_cards.append(temp_deck.pop())
+        # Deal cards for both players and community (burn cards don't change the odds)
+        temp_deck = Deck(self.rng.deal(round_num) if isinstance(self.rng, CounterRNG) else self.rng)
+        player1_cards = [temp_deck.deal(), temp_deck.deal()]
+        player2_cards = [temp_deck.deal(), temp_deck.deal()]
+        community_cards = [temp_deck.deal() for _ in range(5)]
         
         # Create and save predefined cards
         card_data = {
@@ -176,267 +330,509 @@ class PokerEngine:
                 return None
         return None
     
-    def play_round(self):
-        """Play a full round of poker"""
+    def play_round(self, predefined_cards=None):
+        """Play a full round of poker
+        
+        Args:
+            predefined_cards (dict or DealPack): Optional cards to deal, as for initialize_round
+        
+        Returns:
+            The winning player, or None for a split pot
+        """
+        timings = self.timings
+        if timings is not None:
+            hand_start = perf_counter_ns()
+        
         # Initialize round
-        ante_winner = self.initialize_round()
+        ante_winner = self.initialize_round(predefined_cards)
+        if timings is not None:
+            timings.add(DEAL, perf_counter_ns() - hand_start)
         if ante_winner:
             return ante_winner  # Player couldn't pay ante
         
-        # Pre-flop betting round
-        winner = self._betting_round('preflop')
-        if winner:
-            return self._end_round(winner)
-            
-        # Deal flop (3 community cards)
-        self._deal_flop()
+        history = self.history
+        if history is not None:
+            history.begin_hand(self.state, self.ante, self.players, self.match_id)
+        events = self.events
+        if events is not None and HandStarted in events.handlers:
+            self._publish_hand_start()
+        
+        winner, showdown = self._play_streets()
+        
+        if history is not None:
+            history.end_hand(self.state, winner, showdown)
+        if events is not None and HandEnded in events.handlers:
+            self._publish_hand_end(winner, showdown)
+        if timings is not None:
+            timings.add(HAND, perf_counter_ns() - hand_start)
+        return self.players[winner] if winner is not None else None
+    
+    def play_round_steps(self, predefined_cards=None):
+        """
+        Generator form of play_round for drivers that answer decisions themselves
         
-        # Flop betting round
-        winner = self._betting_round('flop')
-        if winner:
-            return self._end_round(winner)
-            
-        # Deal turn (1 community card)
-        self._deal_turn()
+        Yields a (seat, game_state) decision request whenever a player is to act and
+        must be resumed with send(action); the bots are never called. The hand is
+        played by the same rules as play_round, so an outside scheduler can suspend
+        many hands at their decision points and answer them in any order or batch.
         
-        # Turn betting round
-        winner = self._betting_round('turn')
-        if winner:
-            return self._end_round(winner)
+        Args:
+            predefined_cards (dict or DealPack): Optional cards to deal, as for initialize_round
             
-        # Deal river (1 community card)
-        self._deal_river()
-        
-        # River betting round
-        winner = self._betting_round('river')
-        if winner:
-            return self._end_round(winner)
+        Returns:
+            The winning seat (the generator's return value), or None for a split pot
+        """
+        state = self.state
+        if self.initialize_round(predefined_cards):
+            return 1 if state.stacks[0] == 0 else 0  # A player couldn't pay the ante
+        
+        history = self.history
+        if history is not None:
+            history.begin_hand(state, self.ante, self.players, self.match_id)
+        events = self.events
+        if events is not None and HandStarted in events.handlers:
+            self._publish_hand_start()
+        
+        if self._all_in():
+            # A player is all-in from the ante alone
+            winner = self._run_out()
+            if history is not None:
+                history.end_hand(state, winner, True)
+            if events is not None and HandEnded in events.handlers:
+                self._publish_hand_end(winner, True)
+            return winner
+        
+        self._start_street()
+        while True:
+            seat = state.current_player_idx
+            action = yield seat, self._get_player_view(seat)
+            street = _BOARD_STREETS[len(state.community_cards)]
+            if self._act(seat, action):
+                winner, showdown = self._end_round(1 - seat), False
+                break
+            if not self.headless:
+                self._update_game_state()
+            if not self._street_closed():
+                continue
+            
+            # Betting round is over: deal the next street or go to showdown
+            if street == 3:
+                winner, showdown = self._showdown(), True
+                break
+            if self._all_in():
+                winner, showdown = self._run_out(), True
+                break
+            (self._deal_flop, self._deal_turn, self._deal_river)[street]()
+            self._start_street()
+            
+        if history is not None:
+            history.end_hand(state, winner, showdown)
+        if events is not None and HandEnded in events.handlers:
+            self._publish_hand_end(winner, showdown)
+        return winner
+    
+    def _play_streets(self):
+        """Play the betting rounds and showdown of a dealt hand, return (winning seat or None, showdown)"""
+        timings = self.timings
+        streets = (('preflop', None), ('flop', self._deal_flop), ('turn', self._deal_turn),
+                   ('river', self._deal_river))
+        
+        for round_name, deal_street in streets:
+            if self._all_in():
+                # No more decisions once a player is all-in: deal the rest and show down
+                if timings is None:
+                    return self._run_out(), True
+                start = perf_counter_ns()
+                winner = self._run_out()
+                timings.add(SHOWDOWN, perf_counter_ns() - start)
+                return winner, True
+            
+            # Deal the community cards of this street
+            if deal_street is not None:
+                if timings is None:
+                    deal_street()
+                else:
+                    start = perf_counter_ns()
+                    deal_street()
+                    timings.add(BOARD, perf_counter_ns() - start)
+            
+            winner = self._betting_round(round_name)
+            if winner is not None:
+                return self._end_round(winner), False
             
         # Showdown
-        return self._showdown()
+        if timings is None:
+            return self._showdown(), True
+        start = perf_counter_ns()
+        winner = self._showdown()
+        timings.add(SHOWDOWN, perf_counter_ns() - start)
+        return winner, True
     
     def _betting_round(self, round_name):
-        """Execute a betting round, return winner if someone folds"""
+        """Execute a betting round, return the winning seat if someone folds"""
+        state = self.state
+        players = self.players
+        headless = self.headless
+        timings = self.timings
+        
         # Reset betting state for this round
-        self.current_bet = 0
-        acted_players = set()
-        all_players_acted = False
+        self._start_street()
         
         # Pre-flop betting order is already determined during initialize_round
         # For post-flop rounds, we preserve the same starting player as pre-flop
         # (We no longer reset to position 0 for post-flop rounds)
         
         # Continue until all players have acted and bets are equal
-        while not all_players_acted or any(self.round_state.get(f"player{i}_bet", 0) != self.current_bet for i in range(2) if self.stacks[self.players[i]] > 0):
-            current_player = self.players[self.current_player_idx]
+        while not self._street_closed():
+            seat = state.current_player_idx
             
-            # Get player action based on game state
-            action = current_player.get_action(self._get_player_view(current_player))
-            
-            # Process the action
-            folded = self._process_action(current_player, action)
+            if timings is None:
+                # Get player action based on game state
+                action = players[seat].get_action(self._get_player_view(seat))
+                
+                # Process the action
+                folded = self._act(seat, action)
+            else:
+                start = perf_counter_ns()
+                action = players[seat].get_action(self._get_player_view(seat))
+                decided = perf_counter_ns()
+                folded = self._act(seat, action)
+                timings.add(DECISION, decided - start, seat)
+                timings.add(ACTION, perf_counter_ns() - decided, seat)
             if folded:
                 # If player folded, other player wins
-                return self.players[1 - self.current_player_idx]
-                
-            # Mark this player as having acted
-            acted_players.add(current_player)
-            
-            # Check if all players have acted
-            all_players_acted = len(acted_players) == len(self.players)
-            
-            # Move to next player
-            self.current_player_idx = (self.current_player_idx + 1) % 2
+                return 1 - seat
             
             # Update game state after action
-            self._update_game_state()
+            if not headless:
+                self._update_game_state()
             
         return None  # No winner yet
+    
+    def _start_street(self):
+        """Reset the betting state at the start of a betting round"""
+        state = self.state
+        state.current_bet = 0
+        state.bets[0] = state.bets[1] = 0
+        state.acted = 0
+    
+    def _all_in(self):
+        """Return True if a seat has no chips left, so the hand can only go to showdown"""
+        stacks = self.state.stacks
+        return stacks[0] == 0 or stacks[1] == 0
+    
+    def _run_out(self):
+        """
+        Deal the rest of the board without asking the bots and go to showdown
         
-    def _process_action(self, player, action):
-        """Process a player's action"""
-        action_type = action['action']
-        player_idx = self.players.index(player)
-        opponent_idx = 1 - player_idx
-        opponent = self.players[opponent_idx]
+        Used once a player is all-in between betting rounds. Seat 0's equity at this
+        point is kept in state.allin_equity, and the difference between what each seat
+        would win on average and what it actually wins is added to allin_adjustment.
         
-        if action_type == 'fold':
-            return True  # Player folded
-            
-        elif action_type == 'check':
-            # Can only check if there's no bet to call
-            if self.current_bet > self.round_state.get(f'player{player_idx}_bet', 0):
-                # Invalid check, treat as fold
-                return True
-                
-        elif action_type == 'call':
-            amount_to_call = self.current_bet - self.round_state.get(f'player{player_idx}_bet', 0)
-            # All-in if not enough chips
-            amount_to_call = min(amount_to_call, self.stacks[player])
-            # Ensure amount is an integer
-            amount_to_call = int(amount_to_call)
-            self.stacks[player] -= amount_to_call
-            self.pot += amount_to_call
-            self.round_state[f'player{player_idx}_bet'] = self.round_state.get(f'player{player_idx}_bet', 0) + amount_to_call
-            
-        elif action_type == 'bet' or action_type == 'raise':
-            bet_amount = action['amount']
-            # Ensure bet amount is an integer
-            bet_amount = int(bet_amount)
-            
-            # If bet amount is below min_raise, treat as a check
-            current_player_bet = self.round_state.get(f'player{player_idx}_bet', 0)
-            if bet_amount < self.round_state['min_raise']:
-                return self._process_action(player, {'action': 'check'})
-            
-            # Validate bet amount
-            opponent_stack = self.stacks[opponent]
-            min_amount = self.current_bet - current_player_bet + self.round_state['min_raise']
+        Returns:
+            The winning seat, or None for a split pot
+        """
+        state = self.state
+        pot = state.pot
+        equity = runout_equity(state.player_hands[0], state.player_hands[1], state.community_cards)
+        state.allin_equity = equity
+        stacks = state.stacks[:]
+        
+        num_community = len(state.community_cards)
+        if num_community == 0:
+            self._deal_flop()
+        if num_community <= 3:
+            self._deal_turn()
+        self._deal_river()
+        winner = self._showdown()
+        
+        adjustment = self.allin_adjustment
+        adjustment[0] += equity * pot - (state.stacks[0] - stacks[0])
+        adjustment[1] += (1.0 - equity) * pot - (state.stacks[1] - stacks[1])
+        return winner
+    
+    def _street_closed(self):
+        """Return True once both seats have acted and every seat with chips has matched the bet"""
+        state = self.state
+        stacks = state.stacks
+        bets = state.bets
+        return not (state.acted != 3 or
+                    (stacks[0] > 0 and bets[0] != state.current_bet) or
+                    (stacks[1] > 0 and bets[1] != state.current_bet))
+    
+    def _act(self, seat, action):
+        """Process an action and pass the turn to the other seat, return True if the player folded"""
+        if self._process_action(seat, action):
+            return True
+        state = self.state
+        state.acted |= 1 << seat
+        state.current_player_idx = 1 - seat
+        return False
+    
+    def apply_action(self, action):
+        """
+        Apply an action for the seat to act without asking its bot
+        
+        Advances the hand exactly as play_round would: a closed betting round deals
+        the next street (or the whole board once a player is all-in) and the river
+        ends in a showdown. Together with clone() this
+        lets search-based bots play out hypothetical lines.
+        
+        Args:
+            action (dict): Action in the same format bots return (e.g., {'action': 'call'})
             
-            # Cap the bet amount at what the opponent can call (current_player_bet + opponent_stack)
-            max_bet = current_player_bet + opponent_stack
-            bet_amount = min(bet_amount, max_bet)
+        Returns:
+            tuple: (hand_over, winner) where winner is the seat that won the pot,
+                   or None while the hand continues or for a split pot
+        """
+        state = self.state
+        seat = state.current_player_idx
+        if self._act(seat, action):
+            return True, self._end_round(1 - seat)
+        if not self._street_closed():
+            return False, None
+        
+        # Betting round is over: deal the next street or go to showdown
+        num_community = len(state.community_cards)
+        if num_community == 5:
+            return True, self._showdown()
+        if self._all_in():
+            return True, self._run_out()
+        if num_community == 0:
+            self._deal_flop()
+        elif num_community == 3:
+            self._deal_turn()
+        else:
+            self._deal_river()
+        self._start_street()
+        return False, None
+    
+    def snapshot(self):
+        """
+        Capture the table state
+        
+        Returns:
+            TableState: Independent copy of the current state, for restore()
+        """
+        return self.state.copy()
+    
+    def restore(self, snapshot):
+        """
+        Return the table to a state captured by snapshot()
+        
+        The snapshot is copied, so it can be restored any number of times.
+        
+        Args:
+            snapshot (TableState): State returned by snapshot()
+        """
+        state = self.state
+        saved = snapshot.copy()
+        for name in TableState.__slots__:
+            setattr(state, name, getattr(saved, name))
+    
+    def clone(self):
+        """
+        Create an engine that shares the players and settings but has its own copy of the table state
+        
+        Unlike copy.deepcopy, the bots are not copied. Cards are drawn when they are
+        dealt, and the clone draws them from its own random source, so it doesn't know
+        the original's upcoming cards and playing it doesn't change them. Clones of the
+        same engine are seeded in order, so simulations are reproducible.
+        
+        Returns:
+            PokerEngine: Independent engine for simulation
+        """
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        clone.state = self.state.copy()
+        self._clones += 1
+        deck_rng = clone.state.deck.rng
+        if deck_rng is not None and hasattr(deck_rng, 'fork'):
+            clone.state.deck.rng = deck_rng.fork()  # Keep the real upcoming cards out of simulations
+        elif not isinstance(self.rng, CounterRNG):
+            # Seed from the real source's state without drawing from it
+            source = deck_rng or random
+            clone.rng = clone.state.deck.rng = random.Random(hash((source.getstate(), self._clones)))
+        clone.history = None  # Simulated hands are not part of the match
+        clone.events = None
+        clone.timings = None
+        clone.allin_adjustment = self.allin_adjustment[:]
+        clone.game_state = dict(self.game_state)
+        return clone
+    
+    def subscribe(self, event_type, handler, batch_size=None):
+        """
+        Subscribe to this engine's events (see EventBus.subscribe), creating its bus if it has none
+        
+        Args:
+            event_type (type): Event class from src.events, or Event for all of them
+            handler (callable): Called with each event, or with a list of events if batched
+            batch_size (int): Optional number of events to collect per call
             
-            # If player doesn't have enough for minimum raise, they can go all-in
-            if bet_amount > self.stacks[player]:
-                bet_amount = int(self.stacks[player])  # All-in
-                
-            # If bet doesn't meet minimum, treat as call or all-in
-            if bet_amount < min_amount:
-                if self.current_bet > 0:
-                    return self._process_action(player, {'action': 'call'})
-                else:
-                    # If there's no current bet and amount is less than min_raise, treat as check
-                    return self._process_action(player, {'action': 'check'})
-            else:
-                # Valid raise/bet
-                amount_to_add = bet_amount - current_player_bet
-                self.stacks[player] -= amount_to_add
-                self.pot += amount_to_add
-                self.round_state[f'player{player_idx}_bet'] = bet_amount
-                self.current_bet = bet_amount
-                self.round_state['min_raise'] = bet_amount - self.current_bet
-                
-        return False  # Player didn't fold
+        Returns:
+            Subscription to pass to events.unsubscribe
+        """
+        if self.events is None:
+            self.events = EventBus()
+        return self.events.subscribe(event_type, handler, batch_size)
+    
+    def _publish_hand_start(self):
+        """Publish HandStarted for a hand that initialize_round has dealt"""
+        state = self.state
+        self.events.publish(HandStarted(self, state.current_round, tuple(state.stacks), self.ante,
+                                        (tuple(state.player_hands[0]), tuple(state.player_hands[1])),
+                                        state.current_player_idx))
+    
+    def _publish_hand_end(self, winner, showdown):
+        """Publish HandEnded once the pot has been awarded"""
+        state = self.state
+        self.events.publish(HandEnded(self, state.current_round, winner, showdown, state.pot, tuple(state.stacks)))
+        
+    def _process_action(self, seat, action):
+        """Process the action of the player in the given seat, return True if they folded"""
+        state = self.state
+        kind, amount = normalize_action(state, seat, action)
+        if kind != 'fold':  # Folding (or checking into a bet) changes no chips
+            state.stacks[seat] -= amount
+            state.pot += amount
+            state.bets[seat] += amount
+            if kind == 'raise':
+                bet_amount = state.bets[seat]
+                state.current_bet = bet_amount
+                state.min_raise = bet_amount - state.current_bet
+        
+        history = self.history
+        if history is not None:
+            history.record_action(state, _BOARD_STREETS[len(state.community_cards)], seat, action, kind, state.pot)
+        events = self.events
+        if events is not None and ActionTaken in events.handlers:
+            events.publish(ActionTaken(self, state.current_round, _BOARD_STREETS[len(state.community_cards)],
+                                       seat, action, kind, amount, state.pot))
+        return kind == 'fold'
     
     def _deal_flop(self):
         """Deal the flop (3 community cards)"""
-        if self.predefined_community:
+        state = self.state
+        if state.predefined_community:
             # Use predefined community cards for the flop
             # No need to burn a card
-            self.community_cards = self.predefined_community[:3]
+            state.community_cards = state.predefined_community[:3]
         else:
-            # Deal normally
-            self._deal_card()  # Burn card
-            self.community_cards.append(self._deal_card())
-            self.community_cards.append(self._deal_card())
-            self.community_cards.append(self._deal_card())
+            # Deal normally (burn cards don't change the odds, so headless and seeded runs skip them)
+            if self._burns_cards():
+                self._deal_card()  # Burn card
+            state.community_cards.append(self._deal_card())
+            state.community_cards.append(self._deal_card())
+            state.community_cards.append(self._deal_card())
             
-        self.round_state['community_cards'] = self.community_cards.copy()
-        self._update_game_state()
+        if not self.headless:
+            self._update_game_state()
+        events = self.events
+        if events is not None and StreetDealt in events.handlers:
+            events.publish(StreetDealt(self, state.current_round, 1, tuple(state.community_cards)))
         
     def _deal_turn(self):
         """Deal the turn (1 community card)"""
-        if self.predefined_community:
+        state = self.state
+        if state.predefined_community:
             # Use predefined community cards for the turn
             # No need to burn a card
-            self.community_cards = self.predefined_community[:4]
+            state.community_cards = state.predefined_community[:4]
         else:
             # Deal normally
-            self._deal_card()  # Burn card
-            self.community_cards.append(self._deal_card())
+            if self._burns_cards():
+                self._deal_card()  # Burn card
+            state.community_cards.append(self._deal_card())
             
-        self.round_state['community_cards'] = self.community_cards.copy()
-        self._update_game_state()
+        if not self.headless:
+            self._update_game_state()
+        events = self.events
+        if events is not None and StreetDealt in events.handlers:
+            events.publish(StreetDealt(self, state.current_round, 2, tuple(state.community_cards)))
         
     def _deal_river(self):
         """Deal the river (1 community card)"""
-        if self.predefined_community:
+        state = self.state
+        if state.predefined_community:
             # Use predefined community cards for the river
             # No need to burn a card
-            self.community_cards = self.predefined_community[:5]
+            state.community_cards = state.predefined_community[:5]
         else:
             # Deal normally
-            self._deal_card()  # Burn card
-            self.community_cards.append(self._deal_card())
+            if self._burns_cards():
+                self._deal_card()  # Burn card
+            state.community_cards.append(self._deal_card())
             
-        self.round_state['community_cards'] = self.community_cards.copy()
-        self._update_game_state()
+        if not self.headless:
+            self._update_game_state()
+        events = self.events
+        if events is not None and StreetDealt in events.handlers:
+            events.publish(StreetDealt(self, state.current_round, 3, tuple(state.community_cards)))
     
     def _showdown(self):
-        """Determine winner at showdown"""
-        player1 = self.players[0]
-        player2 = self.players[1]
-        
-        hand1 = self.player_hands[player1] + self.community_cards
-        hand2 = self.player_hands[player2] + self.community_cards
-        
-        best_hand1 = evaluate_hand(hand1)
-        best_hand2 = evaluate_hand(hand2)
-        
-        result = compare_hands(best_hand1, best_hand2)
-        
-        if result > 0:
-            winner = player1
-        elif result < 0:
-            winner = player2
+        """Determine winner at showdown, return the winning seat or None for a split pot"""
+        state = self.state
+        hand1 = state.player_hands[0] + state.community_cards
+        hand2 = state.player_hands[1] + state.community_cards
+        
+        # score_hand orders hands exactly like compare_hands(evaluate_hand(...)), but much faster
+        score1 = score_hand(hand1)
+        score2 = score_hand(hand2)
+        
+        if score1 > score2:
+            winner = 0
+        elif score1 < score2:
+            winner = 1
         else:
+            winner = None
+        
+        events = self.events
+        if events is not None and Showdown in events.handlers:
+            hands = state.player_hands
+            events.publish(Showdown(self, state.current_round, (tuple(hands[0]), tuple(hands[1])),
+                                    tuple(state.community_cards), (score1, score2), winner))
+        if winner is None:
             # Split pot
-            self.stacks[player1] += self.pot // 2
-            self.stacks[player2] += self.pot // 2
+            state.stacks[0] += state.pot // 2
+            state.stacks[1] += state.pot // 2
             return None
             
         return self._end_round(winner)
     
     def _end_round(self, winner):
-        """End the round and award pot to winner"""
-        self.stacks[winner] += self.pot
+        """End the round and award pot to the winning seat"""
+        self.state.stacks[winner] += self.state.pot
         return winner
     
-    def _create_deck(self):
-        """Create a shuffled deck of cards"""
-        suits = ['h', 'd', 'c', 's']  # hearts, diamonds, clubs, spades
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', 'T', 'J', 'Q', 'K', 'A']
-        deck = [rank + suit for suit in suits for rank in ranks]
-        random.shuffle(deck)
-        return deck
+    def _burns_cards(self):
+        """
+        Whether a card is burned before each street
+        
+        Headless runs skip burns, and so do CounterRNG deals, so a seeded hand gets the
+        same board whether or not the engine is headless (and the same as deal_cards).
+        """
+        return not self.headless and not isinstance(self.rng, CounterRNG)
     
     def _deal_card(self):
         """Deal a single card from the deck"""
-        if not self.deck:
-            raise Exception("Deck is empty")
-        return self.deck.pop()
-    
-    def _get_player_view(self, player):
-        """Return the game state from a specific player's perspective"""
-        player_idx = self.players.index(player)
-        opponent_idx = 1 - player_idx
-        
-        return {
-            'player_idx': player_idx,
-            'hand': self.player_hands[player],
-            'community_cards': self.community_cards,
-            'pot': self.pot,
-            'current_bet': self.current_bet,
-            'my_stack': self.stacks[player],
-            'opponent_stack': self.stacks[self.players[opponent_idx]],
-            'my_bet': self.round_state.get(f'player{player_idx}_bet', 0),
-            'opponent_bet': self.round_state.get(f'player{opponent_idx}_bet', 0),
-            'min_raise': self.round_state['min_raise'],
-            'ante': self.ante
-        }
+        return self.state.deck.deal()
+    
+    def _get_player_view(self, seat):
+        """Return a read-only view of the game state from the perspective of the player in the given seat"""
+        return PlayerView(self.state, seat, self.ante)
     
     def _update_game_state(self):
         """Update the current game state"""
+        state = self.state
         self.game_state = {
-            'round': self.current_round,
-            'pot': self.pot,
-            'community_cards': self.community_cards.copy(),
-            'current_bet': self.current_bet,
-            'player1_stack': self.stacks[self.players[0]],
-            'player2_stack': self.stacks[self.players[1]],
-            'player1_bet': self.round_state.get('player0_bet', 0),
-            'player2_bet': self.round_state.get('player1_bet', 0)
+            'round': state.current_round,
+            'pot': state.pot,
+            'community_cards': state.community_cards.copy(),
+            'current_bet': state.current_bet,
+            'player1_stack': state.stacks[0],
+            'player2_stack': state.stacks[1],
+            'player1_bet': state.bets[0],
+            'player2_bet': state.bets[1]
         } 
 
 if __name__ == "__main__":
@@ -484,8 +880,8 @@ if __name__ == "__main__":
     engine.initialize_round(predefined)
     
     # Verify player hands
-    print(f"Player 1 hand: {engine.player_hands[player1]}")
-    print(f"Player 2 hand: {engine.player_hands[player2]}")
+    print(f"Player 1 hand: {engine.player_hands[0]}")
+    print(f"Player 2 hand: {engine.player_hands[1]}")
     
     # Deal flop and check community cards
     engine._deal_flop()
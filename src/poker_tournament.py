@@ -5,20 +5,103 @@ Run heads-up matches between poker bots
 
 import time
 import random
+import statistics
+import multiprocessing
+import os
+import numpy as np
+from .bot_worker import BotWorker
 from .poker_engine import PokerEngine
+from .counter_rng import CounterRNG, hand_seeds
 from strategy.example_strategy_0 import BasicBot
 from strategy.example_strategy_1 import ConservativeBot
 from strategy.example_strategy_2 import AggressiveBot
-from src.utils import hand_type_str
+from src.utils import DECK, hand_type_str
+from hand_evaluator import evaluate_hand
+
+# Hands played per task by run_reset_match when no chunk size is given
+RESET_CHUNK_SIZE = 10000
+# CounterRNG stream that run_reset_match seeds the bots' random modules from, before every hand
+BOT_STREAM = 2
+
+
+def _play_reset_hands(task):
+    """
+    Play a range of independent reset-stack hands (see PokerTournament.run_reset_match)
+
+    Module-level so it can run in a worker process. Hand h is dealt by CounterRNG(seed, match_id)
+    and acted first preflop by seat h % 2, and the random and numpy.random modules the bots
+    draw from are seeded from h before it is played, so the result doesn't depend on how
+    hands are split.
+
+    Returns:
+        dict: Sums over the range, by seat (player1 sits in seat 0)
+    """
+    (player1, player2, starting_stack, ante, time_control, seed, match_id,
+     start, stop, history, timings, events) = task
+    bot_seeds = hand_seeds(seed, match_id, np.arange(start, stop), BOT_STREAM)
+    bots = [player1, player2]
+    if time_control is not None:
+        bots = [time_control.clock(bot) for bot in bots]
+    engine = PokerEngine(bots[0], bots[1], starting_stack, ante, headless=True, history=history,
+                         timings=timings, events=events, rng=CounterRNG(seed, match_id), match_id=match_id)
+
+    hands_won = [0, 0]
+    profit = 0
+    squared_profit = 0
+    saved_states = random.getstate(), np.random.get_state()  # Leave the caller's random state alone
+    for hand, bot_seed in zip(range(start, stop), bot_seeds):
+        random.seed(bot_seed)
+        np.random.seed(bot_seed & 0xFFFFFFFF)
+        engine.stacks[0] = engine.stacks[1] = starting_stack
+        engine.current_round = hand - 1  # play_round deals hand number current_round + 1
+        winner = engine.play_round()
+        if winner is not None:
+            hands_won[0 if winner is engine.players[0] else 1] += 1
+        hand_profit = engine.stacks[0] - starting_stack
+        profit += hand_profit
+        squared_profit += hand_profit * hand_profit
+    random.setstate(saved_states[0])
+    np.random.set_state(saved_states[1])
+
+    return {
+        'hands': stop - start,
+        'hands_won': hands_won,
+        'profit': profit,
+        'squared_profit': squared_profit,
+        'allin_adjustment': engine.allin_adjustment,
+        'violations': [list(bot.violations) if bot is not player else []
+                       for bot, player in zip(bots, (player1, player2))]
+    }
+
 
 class PokerTournament:
     """
     Tournament manager for poker bot competitions
     """
-    def __init__(self, starting_stack=1000, ante=10, verbose=True):
+    def __init__(self, starting_stack=1000, ante=10, verbose=True, history=None, timings=None,
+                 time_control=None, seed=None, events=None):
+        """
+        Args:
+            starting_stack (int): Chips each player starts a match with
+            ante (int): Ante collected from each player every hand
+            verbose (bool): Print match progress
+            history (HandHistoryWriter): Optional log that every hand played is written to
+            timings (PhaseTimings): Optional counters that every hand played records phase timings into
+            time_control (TimeControl): Optional decision timeouts and time banks, with a fresh
+                                        clock for each bot in every match
+            seed (int): Optional tournament seed; each match then deals from CounterRNG(seed, match id),
+                        so any match can be replayed on its own
+            events (EventBus): Optional bus that the events of every hand played are published to
+        """
         self.starting_stack = starting_stack
         self.ante = ante
         self.verbose = verbose
+        self.history = history
+        self.timings = timings
+        self.time_control = time_control
+        self.seed = seed
+        self.events = events
+        self.matches_started = 0  # Match ids, for seeded deals and the hand history
         self.results = {}
         self.toggle_first_player = False  # Track which player should go first
         
@@ -34,22 +117,33 @@ class PokerTournament:
         Returns:
             dict: Match results
         """
+        clocks = self._start_clocks(player1, player2)
+        match_id, rng = self._new_match()
+        
         # Toggle which player goes first (alternates between matches)
         if self.toggle_first_player:
             # Swap players to alternate positions
-            engine = PokerEngine(player2, player1, self.starting_stack, self.ante)
+            engine = PokerEngine(clocks[player2], clocks[player1], self.starting_stack, self.ante,
+                                 headless=not self.verbose, history=self.history, timings=self.timings,
+                                 events=self.events, rng=rng, match_id=match_id)
             # For results tracking, we still refer to the original players
             match_p1, match_p2 = player2, player1
         else:
-            engine = PokerEngine(player1, player2, self.starting_stack, self.ante)
+            engine = PokerEngine(clocks[player1], clocks[player2], self.starting_stack, self.ante,
+                                 headless=not self.verbose, history=self.history, timings=self.timings,
+                                 events=self.events, rng=rng, match_id=match_id)
             match_p1, match_p2 = player1, player2
             
+        # Seats of the original players (the same bot may sit in both seats)
+        p1_seat = 0 if match_p1 is player1 else 1
+        p2_seat = 1 - p1_seat
+            
         # Toggle for next match
         self.toggle_first_player = not self.toggle_first_player
         
         initial_stacks = {
-            player1: engine.stacks[match_p1],
-            player2: engine.stacks[match_p2]
+            player1: engine.stacks[p1_seat],
+            player2: engine.stacks[p2_seat]
         }
         
         hands_played = 0
@@ -66,18 +160,18 @@ class PokerTournament:
             
         # Play hands until one player is out of chips or max hands reached
         while (hands_played < num_hands and 
-               engine.stacks[match_p1] > 0 and 
-               engine.stacks[match_p2] > 0):
+               engine.stacks[0] > 0 and 
+               engine.stacks[1] > 0):
             
             if self.verbose:
                 print(f"\n--- Hand #{hands_played + 1} ---")
-                print(f"Stacks: {player1}: {engine.stacks[match_p1]}, {player2}: {engine.stacks[match_p2]}")
+                print(f"Stacks: {player1}: {engine.stacks[p1_seat]}, {player2}: {engine.stacks[p2_seat]}")
                 
             winner = engine.play_round()
             
             if winner:
                 # Map the winner back to the original player parameter
-                original_winner = player1 if winner == match_p1 else player2
+                original_winner = player1 if winner is engine.players[p1_seat] else player2
                 hands_won[original_winner] = hands_won.get(original_winner, 0) + 1
                 
                 if self.verbose:
@@ -94,8 +188,8 @@ class PokerTournament:
                 
         # Record final results
         final_stacks = {
-            player1: engine.stacks[match_p1],
-            player2: engine.stacks[match_p2]
+            player1: engine.stacks[p1_seat],
+            player2: engine.stacks[p2_seat]
         }
         
         profit = {
@@ -108,7 +202,12 @@ class PokerTournament:
             'hands_won': hands_won,
             'initial_stacks': initial_stacks,
             'final_stacks': final_stacks,
-            'profit': profit
+            'profit': profit,
+            'allin_adjusted_profit': {
+                player1: profit[player1] + engine.allin_adjustment[p1_seat],
+                player2: profit[player2] + engine.allin_adjustment[p2_seat]
+            },
+            'time_violations': self._time_violations(clocks)
         }
         
         if self.verbose:
@@ -117,9 +216,232 @@ class PokerTournament:
             print(f"Hands won: {player1}: {hands_won[player1]}, {player2}: {hands_won[player2]}")
             print(f"Final stacks: {player1}: {final_stacks[player1]}, {player2}: {final_stacks[player2]}")
             print(f"Profit: {player1}: {profit[player1]}, {player2}: {profit[player2]}")
+            adjusted = results['allin_adjusted_profit']
+            print(f"All-in adjusted profit: {player1}: {adjusted[player1]:.1f}, {player2}: {adjusted[player2]:.1f}")
             
         return results
     
+    def run_duplicate_match(self, player1, player2, num_hands=100, deals=None, seed=None):
+        """
+        Run a duplicate match: every deal is played twice with the seats swapped
+        
+        In the second play of a deal each player gets the cards and position the opponent
+        had in the first, so card luck cancels out of the netted result. Every hand starts
+        from full stacks so both plays of a deal are comparable.
+        
+        Args:
+            player1: First player bot
+            player2: Second player bot
+            num_hands (int): Number of deals (each deal is played twice)
+            deals (DealPack): Optional fixed deals, streamed from the pack's current position
+            seed (int): Optional seed for generating deals when no pack is given (by default
+                        the tournament seed and match id, if the tournament has a seed)
+            
+        Returns:
+            dict: Match results, including the standard error of player1's profit per hand
+                  and the variance reduction compared to playing independent hands
+        """
+        headless = not self.verbose
+        clocks = self._start_clocks(player1, player2)
+        match_id, rng = self._new_match()
+        # Both plays of a deal are logged under the same match id, told apart by the seating
+        engines = (PokerEngine(clocks[player1], clocks[player2], self.starting_stack, self.ante,
+                               headless=headless, history=self.history, timings=self.timings,
+                               events=self.events, match_id=match_id),
+                   PokerEngine(clocks[player2], clocks[player1], self.starting_stack, self.ante,
+                               headless=headless, history=self.history, timings=self.timings,
+                               events=self.events, match_id=match_id))
+        if deals is None:
+            if seed is not None:
+                rng = CounterRNG(seed)
+            elif rng is None:
+                rng = CounterRNG()
+            deal_cards = rng.deal_cards(range(num_hands))
+        
+        hands_won = {player1: 0, player2: 0}
+        hand_profits = []  # player1's profit in every hand played
+        pair_profits = []  # player1's netted profit over both plays of each deal
+        
+        if self.verbose:
+            print(f"\n=== Starting duplicate match: {player1} vs {player2} ===")
+            print(f"Deals: {num_hands} (each played twice)")
+            
+        for deal_num in range(num_hands):
+            if deals is not None:
+                predefined_cards = deals.next_deal()
+            else:
+                cards = [DECK[card] for card in deal_cards[deal_num]]
+                predefined_cards = {'player1': cards[0:2], 'player2': cards[2:4], 'community': cards[4:9]}
+                
+            pair_profit = 0
+            for engine in engines:
+                # Same starting stacks and position for both plays of the deal
+                engine.stacks[0] = engine.stacks[1] = self.starting_stack
+                engine.current_round = deal_num
+                winner = engine.play_round(predefined_cards)
+                p1_seat = 0 if engine is engines[0] else 1
+                if winner is not None:
+                    original_winner = player1 if winner is engine.players[p1_seat] else player2
+                    hands_won[original_winner] = hands_won.get(original_winner, 0) + 1
+                    
+                profit = engine.stacks[p1_seat] - self.starting_stack
+                hand_profits.append(profit)
+                pair_profit += profit
+            pair_profits.append(pair_profit)
+            
+        total_profit = sum(pair_profits)
+        hands_played = 2 * num_hands
+        # Each engine's adjustments, by the seat each player had in it
+        p1_adjustment = engines[0].allin_adjustment[0] + engines[1].allin_adjustment[1]
+        p2_adjustment = engines[0].allin_adjustment[1] + engines[1].allin_adjustment[0]
+        
+        # Variance of a single hand's result versus the per-hand average of a duplicate pair
+        hand_variance = statistics.variance(hand_profits) if len(hand_profits) > 1 else 0.0
+        pair_variance = statistics.variance([p / 2 for p in pair_profits]) if num_hands > 1 else 0.0
+        if pair_variance > 0:
+            variance_reduction = (hand_variance / 2) / pair_variance
+        else:
+            variance_reduction = float('inf') if hand_variance > 0 else 1.0
+            
+        results = {
+            'hands_played': hands_played,
+            'hands_won': hands_won,
+            'profit': {player1: total_profit, player2: -total_profit},
+            'allin_adjusted_profit': {player1: total_profit + p1_adjustment, player2: -total_profit + p2_adjustment},
+            'profit_per_hand': total_profit / hands_played if hands_played else 0.0,
+            'std_error': (pair_variance / num_hands) ** 0.5 if num_hands else 0.0,
+            'independent_std_error': (hand_variance / hands_played) ** 0.5 if hands_played else 0.0,
+            'variance_reduction': variance_reduction,
+            'time_violations': self._time_violations(clocks)
+        }
+        
+        if self.verbose:
+            print("\n=== Duplicate match complete ===")
+            print(f"Hands played: {hands_played}")
+            print(f"Hands won: {player1}: {hands_won[player1]}, {player2}: {hands_won[player2]}")
+            print(f"Profit: {player1}: {total_profit}, {player2}: {-total_profit}")
+            print(f"{player1} profit per hand: {results['profit_per_hand']:.2f} "
+                  f"+/- {results['std_error']:.2f} chips "
+                  f"(independent hands: +/- {results['independent_std_error']:.2f})")
+            print(f"Variance reduction: {variance_reduction:.1f}x fewer hands for the same confidence")
+            
+        return results
+    
+    def run_reset_match(self, player1, player2, num_hands=100, processes=None, chunk_size=None,
+                        start_method=None):
+        """
+        Run a match in which both stacks are reset before every hand
+        
+        Every hand is independent and scored in chips won, so the hands can be split across
+        worker processes and the results merged. Hand h is dealt from the match's CounterRNG
+        and acted first preflop by seat h % 2, and the random and numpy.random modules are
+        seeded from h before it is played, so bots that draw from them (like the bundled ones)
+        play the same way however the hands are split. player1 sits in seat 0.
+        
+        Args:
+            player1: First player bot (must be picklable when processes > 1)
+            player2: Second player bot
+            num_hands (int): Number of hands to play
+            processes (int): Worker processes (os.cpu_count() by default); 1 plays in this process,
+                             where hands are also written to the tournament's history, timings
+                             and events
+            chunk_size (int): Hands per task (by default RESET_CHUNK_SIZE, or fewer so every
+                              process gets work)
+            start_method (str): multiprocessing start method (platform default if None)
+            
+        Returns:
+            dict: Match results, including player1's profit per hand and its standard error
+        """
+        match_id, rng = self._new_match()
+        rng = rng or CounterRNG(None, match_id)
+        processes = processes or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, min(RESET_CHUNK_SIZE, -(-num_hands // processes)))
+        in_process = processes == 1
+        tasks = [(player1, player2, self.starting_stack, self.ante, self.time_control, rng.seed, rng.match,
+                  start, min(start + chunk_size, num_hands + 1),
+                  self.history if in_process else None, self.timings if in_process else None,
+                  self.events if in_process else None)
+                 for start in range(1, num_hands + 1, chunk_size)]  # Hand numbers start at 1, as in run_match
+        
+        if self.verbose:
+            print(f"\n=== Starting reset-stack match: {player1} vs {player2} ===")
+            print(f"Hands: {num_hands} in {len(tasks)} tasks on {processes} process(es)")
+            
+        if in_process:
+            chunks = [_play_reset_hands(task) for task in tasks]
+        else:
+            with multiprocessing.get_context(start_method).Pool(processes) as pool:
+                chunks = pool.map(_play_reset_hands, tasks)  # In hand order, so sums are reproducible
+                
+        hands_played = sum(chunk['hands'] for chunk in chunks)
+        total_profit = sum(chunk['profit'] for chunk in chunks)
+        squared_profit = sum(chunk['squared_profit'] for chunk in chunks)
+        adjustment = [sum(chunk['allin_adjustment'][seat] for chunk in chunks) for seat in range(2)]
+        
+        profit_per_hand = total_profit / hands_played if hands_played else 0.0
+        if hands_played > 1:
+            variance = (squared_profit - hands_played * profit_per_hand ** 2) / (hands_played - 1)
+            std_error = (max(variance, 0.0) / hands_played) ** 0.5
+        else:
+            std_error = 0.0
+            
+        time_violations = {player: [violation for chunk in chunks for violation in chunk['violations'][seat]]
+                           for seat, player in enumerate((player1, player2))}
+        results = {
+            'hands_played': hands_played,
+            'hands_won': {player1: sum(chunk['hands_won'][0] for chunk in chunks),
+                          player2: sum(chunk['hands_won'][1] for chunk in chunks)},
+            'profit': {player1: total_profit, player2: -total_profit},
+            'allin_adjusted_profit': {player1: total_profit + adjustment[0], player2: -total_profit + adjustment[1]},
+            'profit_per_hand': profit_per_hand,
+            'std_error': std_error,
+            'time_violations': time_violations
+        }
+        
+        if self.verbose:
+            print("\n=== Reset-stack match complete ===")
+            print(f"Hands played: {hands_played}")
+            print(f"Hands won: {player1}: {results['hands_won'][player1]}, {player2}: {results['hands_won'][player2]}")
+            print(f"Profit: {player1}: {total_profit}, {player2}: {-total_profit}")
+            print(f"{player1} profit per hand: {profit_per_hand:.2f} +/- {std_error:.2f} chips")
+            for player, violations in time_violations.items():
+                if violations:
+                    print(f"{player} exceeded its time limit {len(violations)} times")
+                    
+        return results
+    
+    def _new_match(self, match_id=None):
+        """
+        Id and deal source for a new match
+
+        Args:
+            match_id (int): Match id (by default the number of matches started so far)
+
+        Returns:
+            tuple: (match id, CounterRNG of the match, or None to deal from the random
+                   module when there's no seed)
+        """
+        if match_id is None:
+            match_id = self.matches_started
+            self.matches_started += 1
+        return match_id, CounterRNG(self.seed, match_id) if self.seed is not None else None
+    
+    def _start_clocks(self, player1, player2):
+        """Return the bot to seat for each player: a fresh ChessClock under time control, else the bot itself"""
+        if self.time_control is None:
+            return {player1: player1, player2: player2}
+        return {player1: self.time_control.clock(player1), player2: self.time_control.clock(player2)}
+    
+    def _time_violations(self, clocks):
+        """Time limit violations of each player in a match (empty without time control)"""
+        violations = {}
+        for player, bot in clocks.items():
+            violations[player] = list(bot.violations) if bot is not player else []
+            if violations[player] and self.verbose:
+                print(f"{player} exceeded its time limit {len(violations[player])} times")
+        return violations
+    
     def run_visual_match(self, player1, player2, num_hands=5, delay=1.0, fullscreen=False):
         """
         Run a visualized match between two players using pygame
@@ -158,7 +480,9 @@ class PokerTournament:
                 'visualization': True
             }
         
-    def run_tournament(self, players, num_matches=10, hands_per_match=100, visualize_finals=False):
+    def run_tournament(self, players, num_matches=10, hands_per_match=100, visualize_finals=False,
+                       duplicate=False, deals=None, workers=False, memory_limit=None, reset_stacks=False,
+                       processes=None):
         """
         Run a round-robin tournament between all players
         
@@ -167,21 +491,36 @@ class PokerTournament:
             num_matches (int): Number of matches between each pair
             hands_per_match (int): Number of hands per match
             visualize_finals (bool): Whether to visualize the final match
+            duplicate (bool): Play duplicate matches (see run_duplicate_match), where
+                              hands_per_match is the number of deals
+            deals (DealPack): Optional fixed deals for duplicate matches; match k of every
+                              pairing plays deals k * hands_per_match onwards
+            workers (bool): Host each bot in its own worker process (see BotWorker), started
+                            once for the whole tournament
+            memory_limit (int): Optional address space limit in bytes for each worker
+            reset_stacks (bool): Play reset-stack matches (see run_reset_match), each split
+                                 across processes
+            processes (int): Worker processes for reset-stack matches (os.cpu_count() by default)
             
         Returns:
             dict: Tournament results
         """
-        tournament_results = {}
-        
-        # Initialize results dictionary
-        for player in players:
-            tournament_results[player] = {
-                'matches_played': 0,
-                'matches_won': 0,
-                'hands_played': 0,
-                'hands_won': 0,
-                'total_profit': 0
-            }
+        if workers:
+            hosted = {player: BotWorker(player, memory_limit=memory_limit) for player in players}
+            try:
+                results = self.run_tournament([hosted[player] for player in players], num_matches,
+                                              hands_per_match, visualize_finals, duplicate, deals,
+                                              reset_stacks=reset_stacks, processes=1)
+            finally:
+                for worker in hosted.values():
+                    worker.stop()
+            for player, worker in hosted.items():
+                results[player] = results.pop(worker)
+                results[player]['worker_errors'] = worker.errors
+                results[player]['worker_restarts'] = worker.restarts
+            return results
+        
+        tournament_results = self._new_tournament_results(players)
             
         # Run matches between all pairs of players
         for i, player1 in enumerate(players):
@@ -194,45 +533,20 @@ class PokerTournament:
                         print(f"\n=== Tournament match {match+1}/{num_matches}: {player1} vs {player2} ===")
                         
                     # Alternate who goes first
-                    if match % 2 == 0:
+                    if duplicate:
+                        if deals is not None:
+                            deals.seek(match * hands_per_match)
+                        match_results = self.run_duplicate_match(player1, player2, hands_per_match, deals)
+                    elif reset_stacks:
+                        match_results = self.run_reset_match(player1, player2, hands_per_match, processes)
+                    elif match % 2 == 0:
                         match_results = self.run_match(player1, player2, hands_per_match)
                     else:
                         match_results = self.run_match(player2, player1, hands_per_match)
                         
-                    # Update tournament results
-                    p1_hands_won = match_results['hands_won'].get(player1, 0)
-                    p2_hands_won = match_results['hands_won'].get(player2, 0)
-                    
-                    # Determine match winner based on profit
-                    if match_results['profit'][player1] > match_results['profit'][player2]:
-                        match_winner = player1
-                    elif match_results['profit'][player2] > match_results['profit'][player1]:
-                        match_winner = player2
-                    else:
-                        match_winner = None
-                        
-                    # Update player1 stats
-                    tournament_results[player1]['matches_played'] += 1
-                    tournament_results[player1]['hands_played'] += match_results['hands_played']
-                    tournament_results[player1]['hands_won'] += p1_hands_won
-                    tournament_results[player1]['total_profit'] += match_results['profit'][player1]
-                    if match_winner == player1:
-                        tournament_results[player1]['matches_won'] += 1
+                    self._add_match_results(tournament_results, player1, player2, match_results)
                         
-                    # Update player2 stats
-                    tournament_results[player2]['matches_played'] += 1
-                    tournament_results[player2]['hands_played'] += match_results['hands_played']
-                    tournament_results[player2]['hands_won'] += p2_hands_won
-                    tournament_results[player2]['total_profit'] += match_results['profit'][player2]
-                    if match_winner == player2:
-                        tournament_results[player2]['matches_won'] += 1
-                        
-        # Calculate final statistics
-        for player in players:
-            stats = tournament_results[player]
-            stats['hand_win_rate'] = stats['hands_won'] / stats['hands_played'] if stats['hands_played'] > 0 else 0
-            stats['match_win_rate'] = stats['matches_won'] / stats['matches_played'] if stats['matches_played'] > 0 else 0
-            stats['avg_profit_per_hand'] = stats['total_profit'] / stats['hands_played'] if stats['hands_played'] > 0 else 0
+        self._finish_tournament_results(tournament_results)
             
         # Display final tournament results
         if self.verbose:
@@ -260,6 +574,46 @@ class PokerTournament:
             
         return tournament_results
         
+    def _new_tournament_results(self, players):
+        """Empty tournament statistics for every player"""
+        return {player: {
+            'matches_played': 0,
+            'matches_won': 0,
+            'hands_played': 0,
+            'hands_won': 0,
+            'total_profit': 0,
+            'allin_adjusted_profit': 0.0,
+            'time_violations': 0
+        } for player in players}
+    
+    def _add_match_results(self, tournament_results, player1, player2, match_results):
+        """Add the results of one match to the tournament statistics"""
+        # Determine match winner based on profit
+        if match_results['profit'][player1] > match_results['profit'][player2]:
+            match_winner = player1
+        elif match_results['profit'][player2] > match_results['profit'][player1]:
+            match_winner = player2
+        else:
+            match_winner = None
+            
+        for player in (player1, player2):
+            stats = tournament_results[player]
+            stats['matches_played'] += 1
+            stats['hands_played'] += match_results['hands_played']
+            stats['hands_won'] += match_results['hands_won'].get(player, 0)
+            stats['total_profit'] += match_results['profit'][player]
+            stats['allin_adjusted_profit'] += match_results['allin_adjusted_profit'][player]
+            stats['time_violations'] += len(match_results['time_violations'][player])
+            if match_winner == player:
+                stats['matches_won'] += 1
+    
+    def _finish_tournament_results(self, tournament_results):
+        """Calculate the final rates once every match has been added"""
+        for stats in tournament_results.values():
+            stats['hand_win_rate'] = stats['hands_won'] / stats['hands_played'] if stats['hands_played'] > 0 else 0
+            stats['match_win_rate'] = stats['matches_won'] / stats['matches_played'] if stats['matches_played'] > 0 else 0
+            stats['avg_profit_per_hand'] = stats['total_profit'] / stats['hands_played'] if stats['hands_played'] > 0 else 0
+    
     def _print_tournament_results(self, results):
         """Print formatted tournament results"""
         print("\n" + "="*50)
@@ -276,6 +630,9 @@ class PokerTournament:
             print(f"   Hands: {stats['hands_won']}/{stats['hands_played']} ({stats['hand_win_rate']:.2%})")
             print(f"   Total profit: {stats['total_profit']} chips")
             print(f"   Avg. profit per hand: {stats['avg_profit_per_hand']:.2f} chips")
+            print(f"   All-in adjusted profit: {stats['allin_adjusted_profit']:.1f} chips")
+            if stats.get('time_violations'):
+                print(f"   Time limit violations: {stats['time_violations']}")
             
         print("\n" + "="*50)
         
@@ -289,19 +646,19 @@ def run_detailed_hand(player1, player2, verbose=True):
     if verbose:
         print(f"\n=== Detailed hand: {player1} vs {player2} ===")
         print(f"Ante: {engine.ante} chips")
-        print(f"Stacks: {player1}: {engine.stacks[player1]}, {player2}: {engine.stacks[player2]}")
+        print(f"Stacks: {player1}: {engine.stacks[0]}, {player2}: {engine.stacks[1]}")
         print(f"\nHole cards:")
-        print(f"{player1}: {engine.player_hands[player1]}")
-        print(f"{player2}: {engine.player_hands[player2]}")
+        print(f"{player1}: {engine.player_hands[0]}")
+        print(f"{player2}: {engine.player_hands[1]}")
         
     # Pre-flop betting round
     if verbose:
         print("\n--- Pre-flop betting ---")
     winner = engine._betting_round('preflop')
-    if winner:
+    if winner is not None:
         if verbose:
-            print(f"{winner} wins {engine.pot} chips (opponent folded)")
-        return engine._end_round(winner)
+            print(f"{engine.players[winner]} wins {engine.pot} chips (opponent folded)")
+        return engine.players[engine._end_round(winner)]
         
     # Deal flop
     engine._deal_flop()
@@ -310,10 +667,10 @@ def run_detailed_hand(player1, player2, verbose=True):
         
     # Flop betting round
     winner = engine._betting_round('flop')
-    if winner:
+    if winner is not None:
         if verbose:
-            print(f"{winner} wins {engine.pot} chips (opponent folded)")
-        return engine._end_round(winner)
+            print(f"{engine.players[winner]} wins {engine.pot} chips (opponent folded)")
+        return engine.players[engine._end_round(winner)]
         
     # Deal turn
     engine._deal_turn()
@@ -322,10 +679,10 @@ def run_detailed_hand(player1, player2, verbose=True):
         
     # Turn betting round
     winner = engine._betting_round('turn')
-    if winner:
+    if winner is not None:
         if verbose:
-            print(f"{winner} wins {engine.pot} chips (opponent folded)")
-        return engine._end_round(winner)
+            print(f"{engine.players[winner]} wins {engine.pot} chips (opponent folded)")
+        return engine.players[engine._end_round(winner)]
         
     # Deal river
     engine._deal_river()
@@ -334,31 +691,70 @@ def run_detailed_hand(player1, player2, verbose=True):
         
     # River betting round
     winner = engine._betting_round('river')
-    if winner:
+    if winner is not None:
         if verbose:
-            print(f"{winner} wins {engine.pot} chips (opponent folded)")
-        return engine._end_round(winner)
+            print(f"{engine.players[winner]} wins {engine.pot} chips (opponent folded)")
+        return engine.players[engine._end_round(winner)]
         
     # Showdown
-    player1_cards = engine.player_hands[player1] + engine.community_cards
-    player2_cards = engine.player_hands[player2] + engine.community_cards
+    player1_cards = engine.player_hands[0] + engine.community_cards
+    player2_cards = engine.player_hands[1] + engine.community_cards
     
     if verbose:
         print("\n--- Showdown ---")
-        player1_hand = engine._hand_evaluator.evaluate_hand(player1_cards)
-        player2_hand = engine._hand_evaluator.evaluate_hand(player2_cards)
+        player1_hand = evaluate_hand(player1_cards)
+        player2_hand = evaluate_hand(player2_cards)
         print(f"{player1}: {hand_type_str(player1_hand)}")
         print(f"{player2}: {hand_type_str(player2_hand)}")
         
     winner = engine._showdown()
     
     if verbose:
-        if winner:
-            print(f"{winner} wins {engine.pot} chips")
+        if winner is not None:
+            print(f"{engine.players[winner]} wins {engine.pot} chips")
         else:
             print(f"Split pot: {engine.pot // 2} chips each")
             
-    return engine._end_round(winner)
+    return engine.players[winner] if winner is not None else None
+
+def run_throughput_benchmark(player1, player2, num_hands=1000, headless=True, verbose=True, timings=None):
+    """
+    Measure how many hands per second the engine plays between two bots
+    
+    Stacks are reset whenever a player busts so that exactly num_hands hands are played.
+    
+    Args:
+        player1: First player bot
+        player2: Second player bot
+        num_hands (int): Number of hands to play
+        headless (bool): Whether to run the engine in headless mode
+        verbose (bool): Whether to print the result
+        timings (PhaseTimings): Optional counters to record phase timings into
+        
+    Returns:
+        dict: Hands played, elapsed seconds and hands per second
+    """
+    engine = PokerEngine(player1, player2, 1000, 10, headless=headless, timings=timings)
+    
+    start_time = time.perf_counter()
+    for _ in range(num_hands):
+        if engine.stacks[0] < engine.ante or engine.stacks[1] < engine.ante:
+            engine.stacks[0] = engine.stacks[1] = engine.starting_stack
+        engine.play_round()
+    elapsed = time.perf_counter() - start_time
+    
+    results = {
+        'hands_played': num_hands,
+        'elapsed': elapsed,
+        'hands_per_second': num_hands / elapsed if elapsed > 0 else float('inf')
+    }
+    
+    if verbose:
+        mode = "headless" if headless else "standard"
+        print(f"{player1} vs {player2} ({mode}): {num_hands} hands in {elapsed:.2f}s "
+              f"= {results['hands_per_second']:.1f} hands/s")
+        
+    return results
 
 def run_visual_demo(delay=0.5, fullscreen=False):
     """Run a visual demo match between example bots"""
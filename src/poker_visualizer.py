@@ -7,9 +7,10 @@ import pygame
 import os
 import time
 import random
+from .events import HandStarted, ActionTaken, StreetDealt, Showdown, HandEnded
 from .poker_engine import PokerEngine
 from hand_evaluator import preflop_rank_description, evaluate_hand, calculate_head_to_head_equity
-from .utils import hand_type_str, compare_hands
+from .utils import hand_type_str
 
 # Initialize pygame
 pygame.init()
@@ -79,6 +80,7 @@ class PokerVisualizer:
         self.last_action = None
         self.pot_display = 0
         self.winner = None
+        self.hand_started = False
         
         # Cache for equity calculations
         self.equity_cache = {}
@@ -151,6 +153,11 @@ class PokerVisualizer:
         self.player1 = player1
         self.player2 = player2
         self.engine = PokerEngine(player1, player2, starting_stack, ante)
+        self.engine.subscribe(HandStarted, self._on_hand_start)
+        self.engine.subscribe(ActionTaken, self._on_action)
+        self.engine.subscribe(StreetDealt, self._on_street_dealt)
+        self.engine.subscribe(Showdown, self._on_showdown)
+        self.engine.subscribe(HandEnded, self._on_hand_end)
         self.round_state = {}
         self.last_action = None
         self.pot_display = 0
@@ -174,8 +181,8 @@ class PokerVisualizer:
         
         # Play hands
         while (hands_played < num_hands and
-               self.engine.stacks[self.player1] > 0 and
-               self.engine.stacks[self.player2] > 0):
+               self.engine.stacks[0] > 0 and
+               self.engine.stacks[1] > 0):
                
             # Pre-generate cards for upcoming hand
             next_round_num = self.engine.current_round + 1
@@ -184,7 +191,7 @@ class PokerVisualizer:
             # Display hand number
             self.clear_screen()
             self.draw_text(f"Hand #{hands_played + 1}", SCREEN_WIDTH // 2, 80, self.large_font, centered=True)
-            self.draw_text(f"Stacks: {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}", 
+            self.draw_text(f"Stacks: {self.player1}: {self.engine.stacks[0]}, {self.player2}: {self.engine.stacks[1]}", 
                           SCREEN_WIDTH // 2, 130, self.medium_font, centered=True)
             
             # Only show JSON editing info in debug mode
@@ -232,13 +239,13 @@ class PokerVisualizer:
         self.draw_text(f"Hands played: {hands_played}", SCREEN_WIDTH // 2, 170, self.medium_font, centered=True)
         self.draw_text(f"Hands won: {self.player1}: {hands_won[self.player1]}, {self.player2}: {hands_won[self.player2]}", 
                       SCREEN_WIDTH // 2, 210, self.medium_font, centered=True)
-        self.draw_text(f"Final stacks: {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}", 
+        self.draw_text(f"Final stacks: {self.player1}: {self.engine.stacks[0]}, {self.player2}: {self.engine.stacks[1]}", 
                       SCREEN_WIDTH // 2, 250, self.medium_font, centered=True)
         
         # Determine match winner
-        if self.engine.stacks[self.player1] > self.engine.stacks[self.player2]:
+        if self.engine.stacks[0] > self.engine.stacks[1]:
             match_winner = self.player1
-        elif self.engine.stacks[self.player2] > self.engine.stacks[self.player1]:
+        elif self.engine.stacks[1] > self.engine.stacks[0]:
             match_winner = self.player2
         else:
             match_winner = None
@@ -257,7 +264,11 @@ class PokerVisualizer:
         return match_winner
     
     def run_visual_hand(self):
-        """Run a single hand with visualization"""
+        """Run a single hand with visualization
+        
+        The engine plays the hand by its own rules; the table is drawn from the events it
+        publishes along the way (see the _on_* handlers registered in setup_match).
+        """
         # Check for predefined cards - load right before using to capture any edits
         next_round_num = self.engine.current_round + 1
         predefined_cards = self.engine.load_predefined_cards(next_round_num)
@@ -267,617 +278,175 @@ class PokerVisualizer:
             print(f"Using cards: Player 1: {predefined_cards['player1']}, Player 2: {predefined_cards['player2']}")
             print(f"Community cards will be: {predefined_cards['community']}")
         
-        # Initialize round with predefined cards if available
-        ante_winner = self.engine.initialize_round(predefined_cards)
-        self.pot_display = self.engine.pot
-        
-        # Print debug information
-        print("\n" + "="*80)
-        print(f"HAND #{self.engine.current_round} - STARTING")
-        print("="*80)
-        print(f"Player 1 ({self.player1}): Stack = {self.engine.stacks[self.player1]}")
-        print(f"Player 2 ({self.player2}): Stack = {self.engine.stacks[self.player2]}")
-        print(f"Ante: {self.engine.ante}")
-        
-        # Print the cards that will be used (for debugging)
-        print(f"Player 1 cards: {self.engine.player_hands[self.player1]}")
-        print(f"Player 2 cards: {self.engine.player_hands[self.player2]}")
-        if predefined_cards:
-            print(f"Community cards (will be): {predefined_cards['community']}")
-            print("Using predefined cards from JSON file")
+        self.hand_started = False
+        winner = self.engine.play_round(predefined_cards)
         
-        # Check if a player couldn't pay the ante
-        if ante_winner:
-            print(f"\nWINNER (can't pay ante): {ante_winner}")
-            print(f"Final stacks - {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}")
+        # The hand never started if a player couldn't pay the ante
+        if not self.hand_started:
+            print(f"\nWINNER (can't pay ante): {winner}")
+            print(f"Final stacks - {self.player1}: {self.engine.stacks[0]}, {self.player2}: {self.engine.stacks[1]}")
             
             # Display on screen
             self.clear_screen()
             self.draw_table()
             self.draw_player_stacks()
-            self.draw_text(f"{self.player1 if self.player1 != ante_winner else self.player2} can't pay ante!", 
+            self.draw_text(f"{self.player1 if self.player1 != winner else self.player2} can't pay ante!", 
                           SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 50, 
                           self.medium_font, centered=True, color=RED)
-            self.draw_text(f"Winner: {ante_winner}", 
+            self.draw_text(f"Winner: {winner}", 
                           SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2, 
                           self.large_font, centered=True, color=GOLD)
             # Make sure everything is drawn before pausing
             pygame.display.flip()
             self.wait_with_events(self.animation_speed * 3)
-            
-            self.winner = ante_winner
-            return ante_winner
-            
-        print(f"Starting Pot: {self.engine.pot}")
-        
-        # Print hole cards
-        print("\nHole Cards:")
-        p1_hand = self.engine.player_hands[self.player1]
-        p2_hand = self.engine.player_hands[self.player2]
-        
-        # Get preflop hand descriptions
-        p1_desc = preflop_rank_description(p1_hand)
-        p2_desc = preflop_rank_description(p2_hand)
-        
-        print(f"{self.player1}: {p1_hand} - {p1_desc[0]} ({p1_desc[1]})")
-        print(f"{self.player2}: {p2_hand} - {p2_desc[0]} ({p2_desc[1]})")
-        
-        # Display player hands initially with cards face down
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=False)
-        self.draw_pot()
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed)
-        
-        # Now reveal the hole cards
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_pot()
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed * 2)
-        
-        # Pre-flop betting round
-        print("\nPRE-FLOP BETTING:")
-        winner = self._visual_preflop_betting()
-        
-        # Print betting results
-        print(f"  Pot after pre-flop: {self.engine.pot}")
-        print(f"  Player stacks - {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}")
-        
-        # If someone folded, end the hand (pot already transferred in _visual_betting_round)
-        if winner:
-            print(f"\nWINNER (by fold): {winner}")
-            self.winner = winner
-            return winner
-            
-        # Deal flop
-        print("\nFLOP:")
-        self._visual_flop()
-        
-        # Print flop cards
-        print(f"  Flop: {self.engine.community_cards}")
-        
-        # Flop betting round
-        print("\nFLOP BETTING:")
-        winner = self._visual_flop_betting()
-        
-        # Print betting results
-        print(f"  Pot after flop: {self.engine.pot}")
-        print(f"  Player stacks - {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}")
-        
-        # If someone folded, end the hand (pot already transferred in _visual_betting_round)
-        if winner:
-            print(f"\nWINNER (by fold): {winner}")
-            self.winner = winner
-            return winner
-            
-        # Deal turn
-        print("\nTURN:")
-        self._visual_turn()
-        
-        # Print turn card
-        print(f"  Turn: {self.engine.community_cards[3]}")
-        print(f"  Board: {self.engine.community_cards}")
-        
-        # Turn betting round
-        print("\nTURN BETTING:")
-        winner = self._visual_turn_betting()
-        
-        # Print betting results
-        print(f"  Pot after turn: {self.engine.pot}")
-        print(f"  Player stacks - {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}")
-        
-        # If someone folded, end the hand (pot already transferred in _visual_betting_round)
-        if winner:
-            print(f"\nWINNER (by fold): {winner}")
-            self.winner = winner
-            return winner
-            
-        # Deal river
-        print("\nRIVER:")
-        self._visual_river()
-        
-        # Print river card
-        print(f"  River: {self.engine.community_cards[4]}")
-        print(f"  Final board: {self.engine.community_cards}")
-        
-        # River betting round
-        print("\nRIVER BETTING:")
-        winner = self._visual_river_betting()
-        
-        # Print betting results
-        print(f"  Final pot: {self.engine.pot}")
-        print(f"  Player stacks - {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}")
-        
-        # If someone folded, end the hand (pot already transferred in _visual_betting_round)
-        if winner:
-            print(f"\nWINNER (by fold): {winner}")
-            self.winner = winner
-            return winner
-            
-        # Showdown
-        print("\nSHOWDOWN:")
-        winner = self._visual_showdown()
         
         self.winner = winner
         return winner
     
-    def _visual_preflop_betting(self):
-        """Execute preflop betting with visualization"""
-        # Display the round
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_pot()
-        self.draw_text("Pre-Flop Betting", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed)
-        
-        # Execute the betting round
-        winner = self._visual_betting_round('preflop')
-        
-        return winner
-        
-    def _visual_flop(self):
-        """Deal and display the flop"""
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_pot()
-        self.draw_text("Dealing Flop", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed)
-        
-        # Deal flop (3 cards)
-        self.engine._deal_flop()
-        
-        # Update display with flop cards
+    def _draw_hand(self, show_cards=True):
+        """Draw the table, stacks, hole cards, board and pot"""
         self.clear_screen()
         self.draw_table()
         self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
+        self.draw_player_hands(show_cards=show_cards)
         self.draw_community_cards()
         self.draw_pot()
-        self.draw_text("Flop Dealt", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed * 2)
         
-    def _visual_flop_betting(self):
-        """Execute flop betting with visualization"""
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("Flop Betting", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
+    def _show_betting(self, title):
+        """Announce a betting round, unless a player is all-in and the board is just dealt out"""
+        if self.engine._all_in():
+            return
+        print(f"\n{title.upper()}:")
+        self._draw_hand()
+        self.draw_text(title, SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
         # Make sure everything is drawn before pausing
         pygame.display.flip()
         self.wait_with_events(self.animation_speed)
         
-        # Execute the betting round
-        winner = self._visual_betting_round('flop')
+    def _on_hand_start(self, event):
+        """Show the hole cards of a new hand"""
+        self.hand_started = True
+        self.last_action = None
+        self.pot_display = self.engine.pot
         
-        return winner
+        # Print debug information
+        print("\n" + "="*80)
+        print(f"HAND #{event.hand} - STARTING")
+        print("="*80)
+        print(f"Player 1 ({self.player1}): Stack = {event.stacks[0]}")
+        print(f"Player 2 ({self.player2}): Stack = {event.stacks[1]}")
+        print(f"Ante: {event.ante}")
+        print(f"Starting Pot: {self.engine.pot}")
         
-    def _visual_turn(self):
-        """Deal and display the turn card"""
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("Dealing Turn", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
+        # Print hole cards
+        print("\nHole Cards:")
+        for player, hand in zip((self.player1, self.player2), event.hole_cards):
+            description = preflop_rank_description(list(hand))
+            print(f"{player}: {list(hand)} - {description[0]} ({description[1]})")
+        
+        # Display player hands initially with cards face down
+        self._draw_hand(show_cards=False)
         # Make sure everything is drawn before pausing
         pygame.display.flip()
         self.wait_with_events(self.animation_speed)
         
-        # Deal turn (1 card)
-        self.engine._deal_turn()
-        
-        # Update display with turn card
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("Turn Dealt", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
+        # Now reveal the hole cards
+        self._draw_hand()
         # Make sure everything is drawn before pausing
         pygame.display.flip()
         self.wait_with_events(self.animation_speed * 2)
         
-    def _visual_turn_betting(self):
-        """Execute turn betting with visualization"""
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("Turn Betting", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed)
-        
-        # Execute the betting round
-        winner = self._visual_betting_round('turn')
-        
-        return winner
+        self._show_betting("Pre-Flop Betting")
+        
+    def _on_action(self, event):
+        """Show an action as the engine applied it"""
+        player = self.engine.players[event.seat]
+        if event.kind == 'raise':
+            action_text = f"RAISE TO {self.engine.bets[event.seat]}"
+        elif event.kind == 'call' and event.amount:
+            action_text = f"CALL {event.amount}"
+        elif event.kind == 'fold':
+            action_text = "FOLD"
+        elif event.kind is None:
+            action_text = str(event.action.get('action')).upper()  # Unknown actions change nothing
+        else:
+            action_text = "CHECK"
         
-    def _visual_river(self):
-        """Deal and display the river card"""
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("Dealing River", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed)
+        print(f"  {player}: {action_text} (bot returned {event.action}), pot {event.pot}")
+        print(f"  Player stacks - {self.player1}: {self.engine.stacks[0]}, {self.player2}: {self.engine.stacks[1]}")
         
-        # Deal river (1 card)
-        self.engine._deal_river()
+        # Display action with larger text and more prominent color
+        self.last_action = f"{player}: {action_text}"
+        self.pot_display = event.pot
+        self._draw_hand()
         
-        # Update display with river card
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("River Dealt", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        # Make sure everything is drawn before pausing
-        pygame.display.flip()
-        self.wait_with_events(self.animation_speed * 2)
+        # Highlight the player who acted
+        player_position = (100, 600) if event.seat == 0 else (SCREEN_WIDTH - 100, 600)
+        pygame.draw.circle(self.screen, BLUE, player_position, 50, 5)
+        if event.kind == 'fold':
+            self.draw_text(f"{player} FOLDED", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=RED)
+        else:
+            self.draw_text(self.last_action, SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
         
-    def _visual_river_betting(self):
-        """Execute river betting with visualization"""
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("River Betting", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
         # Make sure everything is drawn before pausing
         pygame.display.flip()
-        self.wait_with_events(self.animation_speed)
         
-        # Execute the betting round
-        winner = self._visual_betting_round('river')
+        # Pause to show the action
+        self.wait_with_events(self.animation_speed * 1.5)
         
-        return winner
+    def _on_street_dealt(self, event):
+        """Show the flop, turn or river"""
+        name = ('Flop', 'Turn', 'River')[event.street - 1]
+        print(f"\n{name.upper()}:")
+        print(f"  Board: {list(event.community_cards)}")
         
-    def _visual_showdown(self):
-        """Execute showdown with visualization"""
-        # Clear screen and draw current state
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("Showdown", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
+        self._draw_hand()
+        self.draw_text(f"{name} Dealt", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
         # Make sure everything is drawn before pausing
         pygame.display.flip()
         self.wait_with_events(self.animation_speed * 2)
         
-        # Evaluate hands
-        player1 = self.engine.players[0]
-        player2 = self.engine.players[1]
-        
-        hand1 = self.engine.player_hands[player1] + self.engine.community_cards
-        hand2 = self.engine.player_hands[player2] + self.engine.community_cards
+        self._show_betting(f"{name} Betting")
         
-        best_hand1 = evaluate_hand(hand1)
-        best_hand2 = evaluate_hand(hand2)
+    def _on_showdown(self, event):
+        """Show both players' best hands and who wins"""
+        print("\nSHOWDOWN:")
+        best_hands = [evaluate_hand(list(hand) + list(event.community_cards)) for hand in event.hole_cards]
         
-        # Display best hands
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
+        self._draw_hand()
         self.draw_text("Showdown", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        
-        # Show best hands - Fix access to hand type which is a dict key 'type', not an index
-        self.draw_text(f"{player1}: {hand_type_str(best_hand1)}", 250, SCREEN_HEIGHT - 220, self.medium_font, color=WHITE)
-        self.draw_text(f"{player2}: {hand_type_str(best_hand2)}", SCREEN_WIDTH - 250, 80, self.medium_font, color=WHITE)
+        # Make sure everything is drawn before pausing
         pygame.display.flip()
         self.wait_with_events(self.animation_speed * 2)
         
-        # Compare hands and determine winner
-        result = compare_hands(best_hand1, best_hand2)
-        
-        if result > 0:
-            winner = player1
-            self.draw_text(f"{player1} WINS!", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
-            # Show pot transfer
-            prev_pot = self.pot_display
-            self.draw_text(f"Pot: {prev_pot} → transferred to {winner}", SCREEN_WIDTH // 2, 210, self.medium_font, centered=True, color=GOLD)
-            pygame.display.flip()
-            self.wait_with_events(self.animation_speed * 2)
-            
-            # Transfer pot and update display
-            self.engine._end_round(winner)
-            self.pot_display = 0
-        elif result < 0:
-            winner = player2
-            self.draw_text(f"{player2} WINS!", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
-            # Show pot transfer
-            prev_pot = self.pot_display
-            self.draw_text(f"Pot: {prev_pot} → transferred to {winner}", SCREEN_WIDTH // 2, 210, self.medium_font, centered=True, color=GOLD)
-            pygame.display.flip()
-            self.wait_with_events(self.animation_speed * 2)
-            
-            # Transfer pot and update display
-            self.engine._end_round(winner)
-            self.pot_display = 0
-        else:
-            # Split pot
+        # Show best hands
+        self.draw_text(f"{self.player1}: {hand_type_str(best_hands[0])}", 250, SCREEN_HEIGHT - 220, self.medium_font, color=WHITE)
+        self.draw_text(f"{self.player2}: {hand_type_str(best_hands[1])}", SCREEN_WIDTH - 250, 80, self.medium_font, color=WHITE)
+        if event.winner is None:
             self.draw_text("SPLIT POT", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
-            prev_pot = self.pot_display
-            split_amount = prev_pot // 2
-            
-            # Show pot splitting animation
-            self.draw_text(f"Pot: {prev_pot} → split equally ({split_amount} each)", SCREEN_WIDTH // 2, 210, self.medium_font, centered=True, color=GOLD)
-            pygame.display.flip()
-            self.wait_with_events(self.animation_speed * 2)
-            
-            # Actually split the pot
-            self.engine.stacks[player1] += split_amount
-            self.engine.stacks[player2] += split_amount
-            # Handle odd chip if pot is odd
-            if prev_pot % 2 == 1:
-                # Give the odd chip to the player in position (player 0)
-                self.engine.stacks[player1] += 1
-                self.draw_text(f"Odd chip goes to {player1}", SCREEN_WIDTH // 2, 250, self.small_font, centered=True, color=GOLD)
-            
-            self.pot_display = 0
-            pygame.display.flip()
-            self.wait_with_events(self.animation_speed * 2)
-            return None
-            
-        # Final display with updated stacks
-        self.clear_screen()
-        self.draw_table()
-        self.draw_player_stacks()
-        self.draw_player_hands(show_cards=True)
-        self.draw_community_cards()
-        self.draw_pot()
-        self.draw_text("Showdown Complete", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
-        if result > 0:
-            self.draw_text(f"{player1} WINS!", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
-        elif result < 0:
-            self.draw_text(f"{player2} WINS!", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
         else:
-            self.draw_text("SPLIT POT", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
+            self.draw_text(f"{self.engine.players[event.winner]} WINS!", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
         pygame.display.flip()
         self.wait_with_events(self.animation_speed * 2)
         
-        return player1 if result > 0 else player2 if result < 0 else None
-    
-    def _visual_betting_round(self, round_name):
-        """Execute a betting round with visualization"""
-        # Reset betting state for this round
-        acted_players = set()
-        all_players_acted = False
-        
-        # Reset current bet at the start of the round
-        current_bet_at_start = self.engine.current_bet
-        
-        # Reset betting state for this round
-        self.engine.current_bet = 0
+    def _on_hand_end(self, event):
+        """Show the pot going to the winner"""
+        if event.winner is None:
+            transfer = f"Pot: {event.pot} → split equally ({event.pot // 2} each)"
+            print("\nSplit pot")
+        else:
+            winner = self.engine.players[event.winner]
+            transfer = f"Pot: {event.pot} → transferred to {winner}"
+            print(f"\nWINNER{'' if event.showdown else ' (by fold)'}: {winner}")
+        print(f"Final stacks - {self.player1}: {event.stacks[0]}, {self.player2}: {event.stacks[1]}")
         
-        # Clear player bets from previous round
-        if round_name != 'preflop':
-            # Don't reset current_player_idx - preserve the same starting player as pre-flop
-            # Reset player bets - this is the fix for bets carrying over between rounds
-            self.engine.round_state['player0_bet'] = 0
-            self.engine.round_state['player1_bet'] = 0
-            
-        # Continue until all players have acted and bets are equal
-        while not all_players_acted or any(self.engine.round_state.get(f"player{i}_bet", 0) != self.engine.current_bet 
-                                          for i in range(2) if self.engine.stacks[self.engine.players[i]] > 0):
-                                          
-            current_player = self.engine.players[self.engine.current_player_idx]
-            
-            # Debug - print current state
-            print(f"  Current player: {current_player}")
-            print(f"  Current bets - Player 1: {self.engine.round_state.get('player0_bet', 0)}, Player 2: {self.engine.round_state.get('player1_bet', 0)}")
-            print(f"  Current pot: {self.engine.pot}")
-            
-            # Update display to show current player
-            self.clear_screen()
-            self.draw_table()
-            self.draw_player_stacks()
-            self.draw_player_hands(show_cards=True)
-            self.draw_community_cards()
-            self.draw_pot()
-            
-            # Highlight current player
-            player_position = (100, 600) if current_player == self.player1 else (SCREEN_WIDTH - 100, 600)
-            pygame.draw.circle(self.screen, BLUE, player_position, 50, 5)
-            
-            # Show current bet to call
-            player_idx = self.engine.players.index(current_player)
-            current_player_bet = self.engine.round_state.get(f'player{player_idx}_bet', 0)
-            amount_to_call = self.engine.current_bet - current_player_bet
-            
-            # Debug - print what needs to be called
-            print(f"  Current bet: {self.engine.current_bet}, Player already bet: {current_player_bet}")
-            print(f"  Amount to call: {amount_to_call}")
-            
-            if amount_to_call > 0:
-                self.draw_text(f"To call: {amount_to_call}", SCREEN_WIDTH // 2, 130, self.medium_font, centered=True)
-            
-            self.draw_text(f"{current_player}'s turn...", SCREEN_WIDTH // 2, 90, self.medium_font, centered=True)
-            
-            # Make sure everything is drawn before pausing
-            pygame.display.flip()
-            
-            # Slight pause for drama
-            self.wait_with_events(self.animation_speed)
-            
-            # Get player action
-            player_view = self.engine._get_player_view(current_player)
-            print(f"  Player view: {player_view}")
-            
-            action = current_player.get_action(player_view)
-            
-            # Debug - print the action taken
-            print(f"  Action taken: {action}")
-            
-            # Display the action
-            action_text = f"{action['action'].upper()}"
-            if action['action'] in ['bet', 'raise']:
-                # Show "CHECK" for bets or raises with 0 amount
-                if 'amount' in action and action['amount'] == 0:
-                    action_text = "CHECK"
-                elif 'amount' in action and action['amount'] < self.engine.round_state.get('min_raise', 0):
-                    action_text = "CHECK"
-                elif 'amount' in action:
-                    action_text += f" {action['amount']}"
-            
-            # Display action with larger text and more prominent color
-            self.last_action = f"{current_player}: {action_text}"
-            
-            # Update the screen with the action
-            self.clear_screen()
-            self.draw_table()
-            self.draw_player_stacks()
-            self.draw_player_hands(show_cards=True)
-            self.draw_community_cards()
-            self.draw_pot()
-            self.draw_text(self.last_action, SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
-            
-            # Make sure everything is drawn before pausing
-            pygame.display.flip()
-            
-            # Process the action
-            folded = self.engine._process_action(current_player, action)
-            self.pot_display = self.engine.pot
-            
-            # Debug - print the result of the action
-            print(f"  After action - Folded: {folded}, Pot: {self.engine.pot}")
-            print(f"  New bets - Player 1: {self.engine.round_state.get('player0_bet', 0)}, Player 2: {self.engine.round_state.get('player1_bet', 0)}")
-            print(f"  Player stacks - {self.player1}: {self.engine.stacks[self.player1]}, {self.player2}: {self.engine.stacks[self.player2]}")
-            
-            # Update display to show action result
-            self.clear_screen()
-            self.draw_table()
-            self.draw_player_stacks()
-            self.draw_player_hands(show_cards=True)
-            self.draw_community_cards()
-            self.draw_pot()
-            
-            if self.last_action:
-                self.draw_text(self.last_action, SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=GOLD)
-            
-            # Make sure everything is drawn before pausing
-            pygame.display.flip()
-            
-            # Pause to show the action
-            self.wait_with_events(self.animation_speed * 1.5)
-            
-            if folded:
-                # If player folded, other player wins
-                winner = self.engine.players[1 - self.engine.current_player_idx]
-                
-                # Transfer pot to winner visually
-                prev_pot = self.pot_display
-                prev_winner_stack = self.engine.stacks[winner]
-                
-                # Call engine's _end_round to transfer pot to winner
-                self.engine._end_round(winner)
-                
-                # Update pot display
-                self.pot_display = 0
-                
-                # Show pot transfer animation
-                self.clear_screen()
-                self.draw_table()
-                self.draw_player_stacks()  # Will now show updated stack with pot added
-                self.draw_player_hands(show_cards=True)
-                self.draw_community_cards()
-                self.draw_pot()  # Will show empty pot
-                
-                # Show fold and pot transfer messages
-                self.draw_text(f"{current_player} FOLDED", SCREEN_WIDTH // 2, 160, self.large_font, centered=True, color=RED)
-                self.draw_text(f"Pot: {prev_pot} → transferred to {winner}", SCREEN_WIDTH // 2, 210, self.medium_font, centered=True, color=GOLD)
-                
-                # Make sure everything is drawn before pausing
-                pygame.display.flip()
-                self.wait_with_events(self.animation_speed * 2)
-                
-                return winner
-                
-            # Mark this player as having acted
-            acted_players.add(current_player)
-            
-            # Check if all players have acted
-            all_players_acted = len(acted_players) == len(self.engine.players)
-            
-            # Check if we should break out of infinite checking loop
-            # If both players have acted and we're back to the same bet as at the start (or both are checking)
-            if all_players_acted and (
-                  # Either the current bet is the same as at the start of the round
-                  self.engine.current_bet == current_bet_at_start or
-                  # Or both players are effectively checking (bet 0 or checking directly)
-                  (action['action'] in ['check', 'bet', 'raise'] and
-                   ('amount' not in action or action['amount'] == 0 or 
-                    action['amount'] < self.engine.round_state.get('min_raise', 0)))):
-                # If we've gone through the full betting cycle and have reached a stable state, exit
-                if action['action'] == 'check' or (
-                    action['action'] in ['bet', 'raise'] and 
-                    ('amount' not in action or action['amount'] == 0 or 
-                     action['amount'] < self.engine.round_state.get('min_raise', 0))):
-                    if all(p in acted_players for p in self.engine.players):
-                        break
-            
-            # Move to next player
-            self.engine.current_player_idx = (self.engine.current_player_idx + 1) % 2
-            
-            # Update game state after action
-            self.engine._update_game_state()
-            
-        return None  # No winner yet
+        # Final display with updated stacks and an empty pot
+        self.pot_display = 0
+        self._draw_hand()
+        self.draw_text("Hand Complete", SCREEN_WIDTH // 2, 80, self.large_font, centered=True, color=GOLD)
+        self.draw_text(transfer, SCREEN_WIDTH // 2, 210, self.medium_font, centered=True, color=GOLD)
+        pygame.display.flip()
+        self.wait_with_events(self.animation_speed * 2)
     
     def clear_screen(self):
         """Clear the screen"""
@@ -900,20 +469,20 @@ class PokerVisualizer:
         x = 150
         y = SCREEN_HEIGHT - 150
         if show_cards:
-            for card in self.engine.player_hands[self.player1]:
+            for card in self.engine.player_hands[0]:
                 self.draw_card(card, x, y)
                 x += CARD_WIDTH + 10
                 
             # Draw hand percentile
-            if len(self.engine.player_hands[self.player1]) == 2 and not self.engine.community_cards:
-                hand_info = preflop_rank_description(self.engine.player_hands[self.player1])
+            if len(self.engine.player_hands[0]) == 2 and not self.engine.community_cards:
+                hand_info = preflop_rank_description(self.engine.player_hands[0])
                 self.draw_text(f"{hand_info[0]} - {hand_info[1]}", 250, y + CARD_HEIGHT + 10, self.small_font)
             
             # Draw win probability after the flop
             elif len(self.engine.community_cards) >= 3:
                 # Calculate head-to-head equity only if it's not cached or cards have changed
-                p1_hand = self.engine.player_hands[self.player1]
-                p2_hand = self.engine.player_hands[self.player2]
+                p1_hand = self.engine.player_hands[0]
+                p2_hand = self.engine.player_hands[1]
                 community = self.engine.community_cards
                 
                 # Create a cache key from the current cards
@@ -948,13 +517,13 @@ class PokerVisualizer:
         x = SCREEN_WIDTH - 150 - (CARD_WIDTH + 10) * 2
         y = 150
         if show_cards:
-            for card in self.engine.player_hands[self.player2]:
+            for card in self.engine.player_hands[1]:
                 self.draw_card(card, x, y)
                 x += CARD_WIDTH + 10
                 
             # Draw hand percentile
-            if len(self.engine.player_hands[self.player2]) == 2 and not self.engine.community_cards:
-                hand_info = preflop_rank_description(self.engine.player_hands[self.player2])
+            if len(self.engine.player_hands[1]) == 2 and not self.engine.community_cards:
+                hand_info = preflop_rank_description(self.engine.player_hands[1])
                 self.draw_text(f"{hand_info[0]} - {hand_info[1]}", SCREEN_WIDTH - 250, y + CARD_HEIGHT + 10, self.small_font)
             
             # Draw win probability after the flop
@@ -1000,16 +569,16 @@ class PokerVisualizer:
     def draw_player_stacks(self):
         """Draw the player's chip stacks"""
         # Player 1 stack - push more to the left
-        self.draw_chips(80, SCREEN_HEIGHT - 170, self.engine.stacks[self.player1])
-        self.draw_text(f"{self.engine.stacks[self.player1]}", 80, SCREEN_HEIGHT - 120, self.medium_font)
+        self.draw_chips(80, SCREEN_HEIGHT - 170, self.engine.stacks[0])
+        self.draw_text(f"{self.engine.stacks[0]}", 80, SCREEN_HEIGHT - 120, self.medium_font)
         
         # Player 2 stack - push more to the right
-        self.draw_chips(SCREEN_WIDTH - 80, 170, self.engine.stacks[self.player2])
-        self.draw_text(f"{self.engine.stacks[self.player2]}", SCREEN_WIDTH - 80, 220, self.medium_font)
+        self.draw_chips(SCREEN_WIDTH - 80, 170, self.engine.stacks[1])
+        self.draw_text(f"{self.engine.stacks[1]}", SCREEN_WIDTH - 80, 220, self.medium_font)
         
         # Player bets - adjust positions for better visibility
-        player1_bet = self.engine.round_state.get('player0_bet', 0)
-        player2_bet = self.engine.round_state.get('player1_bet', 0)
+        player1_bet = self.engine.bets[0]
+        player2_bet = self.engine.bets[1]
         
         if player1_bet > 0:
             # Push player 1 bet display more to the left and up
@@ -0,0 +1,246 @@
+"""
+Opponent Range Tracker
+Keeps a weight for each of the 1326 hole-card combinations and narrows it from observed actions
+"""
+
+import numpy as np
+from hand_evaluator import preflop_percentile
+from .utils import DECK, CARD_INDEX
+
+NUM_COMBOS = 1326
+
+# Every hole-card combination as a pair of card indices (see utils.CARD_INDEX)
+COMBO_CARDS = np.array([(i, j) for i in range(52) for j in range(i + 1, 52)], dtype=np.int64)
+COMBO_RANKS = COMBO_CARDS >> 2
+COMBO_SUITS = COMBO_CARDS & 3
+
+# For each card, the indices of the 51 combinations that contain it
+CARD_COMBOS = np.array([np.nonzero((COMBO_CARDS == card).any(axis=1))[0] for card in range(52)])
+
+# Preflop strength of every combination, taken from the conventional hand rankings
+PREFLOP_STRENGTH = np.array([preflop_percentile([DECK[i], DECK[j]]) for i, j in COMBO_CARDS])
+
+_ROWS = np.arange(NUM_COMBOS)
+# Five-rank windows for straight detection, wheel (A-2-3-4-5) included
+_STRAIGHT_WINDOWS = [list(range(low, low + 5)) for low in range(9)] + [[12, 0, 1, 2, 3]]
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def board_strengths(community_cards):
+    """
+    Approximate the strength of every combination on a board
+
+    Combinations are scored by made-hand category (pair, two pair, ..., straight flush)
+    with the highest hole card as a tiebreak, then converted to a percentile so the
+    result is comparable with PREFLOP_STRENGTH.
+
+    Args:
+        community_cards (list): Community cards on the board (can be empty for preflop)
+
+    Returns:
+        numpy.ndarray: Strength of each combination as a value between 0.0 and 1.0
+    """
+    if not community_cards:
+        return PREFLOP_STRENGTH
+
+    board = np.array([CARD_INDEX[card] for card in community_cards])
+
+    # Rank and suit counts of hole cards plus board for every combination
+    rank_counts = np.tile(np.bincount(board >> 2, minlength=13), (NUM_COMBOS, 1))
+    rank_counts[_ROWS, COMBO_RANKS[:, 0]] += 1
+    rank_counts[_ROWS, COMBO_RANKS[:, 1]] += 1
+    suit_counts = np.tile(np.bincount(board & 3, minlength=4), (NUM_COMBOS, 1))
+    suit_counts[_ROWS, COMBO_SUITS[:, 0]] += 1
+    suit_counts[_ROWS, COMBO_SUITS[:, 1]] += 1
+
+    present = rank_counts > 0
+    straight = np.zeros(NUM_COMBOS, dtype=bool)
+    for window in _STRAIGHT_WINDOWS:
+        straight |= present[:, window].all(axis=1)
+    flush = suit_counts.max(axis=1) >= 5
+
+    # A straight flush needs the straight within one suit, not just a straight and a flush
+    cards = np.zeros((NUM_COMBOS, 52), dtype=bool)
+    cards[:, board] = True
+    cards[_ROWS, COMBO_CARDS[:, 0]] = True
+    cards[_ROWS, COMBO_CARDS[:, 1]] = True
+    straight_flush = np.zeros(NUM_COMBOS, dtype=bool)
+    for suit in range(4):
+        suited = cards[:, suit::4]  # Ranks held in this suit (card index = rank * 4 + suit)
+        for window in _STRAIGHT_WINDOWS:
+            straight_flush |= suited[:, window].all(axis=1)
+
+    most = rank_counts.max(axis=1)
+    pairs = (rank_counts >= 2).sum(axis=1)
+
+    # Assign categories from weakest to strongest so stronger ones overwrite
+    category = np.zeros(NUM_COMBOS, dtype=np.int64)
+    category[most == 2] = 1
+    category[pairs >= 2] = 2
+    category[most == 3] = 3
+    category[straight] = 4
+    category[flush] = 5
+    category[(most == 3) & (pairs >= 2)] = 6
+    category[most == 4] = 7
+    category[straight_flush] = 8
+
+    score = category * 13 + COMBO_RANKS.max(axis=1)
+
+    # Convert scores to percentiles, giving tied scores the same value
+    order = np.sort(score)
+    return np.searchsorted(order, score, side='right') / NUM_COMBOS
+
+
+# Default action-likelihood models: P(action | strength, bet fraction of the pot)
+def _bet_likelihood(strength, bet_fraction):
+    threshold = 0.5 + 0.15 * min(bet_fraction, 2.0)
+    return 0.1 + 0.9 * _sigmoid(10.0 * (strength - threshold))
+
+
+def _call_likelihood(strength, bet_fraction):
+    threshold = 0.25 + 0.2 * min(bet_fraction, 1.5)
+    # The very strongest hands usually raise instead of calling
+    return (0.15 + 0.85 * _sigmoid(10.0 * (strength - threshold))) * (1.0 - 0.5 * _sigmoid(20.0 * (strength - 0.92)))
+
+
+def _check_likelihood(strength, bet_fraction):
+    return 1.0 - 0.6 * _sigmoid(10.0 * (strength - 0.7))
+
+
+def _fold_likelihood(strength, bet_fraction):
+    return 1.0 - 0.9 * strength
+
+
+DEFAULT_ACTION_MODELS = {
+    'bet': _bet_likelihood,
+    'raise': _bet_likelihood,
+    'call': _call_likelihood,
+    'check': _check_likelihood,
+    'fold': _fold_likelihood
+}
+
+
+class RangeTracker:
+    """
+    Bayesian tracker of an opponent's hole-card range for a single hand
+
+    Call reset() at the start of each hand, then update() for every opponent action.
+    The narrowed range can be passed to calculate_monte_carlo_strength as opponent_range.
+    """
+    def __init__(self, action_models=None, rng=None):
+        """
+        Args:
+            action_models (dict): Optional mapping from action name to a function
+                                  f(strengths, bet_fraction) returning a likelihood per combination
+            rng (numpy.random.Generator): Optional random generator used by sample()
+        """
+        self.action_models = dict(DEFAULT_ACTION_MODELS)
+        if action_models:
+            self.action_models.update(action_models)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.weights = np.ones(NUM_COMBOS)
+        self._dead_cards = set()
+        self._board_key = None
+        self._strengths = PREFLOP_STRENGTH
+
+    def reset(self, dead_cards=None):
+        """
+        Start a new hand with a uniform range
+
+        Args:
+            dead_cards (list): Cards the opponent cannot hold, usually our own hole cards
+        """
+        self.weights = np.ones(NUM_COMBOS)
+        self._dead_cards = set()
+        self._board_key = None
+        self._strengths = PREFLOP_STRENGTH
+        if dead_cards:
+            self.remove_cards(dead_cards)
+
+    def remove_cards(self, cards):
+        """
+        Apply card removal: zero out every combination containing one of the cards
+
+        Args:
+            cards (list): Cards known not to be in the opponent's hand
+        """
+        for card in cards:
+            if card not in self._dead_cards:
+                self._dead_cards.add(card)
+                self.weights[CARD_COMBOS[CARD_INDEX[card]]] = 0.0
+
+    def update(self, action, community_cards, pot, amount=0):
+        """
+        Narrow the range from an observed opponent action
+
+        Args:
+            action (str or dict): Action name or an action dict as returned by get_action
+            community_cards (list): Community cards when the action was taken
+            pot (int): Pot size before the action
+            amount (int): Bet or raise amount, if any
+        """
+        if isinstance(action, dict):
+            amount = action.get('amount', amount)
+            action = action['action']
+
+        self._set_board(community_cards)
+
+        model = self.action_models.get(action)
+        if model is None:
+            return
+        bet_fraction = amount / pot if pot > 0 else 1.0
+        self.weights *= model(self._strengths, bet_fraction)
+
+        # Keep weights in a sane numeric range; fall back to card removal only if
+        # the observed line was impossible under the models
+        total = self.weights.sum()
+        if total <= 0.0:
+            self.weights = np.ones(NUM_COMBOS)
+            dead_cards, self._dead_cards = self._dead_cards, set()
+            self.remove_cards(dead_cards)
+        elif total < 1e-100:
+            self.weights /= total
+
+    def _set_board(self, community_cards):
+        """Apply card removal and refresh combination strengths when the board changes"""
+        board_key = tuple(community_cards)
+        if board_key == self._board_key:
+            return
+        self._board_key = board_key
+        self.remove_cards(community_cards)
+        self._strengths = board_strengths(community_cards)
+
+    def probabilities(self):
+        """
+        Return the normalized range
+
+        Returns:
+            numpy.ndarray: Probability of each combination (indexed like COMBO_CARDS)
+        """
+        total = self.weights.sum()
+        return self.weights / total if total > 0 else self.weights
+
+    def sample(self, count, dead_cards=None):
+        """
+        Draw opponent hands from the narrowed range
+
+        Args:
+            count (int): Number of hands to draw
+            dead_cards (list): Extra cards to exclude, e.g. our own hand and the board
+
+        Returns:
+            list: Hole cards for each draw (e.g., [['Ah', 'Kd'], ...])
+        """
+        weights = self.weights
+        if dead_cards:
+            weights = weights.copy()
+            for card in dead_cards:
+                weights[CARD_COMBOS[CARD_INDEX[card]]] = 0.0
+        total = weights.sum()
+        if total <= 0.0:
+            return []
+        draws = self.rng.choice(NUM_COMBOS, size=count, p=weights / total)
+        return [[DECK[i], DECK[j]] for i, j in COMBO_CARDS[draws]]
@@ -0,0 +1,470 @@
+"""
+Remote Bots
+Bots served over TCP with a length-prefixed binary protocol, and a pooled, pipelining client for them
+"""
+
+import argparse
+import asyncio
+import importlib
+import itertools
+import queue
+import socket
+import socketserver
+import struct
+import threading
+from .bot_worker import _REQUEST, _RESPONSE, pack_request, unpack_request, pack_action, unpack_action
+from .time_control import default_action
+
+# Every frame starts with the length of the rest of the frame, then a request id and a
+# record count. A request frame carries that many bot_worker request records; its response
+# frame has the same id and one response record per request record, in order.
+_LENGTH = struct.Struct('<I')
+_ID_COUNT = struct.Struct('<IH')
+MAX_BATCH = 0xFFFF  # Decisions per frame
+
+
+def _frame(request_id, count, records):
+    """Build a frame around packed records"""
+    return _LENGTH.pack(_ID_COUNT.size + len(records)) + _ID_COUNT.pack(request_id, count) + records
+
+
+def _recv_exactly(sock, size):
+    """Read exactly size bytes from a blocking socket"""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed by the other side")
+        data += chunk
+    return bytes(data)
+
+
+def _read_frame(sock):
+    """Read one frame from a blocking socket, return (request id, record count, records)"""
+    length, = _LENGTH.unpack(_recv_exactly(sock, _LENGTH.size))
+    body = _recv_exactly(sock, length)
+    request_id, count = _ID_COUNT.unpack_from(body)
+    return request_id, count, body[_ID_COUNT.size:]
+
+
+def parse_address(address):
+    """Accept (host, port) or 'host:port'"""
+    if isinstance(address, str):
+        host, _, port = address.rpartition(':')
+        return host or '127.0.0.1', int(port)
+    return tuple(address)
+
+
+class _BotRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.server.bot_server.serve_connection(self.request)
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class BotServer:
+    """
+    Serves any bot over the remote bot protocol
+
+    A stand-in for a team's bot service, for testing RemoteBot against ordinary
+    strategy classes. Each connection is served on its own thread and its frames are
+    answered in order; calls into the bot are serialized, so the bot needn't be thread-safe.
+    A bot that raises, or returns something that isn't an action, gets the error code.
+    """
+    def __init__(self, bot, host='127.0.0.1', port=0, background=True):
+        """
+        Args:
+            bot: Object with a get_action(game_state) method, or get_actions(views)
+                 to answer each frame in one call
+            host (str): Interface to listen on
+            port (int): Port to listen on (0 picks a free one, see address)
+            background (bool): Start serving on a daemon thread right away
+        """
+        self.bot = bot
+        self.decisions = 0
+        self.errors = 0
+        self._bot_lock = threading.Lock()
+        self._server = _ThreadingServer((host, port), _BotRequestHandler)
+        self._server.bot_server = self
+        self._thread = None
+        self._serving = False
+        if background:
+            self.start()
+
+    @property
+    def address(self):
+        """(host, port) the server listens on"""
+        return self._server.server_address[:2]
+
+    def start(self):
+        """Serve on a daemon thread"""
+        self._serving = True
+        self._thread = threading.Thread(target=self.serve_forever, name=f"bot-server-{self.bot}", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """Serve on the calling thread until stop() is called"""
+        self._serving = True
+        try:
+            self._server.serve_forever()
+        finally:
+            self._serving = False
+
+    def stop(self):
+        """Stop serving and close the listening socket"""
+        if self._serving:
+            self._server.shutdown()  # Waits for the serving loop to finish
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    close = stop
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def serve_connection(self, sock):
+        """Answer frames from one client connection until it closes"""
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            try:
+                request_id, count, records = _read_frame(sock)
+            except OSError:
+                return
+            views = [unpack_request(records, i * _REQUEST.size) for i in range(count)]
+            response = b''.join(self._pack(action) for action in self._answer(views))
+            try:
+                sock.sendall(_frame(request_id, count, response))
+            except OSError:
+                return
+
+    def _answer(self, views):
+        """Ask the bot for one action per view (None where it raised)"""
+        with self._bot_lock:
+            self.decisions += len(views)
+            if hasattr(self.bot, 'get_actions'):
+                try:
+                    return self.bot.get_actions(views)
+                except Exception:
+                    return [None] * len(views)
+            actions = []
+            for view in views:
+                try:
+                    actions.append(self.bot.get_action(view))
+                except Exception:
+                    actions.append(None)
+            return actions
+
+    def _pack(self, action):
+        if action is not None:
+            try:
+                return pack_action(action)
+            except (AttributeError, KeyError, TypeError, ValueError, OverflowError, struct.error):
+                pass
+        self.errors += 1
+        return pack_action(None)
+
+
+class _PipelinedConnection:
+    """asyncio connection with any number of requests in flight, answers matched to them by id"""
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = {}  # Request id -> future for the response records
+        self.closed = False
+        self.task = asyncio.get_running_loop().create_task(self._read_responses())
+
+    async def _read_responses(self):
+        try:
+            while True:
+                length, = _LENGTH.unpack(await self.reader.readexactly(_LENGTH.size))
+                body = await self.reader.readexactly(length)
+                request_id, _ = _ID_COUNT.unpack_from(body)
+                future = self.pending.pop(request_id, None)
+                if future is not None and not future.done():  # A request that timed out is dropped
+                    future.set_result(body[_ID_COUNT.size:])
+        except (asyncio.IncompleteReadError, OSError):
+            pass
+        finally:
+            self.close()  # Also when the task is cancelled as its event loop shuts down
+
+    async def send(self, request_id, count, records):
+        """Send a request frame and return the future of its response records"""
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        self.writer.write(_frame(request_id, count, records))
+        await self.writer.drain()
+        return future
+
+    def close(self):
+        """Close the connection and fail every request still waiting on it"""
+        if self.closed:
+            return
+        self.closed = True
+        self.writer.close()
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection closed by the other side"))
+        self.pending.clear()
+
+
+class RemoteBot:
+    """
+    Bot served over the network by BotServer or any service speaking the same protocol
+
+    Use it wherever a bot is expected. Connections are kept open and reused, so a decision
+    costs one round trip rather than a connection setup. get_actions sends a whole batch in
+    one frame (see DecisionScheduler). In an AsyncPokerEngine, decisions from concurrent
+    matches are pipelined on a few shared connections, and decisions asked for in the same
+    event loop iteration are sent together in one frame.
+
+    A failed connection is retried on a fresh one. A decision that isn't answered within
+    timeout, a bot error, or a service that stays unreachable gets the default action
+    (check, or fold when facing a bet) and is counted in errors.
+    """
+    def __init__(self, address, name=None, pool_size=4, timeout=5.0, retries=2):
+        """
+        Args:
+            address: (host, port) or 'host:port' of the bot service
+            name (str): Name of the bot (the address by default)
+            pool_size (int): Connections kept open per event loop, and idle blocking connections kept
+            timeout (float): Seconds to wait for an answer (or a connection) before giving up
+            retries (int): Fresh connections tried after a connection error
+        """
+        self.address = parse_address(address)
+        self.name = name or f"remote {self.address[0]}:{self.address[1]}"
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.decisions = 0
+        self.errors = 0
+        self.reconnects = 0
+        self._ids = itertools.count(1)
+        self._idle = queue.LifoQueue()  # Idle blocking connections
+        self._loop = None  # Event loop the asyncio connections belong to
+        self._connections = []
+        self._connect_lock = None
+        self._queued = []  # (game state, future) waiting to be sent by get_action_async
+
+    def __str__(self):
+        return self.name
+
+    def _next_id(self):
+        return next(self._ids) & 0xFFFFFFFF
+
+    def _actions(self, game_states, response):
+        """Decode response records, replacing bot errors with the default action"""
+        actions = []
+        for i, game_state in enumerate(game_states):
+            action = unpack_action(response, i * _RESPONSE.size)
+            if action is None:
+                self.errors += 1
+                action = default_action(game_state)
+            actions.append(action)
+        return actions
+
+    def _failed(self, game_states):
+        self.errors += len(game_states)
+        return [default_action(game_state) for game_state in game_states]
+
+    # Blocking client
+
+    def _connect(self, timeout):
+        sock = socket.create_connection(self.address, timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    def _exchange(self, request_id, count, records, timeout):
+        """Send one frame on a pooled connection and return the response records"""
+        try:
+            sock = self._idle.get_nowait()
+        except queue.Empty:
+            sock = self._connect(timeout)
+        try:
+            sock.settimeout(timeout)
+            sock.sendall(_frame(request_id, count, records))
+            response_id, response_count, response = _read_frame(sock)
+            if response_id != request_id or response_count != count:
+                raise ConnectionError("Response doesn't match the request")
+        except BaseException:
+            sock.close()  # A late answer would desynchronize the connection
+            raise
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(sock)
+        else:
+            sock.close()
+        return response
+
+    def _request(self, game_states, timeout):
+        """Send decisions in one frame, retrying connection errors; raises socket.timeout or OSError"""
+        records = b''.join(pack_request(game_state) for game_state in game_states)
+        self.decisions += len(game_states)
+        for attempt in range(self.retries + 1):
+            try:
+                return self._exchange(self._next_id(), len(game_states), records, timeout)
+            except socket.timeout:
+                raise
+            except OSError:
+                if attempt == self.retries:
+                    raise
+                self.reconnects += 1
+
+    def get_action(self, game_state):
+        """Ask the remote bot for an action"""
+        return self.get_actions([game_state])[0]
+
+    def get_actions(self, views):
+        """Ask the remote bot for one action per view, MAX_BATCH views per frame"""
+        actions = []
+        for start in range(0, len(views), MAX_BATCH):
+            batch = views[start:start + MAX_BATCH]
+            try:
+                actions += self._actions(batch, self._request(batch, self.timeout))
+            except OSError:
+                actions += self._failed(batch)
+        return actions
+
+    def get_action_within(self, game_state, timeout):
+        """
+        Ask the remote bot for an action, giving up after timeout seconds
+
+        Used by ChessClock.
+
+        Returns:
+            dict: Action, or None if the bot didn't answer in time
+        """
+        try:
+            return self._actions([game_state], self._request([game_state], min(timeout, self.timeout)))[0]
+        except socket.timeout:
+            return None
+        except OSError:
+            return self._failed([game_state])[0]
+
+    # asyncio client
+
+    async def _connection(self):
+        """Least busy pooled connection, opening another while the pool isn't full"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._connections = []
+            self._connect_lock = asyncio.Lock()
+            self._queued = []
+        async with self._connect_lock:
+            self._connections = [connection for connection in self._connections if not connection.closed]
+            connection = min(self._connections, key=lambda connection: len(connection.pending), default=None)
+            if connection is not None and (not connection.pending or len(self._connections) >= self.pool_size):
+                return connection
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(*self.address), self.timeout)
+            writer.get_extra_info('socket').setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            connection = _PipelinedConnection(reader, writer)
+            self._connections.append(connection)
+            return connection
+
+    async def _request_async(self, game_states):
+        """Pipelined version of _request; raises asyncio.TimeoutError or OSError"""
+        records = b''.join(pack_request(game_state) for game_state in game_states)
+        self.decisions += len(game_states)
+        for attempt in range(self.retries + 1):
+            connection = None
+            request_id = self._next_id()
+            try:
+                connection = await self._connection()
+                response = await connection.send(request_id, len(game_states), records)
+                return await asyncio.wait_for(response, self.timeout)
+            except asyncio.TimeoutError:
+                if connection is not None:
+                    connection.pending.pop(request_id, None)  # The connection stays usable
+                raise
+            except OSError:
+                if attempt == self.retries:
+                    raise
+                self.reconnects += 1
+
+    async def get_actions_async(self, views):
+        """Ask the remote bot for one action per view without blocking the event loop"""
+        actions = []
+        for start in range(0, len(views), MAX_BATCH):
+            batch = views[start:start + MAX_BATCH]
+            try:
+                actions += self._actions(batch, await self._request_async(batch))
+            except (OSError, asyncio.TimeoutError):
+                actions += self._failed(batch)
+        return actions
+
+    async def get_action_async(self, game_state):
+        """
+        Ask the remote bot for an action without blocking the event loop
+
+        Used by AsyncPokerEngine. Decisions asked for before the event loop next runs
+        are sent together in one frame.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            await self._connection()  # Switch the pool and the queue over to this loop
+        future = loop.create_future()
+        if not self._queued:
+            loop.create_task(self._send_queued())
+        self._queued.append((game_state, future))
+        return await future
+
+    async def _send_queued(self):
+        queued, self._queued = self._queued, []
+        try:
+            actions = await self.get_actions_async([game_state for game_state, _ in queued])
+        except BaseException as error:
+            for _, future in queued:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+        for (_, future), action in zip(queued, actions):
+            if not future.done():
+                future.set_result(action)
+
+    def close(self):
+        """Close the pooled connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+
+
+def load_bot(spec):
+    """Create a bot from 'module:Class' or 'module:Class:name'"""
+    module_name, class_name, *name = spec.split(':')
+    bot_class = getattr(importlib.import_module(module_name), class_name)
+    return bot_class(*name)
+
+
+def main():
+    """Command-line tool: serve a strategy class over the remote bot protocol"""
+    parser = argparse.ArgumentParser(description="Serve a bot over the remote bot protocol")
+    parser.add_argument('bot', help="Bot class as module:Class or module:Class:name, "
+                                    "e.g. strategy.example_strategy_0:BasicBot")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    args = parser.parse_args()
+
+    server = BotServer(load_bot(args.bot), args.host, args.port, background=False)
+    print(f"Serving {server.bot} on {server.address[0]}:{server.address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Hand History Replay
+Feeds recorded hands back through the engine rules without bots, checking every pot and stack
+"""
+
+import sys
+import time
+from .poker_engine import PokerEngine
+from .hand_history import read_hand_history
+from .utils import DECK
+
+
+def _action_dict(action_name, amount):
+    if action_name in ('bet', 'raise'):
+        return {'action': action_name, 'amount': amount}
+    return {'action': action_name}
+
+
+def _action_effect(engine, action):
+    """Table state an action would lead to, without keeping the change"""
+    snapshot = engine.snapshot()
+    hand_over, winner = engine.apply_action(action)
+    state = engine.state
+    effect = (hand_over, winner, state.pot, state.current_bet, tuple(state.stacks), tuple(state.bets),
+              len(state.community_cards))
+    engine.restore(snapshot)
+    return effect
+
+
+class HandReplayer:
+    """
+    Replays recorded hands (as yielded by read_hand_history) through PokerEngine
+
+    In divergence mode a live bot takes one seat: while its decisions have the same
+    effect as the recorded ones the hand is replayed as recorded, and from its first
+    different decision the hand is played out live against the opponent bot.
+    """
+    def __init__(self, live_bot=None, live_seat=0, opponent=None):
+        """
+        Args:
+            live_bot: Optional bot asked for every decision of live_seat
+            live_seat (int): Seat the live bot takes over
+            opponent: Bot that plays the other seat after a divergence
+                      (without one, a diverged hand stops at the divergence)
+        """
+        self.live_bot = live_bot
+        self.live_seat = live_seat
+        self.opponent = opponent
+        self.engine = PokerEngine(None, None, headless=True)
+        if live_bot is not None:
+            self.engine.players[live_seat] = live_bot
+            self.engine.players[1 - live_seat] = opponent
+
+    def _deal(self, hand):
+        """Set the engine up at the start of a recorded hand"""
+        engine = self.engine
+        engine.ante = hand['ante']
+        engine.stacks = list(hand['stacks'])
+        engine.current_round = hand['hand'] - 1  # initialize_round increments it, fixing who acts first
+
+        # Recorded boards stop where the hand ended; fill them up with unused cards in case play goes further
+        cards = hand['cards']
+        board = hand['board']
+        if len(board) < 5:
+            used = set(cards + board)
+            board = board + [card for card in DECK if card not in used][:5 - len(board)]
+        engine.initialize_round({'player1': cards[0:2], 'player2': cards[2:4], 'community': board})
+
+    def replay_hand(self, hand):
+        """
+        Replay one recorded hand
+
+        Args:
+            hand (dict): Hand from read_hand_history
+
+        Returns:
+            dict: 'mismatch' (description or None), 'diverged_at' (action index or None),
+                  'end_stacks' and 'winner' (-1 for a split pot) of the replayed hand
+        """
+        engine = self.engine
+        state = engine.state
+        self._deal(hand)
+
+        mismatch = None
+        diverged_at = None
+        hand_over = False
+        winner = None
+        if state.current_player_idx != hand['first']:
+            mismatch = f"seat {state.current_player_idx} acts first, recorded seat {hand['first']}"
+        if engine._all_in():
+            hand_over, winner = True, engine._run_out()  # All-in from the antes, nobody acts
+
+        actions = hand['actions']
+        index = 0
+        while mismatch is None and index < len(actions):
+            street, seat, action_name, amount, pot = actions[index]
+            if hand_over:
+                mismatch = f"hand ended before action {index}"
+                break
+            if seat != state.current_player_idx or street != max(0, len(state.community_cards) - 2):
+                mismatch = (f"action {index}: recorded seat {seat} on street {street}, engine has seat "
+                            f"{state.current_player_idx} with {len(state.community_cards)} board cards")
+                break
+
+            action = _action_dict(action_name, amount)
+            if self.live_bot is not None and seat == self.live_seat:
+                live_action = self.live_bot.get_action(engine._get_player_view(seat))
+                if _action_effect(engine, live_action) != _action_effect(engine, action):
+                    diverged_at = index
+                    hand_over, winner = engine.apply_action(live_action)
+                    break
+
+            hand_over, winner = engine.apply_action(action)
+            if state.pot != pot:
+                mismatch = f"action {index}: pot {state.pot}, recorded {pot}"
+            index += 1
+
+        if diverged_at is not None and self.opponent is not None:
+            # Play the rest of the hand live
+            while not hand_over:
+                seat = state.current_player_idx
+                action = engine.players[seat].get_action(engine._get_player_view(seat))
+                hand_over, winner = engine.apply_action(action)
+
+        if mismatch is None and diverged_at is None:
+            recorded_winner = hand['winner'] if hand['winner'] >= 0 else None
+            if not hand_over:
+                mismatch = "hand not finished after the recorded actions"
+            elif state.stacks != hand['end_stacks']:
+                mismatch = f"end stacks {state.stacks}, recorded {hand['end_stacks']}"
+            elif winner != recorded_winner:
+                mismatch = f"winner {winner}, recorded {recorded_winner}"
+
+        return {
+            'mismatch': mismatch,
+            'diverged_at': diverged_at,
+            'end_stacks': state.stacks[:],
+            'winner': -1 if winner is None else winner
+        }
+
+    def replay(self, hands, stop_on_mismatch=False):
+        """
+        Replay many hands and summarize the result
+
+        Args:
+            hands (iterable or str): Hands from read_hand_history, or the path of a hand history
+            stop_on_mismatch (bool): Stop at the first hand that doesn't replay exactly
+
+        Returns:
+            dict: Hands replayed, hands verified, mismatches and divergences as
+                  (hand number, details) pairs, the live seat's chip difference against
+                  the recorded results, and hands per second
+        """
+        if isinstance(hands, str):
+            hands = read_hand_history(hands)
+
+        replayed = 0
+        verified = 0
+        mismatches = []
+        divergences = []
+        chip_difference = 0
+
+        start_time = time.perf_counter()
+        for hand in hands:
+            result = self.replay_hand(hand)
+            replayed += 1
+            if result['mismatch'] is not None:
+                mismatches.append((hand['hand'], result['mismatch']))
+                if stop_on_mismatch:
+                    break
+            elif result['diverged_at'] is None:
+                verified += 1
+            if result['diverged_at'] is not None:
+                divergences.append((hand['hand'], result['diverged_at']))
+                if self.opponent is not None:
+                    seat = self.live_seat
+                    chip_difference += result['end_stacks'][seat] - hand['end_stacks'][seat]
+        elapsed = time.perf_counter() - start_time
+
+        return {
+            'hands': replayed,
+            'verified': verified,
+            'mismatches': mismatches,
+            'divergences': divergences,
+            'chip_difference': chip_difference,
+            'elapsed': elapsed,
+            'hands_per_second': replayed / elapsed if elapsed > 0 else float('inf')
+        }
+
+
+def verify_hand_history(path, verbose=True):
+    """
+    Check that every hand in a hand history replays exactly under the current engine
+
+    Args:
+        path (str): Hand history written by HandHistoryWriter
+        verbose (bool): Print a summary and the first mismatches
+
+    Returns:
+        dict: Summary from HandReplayer.replay
+    """
+    summary = HandReplayer().replay(path)
+    if verbose:
+        print(f"{path}: {summary['verified']}/{summary['hands']} hands replayed exactly "
+              f"({summary['hands_per_second']:.0f} hands/s)")
+        for hand_num, mismatch in summary['mismatches'][:10]:
+            print(f"  Hand {hand_num}: {mismatch}")
+    return summary
+
+
+if __name__ == "__main__":
+    for history_path in sys.argv[1:]:
+        verify_hand_history(history_path)
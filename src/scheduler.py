@@ -0,0 +1,196 @@
+"""
+Decision Scheduler
+Holds many suspended hands at their decision points and lets an outside driver answer them
+"""
+
+
+class BatchBotAdapter:
+    """
+    Lets a bot with only a get_action method answer batches of decisions
+
+    get_actions asks the bot once per view, in order, so bots that don't implement
+    the batched protocol play unchanged wherever decisions are gathered into batches.
+    """
+    def __init__(self, bot):
+        """
+        Args:
+            bot: Object with a get_action(game_state) method
+        """
+        self.bot = bot
+
+    def __str__(self):
+        return str(self.bot)
+
+    def get_action(self, game_state):
+        return self.bot.get_action(game_state)
+
+    def get_actions(self, views):
+        return [self.bot.get_action(view) for view in views]
+
+
+def batch_action(bot):
+    """
+    Find the function that asks a bot for a batch of actions
+
+    Args:
+        bot: Bot with a get_actions(views) method returning one action per view,
+             or a regular get_action (wrapped in BatchBotAdapter)
+
+    Returns:
+        callable: Function taking a list of game states and returning a list of actions
+    """
+    if hasattr(bot, 'get_actions'):
+        return bot.get_actions
+    return BatchBotAdapter(bot).get_actions
+
+
+class Decision:
+    """A pending decision: the table it belongs to, the seat to act and its game state"""
+    __slots__ = ('table', 'seat', 'view', 'bot')
+
+    def __init__(self, table, seat, view, bot):
+        self.table = table
+        self.seat = seat
+        self.view = view
+        self.bot = bot
+
+    def __repr__(self):
+        return f"Decision(table={self.table}, seat={self.seat})"
+
+
+class _Match:
+    """A match in progress: its engine, the suspended hand and its results so far"""
+    __slots__ = ('engine', 'num_hands', 'deals', 'steps', 'hands_played', 'hands_won')
+
+    def __init__(self, engine, num_hands, deals):
+        self.engine = engine
+        self.num_hands = num_hands
+        self.deals = deals
+        self.steps = None
+        self.hands_played = 0
+        self.hands_won = [0, 0]
+
+
+class DecisionScheduler:
+    """
+    Runs many matches by stepping their engines' play_round_steps generators
+
+    Each table is a PokerEngine playing a match of num_hands hands. Whenever a hand
+    reaches a decision it is suspended and a Decision is added to pending; answering
+    it resumes that hand until its next decision, and finished hands are followed
+    by the next hand of the match. The driver chooses which decisions to answer and
+    in what order, e.g. all of them at once with one batched policy call.
+    """
+    def __init__(self):
+        self.tables = []
+        self.pending = []
+
+    def add_match(self, engine, num_hands=1, deals=None):
+        """
+        Add a match to the scheduler
+
+        Args:
+            engine (PokerEngine): Engine with stacks and players set up
+            num_hands (int): Hands to play (fewer if a player runs out of chips)
+            deals (DealPack): Optional source of predefined deals
+
+        Returns:
+            int: Table index, used in Decision.table and results()
+        """
+        table = len(self.tables)
+        self.tables.append(_Match(engine, num_hands, deals))
+        self._next_hand(table)
+        return table
+
+    def _next_hand(self, table):
+        """Start the next hand at a table, or leave it finished"""
+        match = self.tables[table]
+        engine = match.engine
+        while match.hands_played < match.num_hands and engine.stacks[0] > 0 and engine.stacks[1] > 0:
+            match.steps = engine.play_round_steps(match.deals)
+            try:
+                seat, view = next(match.steps)
+            except StopIteration as finished:
+                self._finish_hand(match, finished.value)
+                continue
+            self.pending.append(Decision(table, seat, view, engine.players[seat]))
+            return
+        match.steps = None
+
+    def _finish_hand(self, match, winner):
+        match.hands_played += 1
+        if winner is not None:
+            match.hands_won[winner] += 1
+
+    def answer(self, decision, action):
+        """
+        Resume a suspended hand with the action for its decision
+
+        The decision must be one taken from pending (and removed from it by the
+        caller, as run() does); the hand's next decision, if any, is added to pending.
+
+        Args:
+            decision (Decision): Pending decision
+            action (dict): Action in the format bots return
+        """
+        match = self.tables[decision.table]
+        try:
+            seat, view = match.steps.send(action)
+        except StopIteration as finished:
+            self._finish_hand(match, finished.value)
+            self._next_hand(decision.table)
+            return
+        self.pending.append(Decision(decision.table, seat, view, match.engine.players[seat]))
+
+    def run(self, decide=None):
+        """
+        Answer decisions until every match is over
+
+        Args:
+            decide (callable): Called with the list of pending decisions and returning
+                               one action per decision. By default each bot gets all of
+                               its pending decisions in one get_actions call (see
+                               batch_action).
+        """
+        if decide is None:
+            decide = self.ask_bots
+        while self.pending:
+            batch = self.pending
+            self.pending = []
+            actions = decide(batch)
+            for decision, action in zip(batch, actions):
+                self.answer(decision, action)
+
+    @staticmethod
+    def ask_bots(batch):
+        """
+        Answer decisions by asking their bots, one batched call per bot
+
+        Args:
+            batch (list): Pending decisions
+
+        Returns:
+            list: One action per decision, in the order of batch
+        """
+        by_bot = {}
+        for index, decision in enumerate(batch):
+            by_bot.setdefault(id(decision.bot), (decision.bot, []))[1].append(index)
+
+        actions = [None] * len(batch)
+        for bot, indices in by_bot.values():
+            for index, action in zip(indices, batch_action(bot)([batch[index].view for index in indices])):
+                actions[index] = action
+        return actions
+
+    def results(self):
+        """
+        Results of every match
+
+        Returns:
+            list: Per table, a dict with hands_played, hands_won and stacks by seat
+        """
+        return [{
+            'hands_played': match.hands_played,
+            'hands_won': list(match.hands_won),
+            'stacks': list(match.engine.stacks)
+        } for match in self.tables]
@@ -0,0 +1,209 @@
+"""
+Time Control
+Per-decision timeouts and per-match time banks (chess clocks) enforced around get_action
+"""
+
+import queue
+import threading
+import time
+from .player_view import PlayerView
+
+
+def default_action(game_state):
+    """Action taken for a bot that ran out of time: check if possible, otherwise fold"""
+    return {'action': 'check'} if game_state['current_bet'] <= game_state['my_bet'] else {'action': 'fold'}
+
+
+class _HelperThread:
+    """Daemon thread that runs bot calls, so a bot that never returns can be abandoned"""
+    def __init__(self, name):
+        self.requests = queue.SimpleQueue()
+        self.results = queue.SimpleQueue()
+        self.busy = False  # A call is still running (e.g. one that took too long)
+        threading.Thread(target=self._run, name=name, daemon=True).start()
+
+    def _run(self):
+        while True:
+            function, argument = self.requests.get()
+            try:
+                self.results.put((function(argument), None))
+            except BaseException as error:
+                self.results.put((None, error))
+
+    def idle(self):
+        """Whether the thread can take a call, discarding the result of a late one that has finished"""
+        if self.busy:
+            try:
+                self.results.get_nowait()
+            except queue.Empty:
+                return False
+            self.busy = False
+        return True
+
+    def call(self, function, argument, timeout):
+        """Run function(argument), raising queue.Empty if it takes longer than timeout seconds"""
+        self.busy = True
+        self.requests.put((function, argument))
+        result, error = self.results.get(timeout=timeout)
+        self.busy = False
+        if error is not None:
+            raise error
+        return result
+
+
+class TimeControl:
+    """
+    Time limits for the bots in a match
+
+    Each decision may take at most decision_timeout seconds, and all of a bot's
+    decisions in a match share a time_bank of seconds, topped up by increment after
+    every decision (a Fischer chess clock). A decision that exceeds whichever limit
+    is smaller is replaced by default_action and recorded as a violation.
+    """
+    def __init__(self, decision_timeout=None, time_bank=None, increment=0.0, preempt=True):
+        """
+        Args:
+            decision_timeout (float): Seconds allowed per decision (None for no limit)
+            time_bank (float): Seconds a bot may spend over a whole match (None for no limit)
+            increment (float): Seconds added to the bank after every decision
+            preempt (bool): Stop waiting for a bot as soon as its time is up by calling it
+                            on a helper thread. Otherwise the bot is called directly and a
+                            late action is replaced once it returns, which is cheaper and
+                            deterministic but can't stop a bot that hangs.
+        """
+        self.decision_timeout = decision_timeout
+        self.time_bank = time_bank
+        self.increment = increment
+        self.preempt = preempt
+
+    def clock(self, bot):
+        """
+        Put a bot on a fresh clock for a new match
+
+        Args:
+            bot: Object with a get_action(game_state) method
+
+        Returns:
+            ChessClock: Bot wrapper to seat in the engine instead of the bot
+        """
+        return ChessClock(bot, self)
+
+
+class ChessClock:
+    """
+    Bot wrapper that enforces a TimeControl
+
+    Bots that run out of process can accept the limit themselves by providing
+    get_action_within(game_state, timeout), which returns None on a timeout; the
+    clock then calls them directly instead of using a helper thread.
+    """
+    def __init__(self, bot, control):
+        """
+        Args:
+            bot: Object with a get_action(game_state) method
+            control (TimeControl): Limits to enforce
+        """
+        self.bot = bot
+        self.control = control
+        self.remaining = control.time_bank
+        self.decisions = 0
+        self.think_time = 0.0
+        self.violations = []
+        self._helper = None
+
+    def __str__(self):
+        return str(self.bot)
+
+    @property
+    def subscribe_events(self):
+        """The wrapped bot's subscribe_events (see PokerEngine), or None if it doesn't watch events"""
+        return getattr(self.bot, 'subscribe_events', None)
+
+    def _limit(self):
+        """Seconds available for the next decision, or None without a limit"""
+        timeout = self.control.decision_timeout
+        if self.remaining is None:
+            return timeout
+        remaining = max(0.0, self.remaining)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _call_preempted(self, game_state, limit):
+        """
+        Call the bot on the helper thread
+
+        Returns:
+            tuple: (action, None), or (None, reason) if the bot took too long or is still
+                   busy with an earlier call that did
+        """
+        if self._helper is None:
+            self._helper = _HelperThread(f"clock-{self.bot}")
+        elif not self._helper.idle():
+            # Never run the bot twice at once: it keeps its one thread and this decision is lost
+            return None, 'busy'
+        # A PlayerView is a snapshot, so the bot can keep reading it after the engine moves on
+        try:
+            return self._helper.call(self.bot.get_action, game_state, limit), None
+        except queue.Empty:
+            return None, self._timeout_reason(limit)
+
+    def _timeout_reason(self, limit):
+        """Violation reason for a decision that ran out of the given limit"""
+        timeout = self.control.decision_timeout
+        return 'decision_timeout' if timeout is not None and limit >= timeout else 'time_bank'
+
+    def get_action(self, game_state):
+        """Ask the bot for an action within its time limit"""
+        limit = self._limit()
+        if limit is None:
+            start = time.perf_counter()
+            action = self.bot.get_action(game_state)
+            self.think_time += time.perf_counter() - start
+            self.decisions += 1
+            return action
+
+        start = time.perf_counter()
+        reason = None
+        if limit <= 0:
+            action, reason = None, self._timeout_reason(limit)  # Bank already empty
+        elif hasattr(self.bot, 'get_action_within'):
+            action = self.bot.get_action_within(game_state, limit)
+            if action is None:
+                reason = self._timeout_reason(limit)
+        elif self.control.preempt:
+            action, reason = self._call_preempted(game_state, limit)
+        else:
+            action = self.bot.get_action(game_state)
+            if time.perf_counter() - start > limit:
+                action, reason = None, self._timeout_reason(limit)  # Returned too late
+        elapsed = time.perf_counter() - start
+
+        self.decisions += 1
+        self.think_time += elapsed
+        if self.remaining is not None:
+            self.remaining += self.control.increment - elapsed
+
+        if action is None:
+            self.violations.append({
+                'hand': game_state.hand_number if isinstance(game_state, PlayerView) else None,
+                'street': game_state['street'],
+                'elapsed': elapsed,
+                'limit': limit,
+                'reason': reason or 'invalid_action'  # The bot itself returned None
+            })
+            return default_action(game_state)
+        return action
+
+    def summary(self):
+        """
+        Time used by the bot so far
+
+        Returns:
+            dict: Decisions, think_time and mean_time in seconds, time_bank_left, and violations
+        """
+        return {
+            'decisions': self.decisions,
+            'think_time': self.think_time,
+            'mean_time': self.think_time / self.decisions if self.decisions else 0.0,
+            'time_bank_left': self.remaining,
+            'violations': list(self.violations)
+        }
@@ -0,0 +1,110 @@
+"""
+Phase Timings
+Counters for where time goes while PokerEngine plays hands, split by phase and seat
+"""
+
+import json
+import time
+
+PHASES = ('hand', 'deal', 'board', 'decision', 'action', 'showdown')
+HAND, DEAL, BOARD, DECISION, ACTION, SHOWDOWN = range(len(PHASES))
+
+# Counter columns: one per seat, plus one for phases that aren't a seat's turn
+TABLE = 2
+COLUMNS = ('seat0', 'seat1', 'table')
+
+
+class PhaseTimings:
+    """
+    Monotonic-clock timings of the phases of each hand
+
+    Pass an instance to PokerEngine(timings=...) or PokerTournament(timings=...).
+    Phases are the whole hand, dealing (antes and hole cards), dealing the board,
+    bot decisions, action processing and the showdown. Decisions and actions are
+    counted per seat. Counters are flat preallocated lists indexed by
+    phase * 3 + column, so recording a phase is a few list updates.
+    """
+    __slots__ = ('totals', 'counts', 'maxima')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear every counter"""
+        size = len(PHASES) * len(COLUMNS)
+        self.totals = [0] * size  # Nanoseconds
+        self.counts = [0] * size
+        self.maxima = [0] * size
+
+    def add(self, phase, elapsed, column=TABLE):
+        """
+        Record one occurrence of a phase
+
+        Args:
+            phase (int): Phase index (HAND, DEAL, ...)
+            elapsed (int): Duration in nanoseconds
+            column (int): Seat, or TABLE
+        """
+        index = phase * 3 + column
+        self.totals[index] += elapsed
+        self.counts[index] += 1
+        if elapsed > self.maxima[index]:
+            self.maxima[index] = elapsed
+
+    def merge(self, other):
+        """Add the counters of another PhaseTimings (e.g., from another process)"""
+        for index in range(len(self.totals)):
+            self.totals[index] += other.totals[index]
+            self.counts[index] += other.counts[index]
+            self.maxima[index] = max(self.maxima[index], other.maxima[index])
+
+    def summary(self):
+        """
+        Summarize the counters
+
+        Returns:
+            list: One dict per phase and column that was recorded, with phase, column,
+                  count, total_ms, mean_us, max_us and share (fraction of total hand time)
+        """
+        hand_time = sum(self.totals[HAND * 3:HAND * 3 + 3])
+        rows = []
+        for phase, phase_name in enumerate(PHASES):
+            for column, column_name in enumerate(COLUMNS):
+                index = phase * 3 + column
+                count = self.counts[index]
+                if not count:
+                    continue
+                total = self.totals[index]
+                rows.append({
+                    'phase': phase_name,
+                    'column': column_name,
+                    'count': count,
+                    'total_ms': total / 1e6,
+                    'mean_us': total / count / 1e3,
+                    'max_us': self.maxima[index] / 1e3,
+                    'share': total / hand_time if hand_time else 0.0
+                })
+        return rows
+
+    def print_summary(self):
+        """Print the summary as a table"""
+        print(f"{'Phase':<10} {'Column':<7} {'Count':>10} {'Total ms':>11} {'Mean us':>9} {'Max us':>10} {'Share':>7}")
+        for row in self.summary():
+            print(f"{row['phase']:<10} {row['column']:<7} {row['count']:>10} {row['total_ms']:>11.1f} "
+                  f"{row['mean_us']:>9.2f} {row['max_us']:>10.1f} {row['share']:>6.1%}")
+
+    def to_json(self, path=None):
+        """
+        Export the summary as JSON, for tracking timings across runs
+
+        Args:
+            path (str): Optional file to write
+
+        Returns:
+            str: JSON document with a timestamp and the summary rows
+        """
+        document = json.dumps({'timestamp': time.time(), 'phases': self.summary()}, indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(document)
+        return document
@@ -11,6 +11,12 @@ RANKS = {
     'T': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
 }
 
+# Integer card indices used by the array-based helpers (index = rank * 4 + suit)
+CARD_RANK_CHARS = '23456789TJQKA'
+CARD_SUIT_CHARS = 'hdcs'
+DECK = [rank + suit for rank in CARD_RANK_CHARS for suit in CARD_SUIT_CHARS]
+CARD_INDEX = {card: i for i, card in enumerate(DECK)}
+
 # Hand ranks
 HAND_RANKS = {
     'high_card': 1,
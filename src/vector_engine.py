@@ -0,0 +1,333 @@
+"""
+Vectorized Poker Engine
+Plays many independent heads-up games in lockstep, with table state held in NumPy arrays
+"""
+
+import numpy as np
+from .batch_evaluator import evaluate_batch
+from .counter_rng import CounterRNG, deal_cards
+from .player_view import PlayerView, TableSnapshot
+from .scheduler import batch_action
+from .utils import DECK
+
+# Action codes returned by batch policies
+FOLD = 0
+CHECK = 1
+CALL = 2
+BET = 3
+RAISE = 4
+
+ACTION_CODES = {'fold': FOLD, 'check': CHECK, 'call': CALL, 'bet': BET, 'raise': RAISE}
+
+# Winner codes returned by play_hand besides the winning seat
+SPLIT = -1
+NOT_PLAYED = -2
+
+STREETS = (('preflop', 0), ('flop', 3), ('turn', 4), ('river', 5))
+
+
+class BatchView:
+    """
+    Decision request for every game where the same seat is to act
+
+    Array fields hold one row per game in games; policies return
+    (actions, amounts) arrays aligned with those rows.
+    """
+    __slots__ = ('games', 'seat', 'street', 'hands', 'community_cards', 'pot', 'current_bet',
+                 'my_stack', 'opponent_stack', 'my_bet', 'opponent_bet', 'min_raise', 'ante')
+
+    def __init__(self, engine, games, seat, street, num_community):
+        self.games = games
+        self.seat = seat
+        self.street = street
+        self.hands = engine.deals[games, 2 * seat:2 * seat + 2]
+        self.community_cards = engine.deals[games, 4:4 + num_community]
+        self.pot = engine.pot[games]
+        self.current_bet = engine.current_bet[games]
+        self.my_stack = engine.stacks[games, seat]
+        self.opponent_stack = engine.stacks[games, 1 - seat]
+        self.my_bet = engine.bets[games, seat]
+        self.opponent_bet = engine.bets[games, 1 - seat]
+        self.min_raise = engine.min_raise[games]
+        self.ante = engine.ante
+
+    def __len__(self):
+        return len(self.games)
+
+    @property
+    def amount_to_call(self):
+        """Chips needed to call in each game, capped at the stack"""
+        return np.maximum(0, np.minimum(self.current_bet - self.my_bet, self.my_stack))
+
+
+def check_call_policy(view):
+    """Batch policy that always checks or calls"""
+    actions = np.where(view.current_bet > view.my_bet, CALL, CHECK)
+    return actions, np.zeros(len(view), dtype=np.int64)
+
+
+def _snapshot(view, row):
+    """One game's table from the acting seat's side, as the PlayerView reads it"""
+    seat = view.seat
+    stacks = [int(view.my_stack[row]), int(view.opponent_stack[row])]
+    bets = [int(view.my_bet[row]), int(view.opponent_bet[row])]
+    if seat:
+        stacks.reverse()
+        bets.reverse()
+    return TableSnapshot(seat, [DECK[card] for card in view.hands[row]],
+                         [DECK[card] for card in view.community_cards[row]], int(view.pot[row]),
+                         int(view.current_bet[row]), bets, stacks, int(view.min_raise[row]))
+
+
+def bot_policy(bot):
+    """
+    Wrap a regular bot so it can play in a VectorEngine
+
+    The bot gets one PlayerView per game, with the same fields (including the derived
+    pot_odds and legal_actions) a PokerEngine bot receives, all in one get_actions call
+    (bots with only get_action are asked once per game).
+    This runs existing bots and checks the vectorized rules against PokerEngine.
+
+    Args:
+        bot: Object with a get_action(game_state) method, and optionally get_actions(views)
+
+    Returns:
+        callable: Batch policy
+    """
+    get_actions = batch_action(bot)
+
+    def policy(view):
+        actions = np.empty(len(view), dtype=np.int64)
+        amounts = np.zeros(len(view), dtype=np.int64)
+        game_states = [PlayerView(_snapshot(view, row), view.seat, view.ante) for row in range(len(view))]
+        for row, action in enumerate(get_actions(game_states)):
+            actions[row] = ACTION_CODES.get(action['action'], -1)
+            amounts[row] = int(action.get('amount', 0))
+        return actions, amounts
+    return policy
+
+
+class VectorEngine:
+    """
+    Lockstep engine for N independent heads-up games
+
+    Every hand is played in all active games at once: each street's betting runs
+    until it has closed in every game, then the next cards are dealt everywhere and
+    showdowns are scored with one evaluate_batch call. Betting follows
+    PokerEngine._process_action exactly, including its handling of invalid actions.
+    """
+    def __init__(self, num_games, starting_stack=1000, ante=10, rng=None):
+        """
+        Args:
+            num_games (int): Number of games to run side by side
+            starting_stack (int): Chips each player starts with
+            ante (int): Ante collected from each player every hand
+            rng (numpy.random.Generator or CounterRNG): Optional random source used for dealing.
+                With a CounterRNG game g deals the cards a headless PokerEngine with
+                rng.for_match(rng.match + g) would deal.
+        """
+        self.num_games = num_games
+        self.starting_stack = starting_stack
+        self.ante = ante
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.reset()
+
+    def reset(self):
+        """Start every game over with full stacks"""
+        n = self.num_games
+        self.stacks = np.full((n, 2), self.starting_stack, dtype=np.int64)
+        self.bets = np.zeros((n, 2), dtype=np.int64)
+        self.pot = np.zeros(n, dtype=np.int64)
+        self.current_bet = np.zeros(n, dtype=np.int64)
+        self.min_raise = np.zeros(n, dtype=np.int64)
+        self.current_player = np.zeros(n, dtype=np.int64)
+        self.current_round = np.zeros(n, dtype=np.int64)
+        # Cards of the current hand: seat 0 hole cards, seat 1 hole cards, then the board
+        self.deals = np.zeros((n, 9), dtype=np.int64)
+
+    def deal(self, num_games):
+        """
+        Draw uniformly random deals
+
+        Args:
+            num_games (int): Number of deals
+
+        Returns:
+            numpy.ndarray: Card indices of shape (num_games, 9)
+        """
+        return np.argsort(self.rng.random((num_games, 52)), axis=1)[:, :9]
+
+    def play_hand(self, policy1, policy2, games=None, deals=None):
+        """
+        Play one hand in each of the given games
+
+        Args:
+            policy1 (callable): Batch policy for seat 0, called as policy(BatchView)
+                                and returning (actions, amounts) arrays
+            policy2 (callable): Batch policy for seat 1
+            games (numpy.ndarray): Indices of the games to play (all games by default)
+            deals (numpy.ndarray): Optional card indices of shape (len(games), 9)
+
+        Returns:
+            numpy.ndarray: Winning seat per game, SPLIT for a split pot or NOT_PLAYED
+        """
+        policies = (policy1, policy2)
+        games = np.arange(self.num_games) if games is None else np.asarray(games, dtype=np.int64)
+        winners = np.full(self.num_games, NOT_PLAYED, dtype=np.int64)
+        self.current_round[games] += 1
+        if deals is None:
+            if isinstance(self.rng, CounterRNG):
+                deals = deal_cards(self.rng.seed, self.rng.match + games, self.current_round[games])
+            else:
+                deals = self.deal(len(games))
+        self.deals[games] = deals
+        self.bets[games] = 0
+        self.pot[games] = 0
+        self.current_bet[games] = 0
+
+        # Players who can't pay the ante lose their remaining chips (seat 0 is checked first)
+        stacks = self.stacks[games]
+        broke = np.where(stacks[:, 0] < self.ante, 0, np.where(stacks[:, 1] < self.ante, 1, -1))
+        for seat in range(2):
+            lost = games[broke == seat]
+            self.stacks[lost, 1 - seat] += self.stacks[lost, seat]
+            self.stacks[lost, seat] = 0
+            winners[lost] = 1 - seat
+        live = games[broke < 0]
+
+        self.stacks[live] -= self.ante
+        self.pot[live] += 2 * self.ante
+        self.min_raise[live] = self.ante * 2
+        self.current_player[live] = self.current_round[live] % 2
+
+        for street, num_community in STREETS:
+            if not len(live):
+                break
+            live = self._betting_round(policies, live, street, num_community, winners)
+
+        # Showdown
+        if len(live):
+            scores0 = evaluate_batch(self.deals[live][:, [0, 1, 4, 5, 6, 7, 8]])
+            scores1 = evaluate_batch(self.deals[live][:, [2, 3, 4, 5, 6, 7, 8]])
+            result = np.where(scores0 > scores1, 0, np.where(scores0 < scores1, 1, SPLIT))
+            winners[live] = result
+            for seat in range(2):
+                won = live[result == seat]
+                self.stacks[won, seat] += self.pot[won]
+            split = live[result == SPLIT]
+            self.stacks[split] += (self.pot[split] // 2)[:, None]
+
+        return winners
+
+    def _betting_round(self, policies, live, street, num_community, winners):
+        """Run one street in every live game, return the games still in the hand"""
+        self.current_bet[live] = 0
+        self.bets[live] = 0
+        acted = np.zeros(self.num_games, dtype=np.int64)  # Bitmask of seats that have acted
+        folded = np.zeros(self.num_games, dtype=bool)
+
+        # Games with a player all-in have no more decisions and just run out the board
+        betting = live[(self.stacks[live] > 0).all(axis=1)]
+        while len(betting):
+            seats = self.current_player[betting]
+            for seat in range(2):
+                games = betting[seats == seat]
+                if not len(games):
+                    continue
+                actions, amounts = policies[seat](BatchView(self, games, seat, street, num_community))
+                fold = self._process_actions(games, seat, actions, amounts)
+
+                # The opponent takes the pot in games where this seat folded
+                lost = games[fold]
+                self.stacks[lost, 1 - seat] += self.pot[lost]
+                winners[lost] = 1 - seat
+                folded[lost] = True
+
+                games = games[~fold]
+                acted[games] |= 1 << seat
+                self.current_player[games] = 1 - seat
+
+            # Continue until both seats have acted and bets are equal (or a seat is all-in)
+            betting = betting[~folded[betting]]
+            bets = self.bets[betting]
+            stacks = self.stacks[betting]
+            current_bet = self.current_bet[betting][:, None]
+            open_bets = ((stacks > 0) & (bets != current_bet)).any(axis=1)
+            betting = betting[(acted[betting] != 3) | open_bets]
+
+        return live[~folded[live]]
+
+    def _process_actions(self, games, seat, actions, amounts):
+        """Apply one action per game for the given seat, return a mask of games where it folded"""
+        actions = np.asarray(actions, dtype=np.int64)
+        amounts = np.asarray(amounts)
+        if amounts.dtype.kind == 'f':
+            amounts = np.trunc(amounts)  # int() truncates toward zero
+        amounts = amounts.astype(np.int64)
+
+        my_bet = self.bets[games, seat]
+        current_bet = self.current_bet[games]
+        stack = self.stacks[games, seat]
+        min_raise = self.min_raise[games]
+
+        # Bets are capped at what the opponent can call, then at the remaining stack
+        bet_amount = np.minimum(amounts, my_bet + self.stacks[games, 1 - seat])
+        bet_amount = np.minimum(bet_amount, stack)
+
+        # Bets below min_raise become checks; bets short of a full raise (or not above the
+        # current bet) become calls (or checks when nothing has been bet)
+        is_bet = (actions == BET) | (actions == RAISE)
+        below_min = is_bet & (amounts < min_raise)
+        short = is_bet & ~below_min & (bet_amount < np.maximum(current_bet - my_bet + min_raise, current_bet + 1))
+        is_raise = is_bet & ~below_min & ~short
+        actions = np.where(below_min | (short & (current_bet == 0)), CHECK, actions)
+        actions = np.where(short & (current_bet > 0), CALL, actions)
+
+        # Checking into a bet counts as a fold
+        fold = (actions == FOLD) | ((actions == CHECK) & (current_bet > my_bet))
+
+        amount_to_add = np.where(actions == CALL, np.minimum(current_bet - my_bet, stack), 0)
+        amount_to_add = np.where(is_raise, bet_amount - my_bet, amount_to_add)
+        self.stacks[games, seat] -= amount_to_add
+        self.pot[games] += amount_to_add
+        self.bets[games, seat] += amount_to_add
+
+        raised = games[is_raise]
+        self.current_bet[raised] = bet_amount[is_raise]
+        # PokerEngine computes min_raise after updating current_bet, so it drops to 0
+        self.min_raise[raised] = 0
+
+        return fold
+
+    def run(self, policy1, policy2, num_hands=100, deals=None):
+        """
+        Play matches in every game until num_hands hands or a player is out of chips
+
+        Args:
+            policy1 (callable): Batch policy for seat 0
+            policy2 (callable): Batch policy for seat 1
+            num_hands (int): Maximum hands per game
+            deals (callable): Optional function deals(games, hand_number) returning
+                              card indices of shape (len(games), 9)
+
+        Returns:
+            dict: Final stacks, hands played and hands won per seat for every game
+        """
+        hands_played = np.zeros(self.num_games, dtype=np.int64)
+        hands_won = np.zeros((self.num_games, 2), dtype=np.int64)
+
+        for hand in range(num_hands):
+            games = np.flatnonzero((self.stacks > 0).all(axis=1))
+            if not len(games):
+                break
+            hand_deals = deals(games, hand) if deals is not None else None
+            winners = self.play_hand(policy1, policy2, games, hand_deals)
+            hands_played[games] += 1
+            for seat in range(2):
+                hands_won[winners == seat, seat] += 1
+
+        return {
+            'stacks': self.stacks.copy(),
+            'hands_played': hands_played,
+            'hands_won': hands_won
+        }
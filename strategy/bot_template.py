@@ -30,7 +30,8 @@ class PokerBotTemplate:
         Determine the action to take based on the current game state
         
         Args:
-            game_state (dict): The current state of the game from your perspective
+            game_state (PlayerView): The current state of the game from your perspective
+                (read-only, accessed like a dict: game_state['pot'])
                 - player_idx: Your position (0 or 1)
                 - hand: Your hole cards (e.g., ['Ah', 'Kd'])
                 - community_cards: Shared cards on the board
@@ -42,6 +43,11 @@ class PokerBotTemplate:
                 - opponent_bet: Amount opponent has bet in this round
                 - min_raise: Minimum raise amount
                 - ante: Ante amount
+                - amount_to_call: Chips needed to call (capped at your stack)
+                - pot_odds: amount_to_call / (pot + amount_to_call)
+                - street: 'preflop', 'flop', 'turn' or 'river'
+                - legal_actions: Dict with actions, can_check, call_amount,
+                  min_raise_to and max_raise_to (None when you can't raise)
             
         Returns:
             dict: Action to take
@@ -3,7 +3,7 @@ Basic Bot Strategy for Poker Competition
 This bot makes simple decisions based on hand strength and pot odds with no bluffing
 """
 
-from hand_evaluator import calculate_monte_carlo_strength
+from hand_evaluator import calculate_monte_carlo_strength, calculate_monte_carlo_strength_batch
 
 class BasicBot:
     """
@@ -29,6 +29,37 @@ class BasicBot:
         Args:
             game_state (dict): The current state of the game from the player's perspective
             
+        Returns:
+            dict: Action to take
+        """
+        hand_strength = calculate_monte_carlo_strength(game_state['hand'], game_state['community_cards'])
+        return self._choose_action(game_state, hand_strength)
+        
+    def get_actions(self, views):
+        """
+        Determine actions for several decisions at once (e.g. from concurrent games)
+        
+        The hand strengths of all decisions are simulated together, which is much
+        faster than one simulation per decision.
+        
+        Args:
+            views (list): Game states, one per decision
+            
+        Returns:
+            list: Action to take for each game state
+        """
+        strengths = calculate_monte_carlo_strength_batch([view['hand'] for view in views],
+                                                         [view['community_cards'] for view in views])
+        return [self._choose_action(view, hand_strength) for view, hand_strength in zip(views, strengths)]
+        
+    def _choose_action(self, game_state, hand_strength):
+        """
+        Choose an action given the hand strength of the decision
+        
+        Args:
+            game_state (dict): The current state of the game from the player's perspective
+            hand_strength (float): Monte Carlo hand strength of the player's hand
+            
         Returns:
             dict: Action to take
         """
@@ -41,9 +72,6 @@ class BasicBot:
         my_bet = game_state['my_bet']
         min_raise = game_state['min_raise']
         
-        # Calculate hand strength using Monte Carlo simulation
-        hand_strength = calculate_monte_carlo_strength(hand, community_cards)
-
         # Calculate pot odds
         amount_to_call = current_bet - my_bet
         pot_odds = amount_to_call / (pot + amount_to_call) if amount_to_call > 0 else 0
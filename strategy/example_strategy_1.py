@@ -3,7 +3,7 @@ Conservative Bot Strategy for Poker Competition
 This bot plays carefully based on hand strength and position
 """
 
-from hand_evaluator import calculate_monte_carlo_strength
+from hand_evaluator import calculate_monte_carlo_strength, calculate_monte_carlo_strength_batch
 
 class ConservativeBot:
     """
@@ -52,6 +52,37 @@ class ConservativeBot:
         Args:
             game_state (dict): The current state of the game from the player's perspective
             
+        Returns:
+            dict: Action to take
+        """
+        hand_strength = calculate_monte_carlo_strength(game_state['hand'], game_state['community_cards'])
+        return self._choose_action(game_state, hand_strength)
+        
+    def get_actions(self, views):
+        """
+        Determine actions for several decisions at once (e.g. from concurrent games)
+        
+        The hand strengths of all decisions are simulated together, which is much
+        faster than one simulation per decision.
+        
+        Args:
+            views (list): Game states, one per decision
+            
+        Returns:
+            list: Action to take for each game state
+        """
+        strengths = calculate_monte_carlo_strength_batch([view['hand'] for view in views],
+                                                         [view['community_cards'] for view in views])
+        return [self._choose_action(view, hand_strength) for view, hand_strength in zip(views, strengths)]
+        
+    def _choose_action(self, game_state, hand_strength):
+        """
+        Choose an action given the hand strength of the decision
+        
+        Args:
+            game_state (dict): The current state of the game from the player's perspective
+            hand_strength (float): Monte Carlo hand strength of the player's hand
+            
         Returns:
             dict: Action to take
         """
@@ -75,9 +106,6 @@ class ConservativeBot:
         else:
             round_name = 'river'
             
-        # Calculate hand strength and percentile
-        hand_strength  = calculate_monte_carlo_strength(hand, community_cards)
-
         # Calculate pot odds
         amount_to_call = current_bet - my_bet
         pot_odds = amount_to_call / (pot + amount_to_call) if amount_to_call > 0 else 0
@@ -4,7 +4,8 @@ This bot plays aggressively, frequently bluffing and playing more hands
 """
 
 import random
-from hand_evaluator import calculate_monte_carlo_strength
+from hand_evaluator import calculate_monte_carlo_strength, calculate_monte_carlo_strength_batch
+from src.events import ActionTaken, HandEnded
 
 
 class AggressiveBot:
@@ -66,6 +67,37 @@ class AggressiveBot:
         Args:
             game_state (dict): The current state of the game from the player's perspective
             
+        Returns:
+            dict: Action to take
+        """
+        hand_strength = calculate_monte_carlo_strength(game_state['hand'], game_state['community_cards'])
+        return self._choose_action(game_state, hand_strength)
+        
+    def get_actions(self, views):
+        """
+        Determine actions for several decisions at once (e.g. from concurrent games)
+        
+        The hand strengths of all decisions are simulated together, which is much
+        faster than one simulation per decision.
+        
+        Args:
+            views (list): Game states, one per decision
+            
+        Returns:
+            list: Action to take for each game state
+        """
+        strengths = calculate_monte_carlo_strength_batch([view['hand'] for view in views],
+                                                         [view['community_cards'] for view in views])
+        return [self._choose_action(view, hand_strength) for view, hand_strength in zip(views, strengths)]
+        
+    def _choose_action(self, game_state, hand_strength):
+        """
+        Choose an action given the hand strength of the decision
+        
+        Args:
+            game_state (dict): The current state of the game from the player's perspective
+            hand_strength (float): Monte Carlo hand strength of the player's hand
+            
         Returns:
             dict: Action to take
         """
@@ -89,9 +121,6 @@ class AggressiveBot:
         else:
             round_name = 'river'
             
-        # Calculate hand strength using Monte Carlo simulation
-        hand_strength = calculate_monte_carlo_strength(hand, community_cards)
-        
         # Decide if we should bluff in this situation
         should_bluff = self._should_bluff(round_name, pot, hand_strength)
         
@@ -197,6 +226,48 @@ class AggressiveBot:
         # Random decision based on adjusted frequency
         return random.random() < adjusted_frequency
     
+    def subscribe_events(self, events, seat):
+        """
+        Watch the hands played in a seat to keep the opponent model up to date
+
+        PokerEngine calls this for bots that define it, once per seat. Whenever the
+        opponent answers one of our raises, update_opponent_model learns whether they
+        folded. When the bot sits in both seats there is no opponent to model, and each
+        hand is counted once.
+
+        Args:
+            events (EventBus): Event bus of the engine
+            seat (int): Seat this bot plays in
+        """
+        last_raise = None  # (pot after our raise, chips it put in), until the opponent answers
+
+        def self_play(event):
+            players = event.engine.players
+            return players[0] is players[1]
+
+        def on_action(event):
+            nonlocal last_raise
+            if self_play(event):
+                return
+            if event.seat == seat:
+                last_raise = (event.pot, event.amount) if event.kind == 'raise' else None
+            elif last_raise is not None:
+                self.update_opponent_model(event.kind == 'fold', *last_raise)
+                last_raise = None
+
+        def on_hand_end(event):
+            nonlocal last_raise
+            last_raise = None
+            both_seats = self_play(event)
+            if both_seats and seat == 1:
+                return  # Seat 0's subscription counts the hand
+            self.hands_played += 1
+            if event.winner == seat or (both_seats and event.winner is not None):
+                self.hands_won += 1
+
+        events.subscribe(ActionTaken, on_action)
+        events.subscribe(HandEnded, on_hand_end)
+
     def update_opponent_model(self, opponent_folded, pot_size, last_bet_size):
         """
         Update the model of opponent tendencies